@@ -1,4 +1,4 @@
 #!/usr/bin/env bash
 
-alembic upgrade head &&\
-	uvicorn users.api.run:app --proxy-headers --host 0.0.0.0 --port $1
+python -m users.orm.migrate &&\
+	PORT=$1 gunicorn -c python:users.api.server users.api.run:app
@@ -0,0 +1,4 @@
+from time import perf_counter
+
+# Start of the imports of the application, reported by the StartupReport.
+IMPORT_STARTED = perf_counter()
@@ -11,7 +11,9 @@ from nwrest.exceptions import PropagableHttpError
 from users.api.providers import RestApiCCIDProvider
 from users.containers import UserContainer
 from users.core import exceptions as e
+from users.odm.registry import get_schema
 from users.odm.schemas import ResponseErrorSchema
+from users.orm.instrumentation import current_query_stats
 
 
 exception_status_map = {
@@ -23,6 +25,12 @@ exception_status_map = {
     e.StorageReadError: HTTPStatus.INTERNAL_SERVER_ERROR,
     e.IdentityValidationError: HTTPStatus.BAD_REQUEST,
     e.EntityGoneError: HTTPStatus.GONE,
+    e.IdempotencyKeyInUseError: HTTPStatus.CONFLICT,
+    e.IdempotencyKeyReusedError: HTTPStatus.UNPROCESSABLE_ENTITY,
+    e.EmailClaimError: HTTPStatus.CONFLICT,
+    e.BatchTooLargeError: HTTPStatus.UNPROCESSABLE_ENTITY,
+    e.InternalAccessError: HTTPStatus.FORBIDDEN,
+    e.EventQueueFullError: HTTPStatus.SERVICE_UNAVAILABLE,
 }
 
 
@@ -47,6 +55,9 @@ async def log_http(
             'url': str(request.url)
         }
     )
+    query_stats = current_query_stats()
+    if query_stats is not None:
+        logger = logger.bind(db=query_stats.as_log())
 
     message = {
         'request': {
@@ -63,6 +74,9 @@ async def log_http(
     }
     logger.log(level, message)
 
+    if query_stats is not None and query_stats.repeated():
+        logger.warning({'repeated_statements': query_stats.repeated()})
+
     return logger
 
 
@@ -78,7 +92,7 @@ async def user_error_handler(
     if status_code is None:
         return await unknown_error_handler(request, exception)
 
-    error_schema = ResponseErrorSchema()
+    error_schema = get_schema(ResponseErrorSchema)
 
     response = JSONResponse(
         status_code=status_code,
@@ -100,7 +114,7 @@ async def unknown_error_handler(
     exception: Exception
 ) -> JSONResponse:
     """Intercept the unkown error a unique json response interface."""
-    error_schema = ResponseErrorSchema()
+    error_schema = get_schema(ResponseErrorSchema)
     response = JSONResponse(
         status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
         content=error_schema.dump({
@@ -0,0 +1,95 @@
+"""Replay the first response of the requests sent with an ``Idempotency-Key``.
+
+The first request sent with a key claims it and runs the view; its response is
+stored under the key when it succeeded. Retries sent with the same key and the
+same request get the stored response back without running the view again. A
+key reused with another request, or sent again while the first request runs,
+is rejected.
+"""
+from hashlib import sha256
+from http import HTTPStatus
+from typing import Awaitable, Callable, TypeVar
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from users.core.exceptions import ValidationError
+from users.core.models import StoredResponse
+from users.core.repositories import IdempotencyKeyRepository
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+T = TypeVar('T', bound=Callable)
+
+
+def idempotent(view: T) -> T:
+    """Mark the view to honor the ``Idempotency-Key`` header."""
+    view.idempotent = True
+    return view
+
+
+def is_idempotent(endpoint: Callable) -> bool:
+    """Tell whether the view was marked with ``idempotent``."""
+    return getattr(endpoint, 'idempotent', False)
+
+
+async def fingerprint(request: Request) -> str:
+    """Hash what identifies the request: its method, path, query and body."""
+    digest = sha256()
+    for part in (request.method, request.url.path, request.url.query):
+        digest.update(part.encode())
+        digest.update(b'\0')
+    digest.update(await request.body())
+    return digest.hexdigest()
+
+
+async def idempotently(
+    request: Request,
+    repository: IdempotencyKeyRepository,
+    call: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Run ``call`` once per idempotency key and replay its response."""
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        return await call(request)
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise ValidationError(
+            f'{IDEMPOTENCY_HEADER} must have between 1 and {MAX_KEY_LENGTH} characters'
+        )
+
+    # The same key may be used against different endpoints.
+    key = f'{request.method} {request.url.path} {key}'
+    request_fingerprint = await fingerprint(request)
+
+    stored = await run_in_threadpool(repository.claim, key, request_fingerprint)
+    if stored is not None:
+        return Response(
+            content=stored.body,
+            status_code=HTTPStatus(stored.status_code),
+            media_type=stored.media_type,
+            headers={REPLAYED_HEADER: 'true'}
+        )
+
+    try:
+        response = await call(request)
+    except Exception:
+        await run_in_threadpool(repository.release, key, request_fingerprint)
+        raise
+
+    if response.status_code < HTTPStatus.BAD_REQUEST:
+        await run_in_threadpool(
+            repository.complete,
+            key,
+            request_fingerprint,
+            StoredResponse(
+                status_code=int(response.status_code),
+                body=response.body,
+                media_type=response.media_type
+            )
+        )
+    else:
+        await run_in_threadpool(repository.release, key, request_fingerprint)
+
+    return response
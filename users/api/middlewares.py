@@ -6,6 +6,7 @@ from fastapi import Depends, Request
 
 from users.api.providers import RestApiCCIDProvider
 from users.containers import UserContainer
+from users.orm.identity_map import identity_map
 
 
 @inject
@@ -16,9 +17,14 @@ async def rest_api_ccid_provider_middleware(
         Provide[UserContainer.rest_api_ccid_provider]
     )
 ):
-    """Intercept a incoming request and set it to the ccid provider."""
+    """Intercept a incoming request and set it to the ccid provider.
+
+    The entities loaded by the repositories are shared for as long as the
+    ccid of the request lives.
+    """
     ccid = ccid_provider.context.set(uuid4())
     ccid_provider.request = request
-    response = await next_call(request)
+    with identity_map():
+        response = await next_call(request)
     ccid_provider.context.reset(ccid)
     return response
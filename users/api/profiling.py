@@ -0,0 +1,195 @@
+"""Profile the requests that ask for it, or a sample of them.
+
+A request is profiled when its ``X-Debug-Profile`` header holds the configured
+token, or when it is picked by the sampling rate. The view runs under
+``cProfile`` and the result is saved as a pstats file named after the ccid.
+The internal views require the same token in the ``X-Internal-Token`` header.
+"""
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from cProfile import Profile
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import wraps
+import hmac
+import os
+import pstats
+import random
+import tempfile
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Union
+from uuid import UUID, uuid4
+
+from fastapi import Request
+
+PROFILE_HEADER = 'X-Debug-Profile'
+INTERNAL_TOKEN_HEADER = 'X-Internal-Token'
+
+# Self time of the functions whose file path holds a fragment is accounted to
+# the first layer listed for it.
+LAYERS = (
+    ('handlers', ('users/core/',)),
+    ('repositories', ('users/orm/',)),
+    ('http_clients', ('users/rest_client/', 'nwrest/')),
+    ('schemas', ('users/odm/', 'nwodm/', 'marshmallow/')),
+    ('database_driver', ('sqlalchemy/', 'psycopg2/')),
+    ('http', ('requests/', 'urllib3/', 'http/client.py', 'socket.py', 'ssl.py')),
+)
+OTHER_LAYER = 'other'
+
+current_profile: ContextVar[Optional[Profile]] = ContextVar(
+    'current_profile',
+    default=None
+)
+
+
+@dataclass
+class ProfileRecord:
+    """A saved request profile."""
+
+    ccid: UUID
+    method: str
+    path: str
+    status_code: int
+    duration: float
+    file: str
+    layers: Dict[str, float] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    def as_dict(self) -> Dict:
+        """Return the record as a json serializable dict."""
+        return {
+            'ccid': str(self.ccid),
+            'method': self.method,
+            'path': self.path,
+            'status_code': self.status_code,
+            'duration_ms': round(self.duration * 1000, 3),
+            'file': self.file,
+            'layers_ms': {
+                layer: round(seconds * 1000, 3)
+                for layer, seconds in self.layers.items()
+            },
+            'created_at': self.created_at.isoformat(),
+        }
+
+
+def layer_of(filename: str) -> str:
+    """Return the layer a source file belongs to."""
+    path = filename.replace(os.sep, '/')
+    for layer, fragments in LAYERS:
+        if any(fragment in path for fragment in fragments):
+            return layer
+    return OTHER_LAYER
+
+
+def time_by_layer(profile: Profile) -> Dict[str, float]:
+    """Sum the self time of the profiled functions by layer."""
+    layers = {layer: 0.0 for layer, _ in LAYERS}
+    layers[OTHER_LAYER] = 0.0
+    for (filename, _, _), (_, _, self_time, _, _) in pstats.Stats(profile).stats.items():
+        layers[layer_of(filename)] += self_time
+    return layers
+
+
+class RequestProfiler:
+    """Decide which requests are profiled and keep the recent profiles."""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        sample_rate: Optional[Union[float, str]] = None,
+        directory: Optional[str] = None,
+        ccid_provider: Optional[Callable[[], UUID]] = None,
+        keep: int = 50
+    ):
+        """Configure the profiling, disabled without token nor sample rate."""
+        self.ccid_provider = ccid_provider or uuid4
+        self.token = token or None
+        self.sample_rate = float(sample_rate or 0)
+        self.directory = directory or os.path.join(
+            tempfile.gettempdir(),
+            'users-profiles'
+        )
+        self.records: Deque[ProfileRecord] = deque(maxlen=keep)
+
+    def authorizes(self, token: Optional[str]) -> bool:
+        """Return whether the token is the configured one, False if none is."""
+        if token is None or self.token is None:
+            return False
+        return hmac.compare_digest(token, self.token)
+
+    def should_profile(self, request: Request) -> bool:
+        """Return whether the request is authorized or sampled."""
+        if self.authorizes(request.headers.get(PROFILE_HEADER)):
+            return True
+
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    @contextmanager
+    def profiling(self, request: Request) -> Iterator[Optional[Profile]]:
+        """Expose a profile to the view when the request must be profiled."""
+        profile = Profile() if self.should_profile(request) else None
+        token = current_profile.set(profile)
+        try:
+            yield profile
+        finally:
+            current_profile.reset(token)
+
+    def save(
+        self,
+        profile: Profile,
+        request: Request,
+        status_code: int,
+        duration: float
+    ) -> ProfileRecord:
+        """Dump the profile as a pstats file named after the ccid."""
+        ccid = self.ccid_provider()
+        os.makedirs(self.directory, exist_ok=True)
+        file = os.path.join(self.directory, f'{ccid}.pstats')
+        profile.dump_stats(file)
+
+        record = ProfileRecord(
+            ccid=ccid,
+            method=request.method,
+            path=request.url.path,
+            status_code=status_code,
+            duration=duration,
+            file=file,
+            layers=time_by_layer(profile),
+        )
+        self.records.append(record)
+        return record
+
+    def recent(self) -> List[Dict]:
+        """Return the recent profiles, the latest first."""
+        return [record.as_dict() for record in reversed(self.records)]
+
+
+def profiled(endpoint: Callable) -> Callable:
+    """Run the endpoint under the profile of the request, if any.
+
+    The endpoint runs on a worker thread, and cProfile only sees the thread
+    that enabled it, so the profile is enabled around the endpoint itself.
+    """
+    if getattr(endpoint, 'profiled', False):
+        return endpoint
+
+    @wraps(endpoint)
+    def profiled_endpoint(*args: object, **kwargs: object) -> object:
+        profile = current_profile.get()
+        if profile is None:
+            return endpoint(*args, **kwargs)
+
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active in this process.
+            return endpoint(*args, **kwargs)
+
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profile.disable()
+
+    profiled_endpoint.profiled = True
+    return profiled_endpoint
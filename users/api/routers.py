@@ -1,6 +1,9 @@
+import asyncio
+from time import perf_counter
 from typing import Callable
 
-from fastapi import APIRouter, Request, Response
+from dependency_injector.wiring import inject, Provide
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi.routing import APIRoute
 from fastapi_versioning import version
 
@@ -8,21 +11,99 @@ from users.api.exceptions import (
     log_http,
     user_error_handler
 )
+from users.api.idempotency import idempotently, is_idempotent
+from users.api.profiling import INTERNAL_TOKEN_HEADER, profiled, RequestProfiler
+from users.api.startup import StartupReport
+from users.containers import UserContainer
+from users.core.exceptions import InternalAccessError
+from users.core.repositories import IdempotencyKeyRepository
+from users.orm.instrumentation import track_queries
+
+
+@inject
+def get_request_profiler(
+    request_profiler: RequestProfiler = Depends(
+        Provide[UserContainer.request_profiler]
+    )
+) -> RequestProfiler:
+    """Provide the request profiler of the container."""
+    return request_profiler
+
+
+def authorize_internal(request: Request) -> None:
+    """Reject the requests without the token of the request profiler."""
+    if not get_request_profiler().authorizes(request.headers.get(INTERNAL_TOKEN_HEADER)):
+        raise InternalAccessError()
+
+
+@inject
+def get_startup_report(
+    startup_report: StartupReport = Depends(Provide[UserContainer.startup_report])
+) -> StartupReport:
+    """Provide the startup report of the container."""
+    return startup_report
+
+
+@inject
+def get_idempotency_key_repo(
+    idempotency_key_repo: IdempotencyKeyRepository = Depends(
+        Provide[UserContainer.idempotency_key_repo]
+    )
+) -> IdempotencyKeyRepository:
+    """Provide the idempotency key repository of the container."""
+    return idempotency_key_repo
 
 
 class UsersRouteHandler(APIRoute):
-    """Catch and handle exceptions when a view method is called."""
+    """Catch and handle exceptions when a view method is called.
+
+    Also account the SQL statements issued by the request, reported in the
+    logs and in the ``Server-Timing`` response header, and profile the
+    requests picked by the ``RequestProfiler``. The first request served
+    completes the ``StartupReport``. Views marked ``idempotent`` replay
+    the response stored under the ``Idempotency-Key`` of the request.
+    """
 
     def get_route_handler(self) -> Callable:
         """Intercept all calls to an endpoint."""
+        if not asyncio.iscoroutinefunction(self.dependant.call):
+            self.dependant.call = profiled(self.dependant.call)
         original_route_handler = super().get_route_handler()
+        if is_idempotent(self.endpoint):
+            route_handler = original_route_handler
+
+            async def original_route_handler(request: Request) -> Response:
+                return await idempotently(
+                    request,
+                    get_idempotency_key_repo(),
+                    route_handler
+                )
 
         async def users_route_handler(request: Request) -> Response:
-            try:
-                response = await original_route_handler(request)
-                await log_http('INFO', request, response)
-            except Exception as error:
-                response = await user_error_handler(request, error)
+            request_profiler = get_request_profiler()
+            with request_profiler.profiling(request) as profile, \
+                    track_queries() as query_stats:
+                start = perf_counter()
+                try:
+                    response = await original_route_handler(request)
+                    await log_http('INFO', request, response)
+                except Exception as error:
+                    response = await user_error_handler(request, error)
+                duration = perf_counter() - start
+
+            get_startup_report().first_request_served(duration)
+            if profile is not None:
+                request_profiler.save(
+                    profile,
+                    request,
+                    response.status_code,
+                    duration
+                )
+
+            response.headers['Server-Timing'] = (
+                f'db;desc="{query_stats.count} statements";'
+                f'dur={query_stats.duration * 1000:.3f}'
+            )
             return response
 
         return users_route_handler
@@ -1,13 +1,17 @@
+from time import perf_counter
+
 from fastapi import FastAPI
 from fastapi_versioning import VersionedFastAPI
 
-from users.api import views
+from users.api import IMPORT_STARTED, views
 from users.api.middlewares import rest_api_ccid_provider_middleware
+from users.api.startup import IMPORT, WIRING
 from users.containers import UserContainer
 
 
 def create_app() -> FastAPI:
     """Configure the application container and start event loop listening."""
+    wiring_started = perf_counter()
     container = UserContainer()
     container.config.db_uri.from_env('DB_URI')
     container.config.customer_api_url.from_env('CUSTOMER_API_URL')
@@ -18,9 +22,15 @@ def create_app() -> FastAPI:
     )
     container.config.identity_validation_svc_url.from_env('IDENTITY_VALIDATION_SVC_URL')
     container.config.merlin_api_url.from_env('MERLIN_API_URL')
+    container.config.slow_query_threshold_ms.from_env('SLOW_QUERY_THRESHOLD_MS')
+    container.config.profiling_token.from_env('PROFILING_TOKEN')
+    container.config.profiling_sample_rate.from_env('PROFILING_SAMPLE_RATE')
+    container.config.profiling_dir.from_env('PROFILING_DIR')
+    container.config.idempotency_ttl_seconds.from_env('IDEMPOTENCY_TTL_SECONDS')
+    container.config.warm_up_service_agr_ids.from_env('WARM_UP_SERVICE_AGR_IDS')
+    container.wire()
 
     app = FastAPI()
-    app.container = container
     app.include_router(views.routes)
     app.include_router(views.apidoc)
     app = VersionedFastAPI(
@@ -29,6 +39,11 @@ def create_app() -> FastAPI:
         prefix_format="/v{major}"
     )
     app.middleware('http')(rest_api_ccid_provider_middleware)
+    app.container = container
+
+    startup_report = container.startup_report()
+    startup_report.record(IMPORT, wiring_started - IMPORT_STARTED)
+    startup_report.record(WIRING, perf_counter() - wiring_started)
 
     return app
 
@@ -0,0 +1,94 @@
+"""Gunicorn settings of the production server.
+
+Run it with ``gunicorn -c python:users.api.server users.api.run:app``.
+
+The app is imported once by the master and forked into the workers, which
+share the imported modules. Each worker warms up before it accepts requests,
+and publishes the events it queued before it exits.
+
+``WEB_CONCURRENCY`` sets the amount of workers, by default one per CPU of the
+cgroup quota. ``PORT`` sets the port, 7105 by default.
+"""
+import math
+import os
+from typing import Optional
+
+from gunicorn.workers.base import Worker
+
+CGROUP_V2_CPU_MAX = '/sys/fs/cgroup/cpu.max'
+CGROUP_V1_CPU_QUOTA = '/sys/fs/cgroup/cpu/cpu.cfs_quota_us'
+CGROUP_V1_CPU_PERIOD = '/sys/fs/cgroup/cpu/cpu.cfs_period_us'
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_quota() -> Optional[float]:
+    """Return the CPUs granted by the cgroup quota, None when unlimited."""
+    cpu_max = _read(CGROUP_V2_CPU_MAX)
+    if cpu_max is not None:
+        quota, _, period = cpu_max.partition(' ')
+        if quota != 'max':
+            return int(quota) / int(period or 100000)
+        return None
+
+    quota, period = _read(CGROUP_V1_CPU_QUOTA), _read(CGROUP_V1_CPU_PERIOD)
+    if quota is not None and period is not None and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def available_cpus() -> int:
+    """Return the CPUs this process may use, the cgroup quota included."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota = cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(cpus, 1)
+
+
+def worker_count() -> int:
+    """Return the configured amount of workers, or one per available CPU."""
+    configured = os.environ.get('WEB_CONCURRENCY')
+    if configured:
+        return max(int(configured), 1)
+    return available_cpus()
+
+
+def post_fork(server: object, worker: Worker) -> None:
+    """Make the worker create its own database engine and connections."""
+    from users.api.run import app
+
+    app.container.database.reset()
+
+
+def post_worker_init(worker: Worker) -> None:
+    """Warm the worker up before it starts accepting requests."""
+    from users.api.run import app
+    from users.api.warmup import warm_up
+
+    warm_up(app.container)
+
+
+def worker_exit(server: object, worker: Worker) -> None:
+    """Publish the events the worker queued before it exits."""
+    from users.api.run import app
+
+    app.container.event_manager().close()
+
+
+bind = f'0.0.0.0:{os.environ.get("PORT", 7105)}'
+workers = worker_count()
+worker_class = 'uvicorn.workers.UvicornWorker'
+preload_app = True
+timeout = 60
+graceful_timeout = 30
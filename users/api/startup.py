@@ -0,0 +1,64 @@
+"""Report how long the process took to become ready to serve.
+
+The report holds the seconds spent importing the application, wiring the
+container, warming the worker up and serving the first request. It is logged
+once, after the first request, and exposed by ``/users/internal/startup``.
+"""
+from contextlib import contextmanager
+from logging import Logger
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Iterator, Optional
+
+from users.api import IMPORT_STARTED
+
+IMPORT = 'import'
+WIRING = 'wiring'
+WARM_UP = 'warm_up'
+FIRST_REQUEST = 'first_request'
+
+
+class StartupReport:
+    """Startup phases of this process and the seconds each one took."""
+
+    def __init__(self, logger: Optional[Logger] = None):
+        """Start an empty report, logged with the logger when given."""
+        self.logger = logger
+        self.phases: Dict[str, float] = {}
+        self.ready_in: Optional[float] = None
+        self._lock = Lock()
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Record the seconds a phase took."""
+        self.phases[phase] = seconds
+
+    @contextmanager
+    def timed(self, phase: str) -> Iterator[None]:
+        """Record the seconds the block takes as the phase."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, perf_counter() - start)
+
+    def first_request_served(self, seconds: float) -> None:
+        """Record the first request and log the report, once per process."""
+        with self._lock:
+            if FIRST_REQUEST in self.phases:
+                return
+            self.record(FIRST_REQUEST, seconds)
+            self.ready_in = perf_counter() - IMPORT_STARTED
+
+        if self.logger is not None:
+            self.logger.info({'startup': self.as_dict()})
+
+    def as_dict(self) -> Dict:
+        """Return the report as a json serializable dict, in milliseconds."""
+        return {
+            'phases_ms': {
+                phase: round(seconds * 1000, 3)
+                for phase, seconds in self.phases.items()
+            },
+            'first_request_after_ms': round(self.ready_in * 1000, 3)
+            if self.ready_in is not None else None,
+        }
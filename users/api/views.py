@@ -6,15 +6,20 @@ from dependency_injector.wiring import (
     inject,
     Provide,
 )
-from fastapi import Depends
+from fastapi import Depends, Query
 from fastapi.responses import FileResponse, JSONResponse
 from nwkcorelib import CommandBus
 
-from users.api.routers import apidoc, routes, v2
+from users.api.idempotency import idempotent
+from users.api.profiling import RequestProfiler
+from users.api.routers import apidoc, authorize_internal, routes, v2
+from users.api.startup import StartupReport
 from users.containers import UserContainer
 from users.core.actions import GetUserContactMethods
+from users.core.exceptions import BatchTooLargeError
 from users.core.models import Identity, SignUp
 from users.core.models.states import SignUpStage
+from users.odm.registry import get_compiled_schema, get_schema
 from users.odm.schemas import (
     ConfirmIdentityResponseSchema,
     ConfirmIdentitySchema,
@@ -29,6 +34,7 @@ from users.odm.schemas import (
     GetUserContactMethodsRequest,
     GetUserContactMethodsResponse,
     IdentitySchema,
+    ImportSignUpsSchema,
     RequestSignUpStageByUserId,
     SavePhoneConfirmationResponse,
     SignUpResourceSchema,
@@ -41,7 +47,10 @@ from users.odm.schemas import (
     UserPhoneNumberConfirmationRequest,
     UserResourceSchema,
 )
+from users.onboarding import import_sign_ups, MAX_BULK_SIGN_UPS
 from users.orm import Database
+from users.orm.archive import hot_set_size
+from users.orm.instrumentation import SlowQueryLog
 
 
 @routes.get("/status")
@@ -55,6 +64,66 @@ def status(database: Database = Depends(Provide[UserContainer.database])):
     return JSONResponse(status_code=HTTPStatus.OK)
 
 
+@routes.get('/internal/profiles', dependencies=[Depends(authorize_internal)])
+@v2
+@inject
+def list_profiles(
+    request_profiler: RequestProfiler = Depends(
+        Provide[UserContainer.request_profiler]
+    )
+) -> JSONResponse:
+    """List the recent request profiles of this process."""
+    return JSONResponse(
+        status_code=HTTPStatus.OK,
+        content={'data': request_profiler.recent()}
+    )
+
+
+@routes.get('/internal/startup', dependencies=[Depends(authorize_internal)])
+@v2
+@inject
+def get_startup_report(
+    startup_report: StartupReport = Depends(Provide[UserContainer.startup_report])
+) -> JSONResponse:
+    """Report how long this process took to serve its first request."""
+    return JSONResponse(
+        status_code=HTTPStatus.OK,
+        content={'data': startup_report.as_dict()}
+    )
+
+
+@routes.get('/internal/slow-queries', dependencies=[Depends(authorize_internal)])
+@v2
+@inject
+def list_slow_queries(
+    limit: int = Query(20, gt=0),
+    slow_query_log: SlowQueryLog = Depends(Provide[UserContainer.slow_query_log])
+) -> JSONResponse:
+    """List the slowest statement fingerprints of this process."""
+    return JSONResponse(
+        status_code=HTTPStatus.OK,
+        content={
+            'data': slow_query_log.top(limit),
+            'meta': {
+                'enabled': slow_query_log.enabled,
+                'threshold_ms': slow_query_log.threshold * 1000
+                if slow_query_log.enabled else None,
+            }
+        }
+    )
+
+
+@routes.get('/internal/hot-set', dependencies=[Depends(authorize_internal)])
+@v2
+@inject
+def get_hot_set(database: Database = Depends(Provide[UserContainer.database])) -> JSONResponse:
+    """Count the rows of the tables the onboarding works on and the archive."""
+    with database.session() as session:
+        size = hot_set_size(session)
+
+    return JSONResponse(status_code=HTTPStatus.OK, content={'data': size})
+
+
 @apidoc.get('/swagger.yml')
 @v2
 def docs() -> FileResponse:
@@ -89,12 +158,12 @@ def get_user_by_id(
     JSONResponse
         A single user with its customer data.
     """
-    request_schema = GetUserByIdRequest()
-    response_schema = UserByIdResource(
+    request_schema = get_schema(GetUserByIdRequest)
+    response_schema = get_compiled_schema(
+        UserByIdResource,
         url_resolver=routes.url_path_for,
         view_to_resolve='get_user_by_id',
         api_version=2,
-        view_kwargs={'user_id': user_id},
         http_methods=['GET']
     )
 
@@ -102,10 +171,11 @@ def get_user_by_id(
 
     user = command_bus.handle(loaded_request_schema.data)
 
-    response_schema.dump(user)
-
     return JSONResponse(
-        content=response_schema.data_with_hypermedia,
+        content=response_schema.dump_with_hypermedia(
+            user,
+            view_kwargs={'user_id': user_id}
+        ),
         status_code=HTTPStatus.OK
     )
 
@@ -132,8 +202,8 @@ def get_user(
     JSONResponse
         A single user with its customer data.
     """
-    request_schema = GetUserByIdRequest()
-    response_schema = UserResourceSchema()
+    request_schema = get_schema(GetUserByIdRequest)
+    response_schema = get_compiled_schema(UserResourceSchema)
 
     get_user_action = request_schema.load({'user_id': user_id}).data
     get_user_action.fetch_customer = False
@@ -172,8 +242,8 @@ def get_user_contact_methods(
     JSONResponse
         A list with all the contact methods of the user found.
     """
-    request_schema = GetUserContactMethodsRequest()
-    response_schema = GetUserContactMethodsResponse()
+    request_schema = get_schema(GetUserContactMethodsRequest)
+    response_schema = get_compiled_schema(GetUserContactMethodsResponse)
 
     action: GetUserContactMethods = request_schema.load({'user_id': user_id}).data
 
@@ -203,8 +273,8 @@ def get_user_by_business_model(
     command_bus: CommandBus = Depends(Provide[UserContainer.command_bus])
 ) -> JSONResponse:
     """Retrieve a specific user by its document and business model."""
-    request_schema = GetUserByDocumentRequest()
-    response_schema = UserByIdResource()
+    request_schema = get_schema(GetUserByDocumentRequest)
+    response_schema = get_compiled_schema(UserByIdResource)
     loaded_request_schema = request_schema.load({
         'document_type': document_type,
         'document_value': document_value,
@@ -258,8 +328,8 @@ def get_user_by_service_agreement_id(
     JSONResponse
         A single user with its customer and service agreement data
     """
-    request_schema = GetUserByDocumentRequest()
-    response_schema = UserByDocumentResource()
+    request_schema = get_schema(GetUserByDocumentRequest)
+    response_schema = get_compiled_schema(UserByDocumentResource)
     loaded_request_schema = request_schema.load({
         'document_type': document_type,
         'document_value': document_value,
@@ -285,6 +355,7 @@ def get_user_by_service_agreement_id(
     '/signup/{user_id}/phone_confirmation'
 )
 @v2
+@idempotent
 @inject
 def create_phone_confirmation(
     user_id: str,
@@ -306,11 +377,11 @@ def create_phone_confirmation(
     JSONResponse
         Retrieve a empty message
     """
-    request_schema = UserPhoneNumberConfirmationRequest()
-    response_schema = SavePhoneConfirmationResponse(
+    request_schema = get_schema(UserPhoneNumberConfirmationRequest)
+    response_schema = get_compiled_schema(
+        SavePhoneConfirmationResponse,
         url_resolver=routes.url_path_for,
         view_to_resolve='create_phone_confirmation',
-        view_kwargs={'user_id': user_id},
         http_methods=['GET', 'PATCH']
     )
 
@@ -321,12 +392,11 @@ def create_phone_confirmation(
 
     command_bus.handle(loaded_request_schema.data)
 
-    response_schema.dump({
-        'id': user_id
-    })
-
     return JSONResponse(
-        content=response_schema.data_with_hypermedia,
+        content=response_schema.dump_with_hypermedia(
+            {'id': user_id},
+            view_kwargs={'user_id': user_id}
+        ),
         status_code=HTTPStatus.CREATED
     )
 
@@ -356,11 +426,11 @@ def confirm_phone_number(
     JSONResponse
         Retrieve a empty message
     """
-    request_schema = ConfirmPhoneNumberRequest()
-    response_schema = SavePhoneConfirmationResponse(
+    request_schema = get_schema(ConfirmPhoneNumberRequest)
+    response_schema = get_compiled_schema(
+        SavePhoneConfirmationResponse,
         url_resolver=routes.url_path_for,
         view_to_resolve='create_phone_confirmation',
-        view_kwargs={'user_id': user_id},
         http_methods=['GET', 'PATCH']
     )
 
@@ -371,24 +441,26 @@ def confirm_phone_number(
 
     command_bus.handle(loaded_request_schema.data)
 
-    response_schema.dump({'id': user_id})
-
     return JSONResponse(
-        content=response_schema.data_with_hypermedia,
+        content=response_schema.dump_with_hypermedia(
+            {'id': user_id},
+            view_kwargs={'user_id': user_id}
+        ),
         status_code=HTTPStatus.OK
     )
 
 
 @routes.post('/signup/email_confirmation')
 @v2
+@idempotent
 @inject
 def post_email_confirmation(
     request_payload: dict,
     command_bus: CommandBus = Depends(Provide[UserContainer.command_bus])
 ) -> JSONResponse:
     """Create a new sign up process."""
-    request_schema = CreateSignUpSchema()
-    response_schema = SignUpResourceSchema(only=('user_id',))
+    request_schema = get_schema(CreateSignUpSchema)
+    response_schema = get_compiled_schema(SignUpResourceSchema, only=('user_id',))
 
     loaded_request_schema = request_schema.load(request_payload)
 
@@ -402,6 +474,34 @@ def post_email_confirmation(
     )
 
 
+@routes.post('/signup/bulk')
+@v2
+@inject
+def post_bulk_email_confirmation(
+    request_payload: dict,
+    command_bus: CommandBus = Depends(Provide[UserContainer.command_bus])
+) -> JSONResponse:
+    """Create the sign up processes of many emails, skipping the registered.
+
+    Up to ``MAX_BULK_SIGN_UPS`` emails are accepted per request, larger ones
+    are rejected before they are loaded.
+    """
+    sign_ups = request_payload.get('sign_ups')
+    if isinstance(sign_ups, list) and len(sign_ups) > MAX_BULK_SIGN_UPS:
+        raise BatchTooLargeError(len(sign_ups), MAX_BULK_SIGN_UPS)
+
+    request_schema = get_schema(ImportSignUpsSchema)
+
+    loaded_request_schema = request_schema.load(request_payload)
+
+    total = import_sign_ups(command_bus, loaded_request_schema.data.sign_ups)
+
+    return JSONResponse(
+        content={'data': {'created': total.created, 'skipped': total.skipped}},
+        status_code=HTTPStatus.OK
+    )
+
+
 @routes.get('/signup/email_confirmation/{token}')
 @v2
 @inject
@@ -415,8 +515,8 @@ def post_email_confirmation_token(
     Set contact method as confirmed and sign up stage to IDENTITY_VALIDATION
     if the token validation succeed.
     """
-    request_schema = TokenValidationRequestSchema()
-    response_schema = SignUpResourceSchema(only=('user_id',))
+    request_schema = get_schema(TokenValidationRequestSchema)
+    response_schema = get_compiled_schema(SignUpResourceSchema, only=('user_id',))
 
     loaded_request_schema = request_schema.load({'token': token})
     token_validation: SignUp = command_bus.handle(loaded_request_schema.data)
@@ -444,7 +544,7 @@ def validate_user_identity(
     command_bus: CommandBus = Depends(Provide[UserContainer.command_bus])
 ) -> JSONResponse:
     """Get user ID and request user's identity validation."""
-    request_schema = UserIdentityValidationRequestSchema()
+    request_schema = get_schema(UserIdentityValidationRequestSchema)
 
     payload.update({'user_id': user_id})
     loaded_request = request_schema.load(payload)
@@ -475,12 +575,12 @@ def get_user_identity_validation(
     command_bus: CommandBus = Depends(Provide[UserContainer.command_bus])
 ) -> JSONResponse:
     """Get user identity validation result."""
-    request_schema = GetIdentityValidationSchema()
-    response_schema = IdentitySchema(
+    request_schema = get_schema(GetIdentityValidationSchema)
+    response_schema = get_compiled_schema(
+        IdentitySchema,
         url_resolver=routes.url_path_for,
         view_to_resolve='get_user_identity_validation',
         api_version=2,
-        view_kwargs={'user_id': user_id},
         http_methods=['GET'],
     )
 
@@ -488,12 +588,15 @@ def get_user_identity_validation(
 
     identity: Identity = command_bus.handle(loaded_request.data)
 
-    response_schema.dump(identity)
-    response_content = response_schema.data_with_hypermedia
+    response_content = response_schema.dump_with_hypermedia(
+        identity,
+        view_kwargs={'user_id': user_id}
+    )
 
     if command_bus.errors:
+        error_schema = get_schema(ErrorSchema)
         response_content['errors'] = [
-            ErrorSchema().dump(error).data for error in command_bus.errors
+            error_schema.dump(error).data for error in command_bus.errors
         ]
 
     return JSONResponse(
@@ -513,8 +616,8 @@ def confirm_user_identity(
     command_bus: CommandBus = Depends(Provide[UserContainer.command_bus])
 ) -> JSONResponse:
     """Confirm user identity. Assign address and customer."""
-    request_schema = ConfirmIdentitySchema()
-    response_schema = ConfirmIdentityResponseSchema()
+    request_schema = get_schema(ConfirmIdentitySchema)
+    response_schema = get_compiled_schema(ConfirmIdentityResponseSchema)
 
     loaded_request = request_schema.load({'user_id': user_id, **payload})
 
@@ -541,11 +644,11 @@ def get_sign_up_stage(
     command_bus: CommandBus = Depends(Provide[UserContainer.command_bus])
 ) -> JSONResponse:
     """Get sign up stage by its user id."""
-    request_schema = RequestSignUpStageByUserId()
-    response_schema = SignUpResourceSchema(
+    request_schema = get_schema(RequestSignUpStageByUserId)
+    response_schema = get_compiled_schema(
+        SignUpResourceSchema,
         url_resolver=routes.url_path_for,
         view_to_resolve='get_sign_up_stage',
-        view_kwargs={'user_id': user_id},
         http_methods=['GET', 'PATCH', 'POST'],
         only=('stage',)
     )
@@ -554,10 +657,11 @@ def get_sign_up_stage(
 
     stage: SignUpStage = command_bus.handle(loaded_request.data)
 
-    response_schema.dump({'stage': stage})
-
     return JSONResponse(
-        content=response_schema.data_with_hypermedia,
+        content=response_schema.dump_with_hypermedia(
+            {'stage': stage},
+            view_kwargs={'user_id': user_id}
+        ),
         status_code=HTTPStatus.OK
     )
 
@@ -570,16 +674,16 @@ def get_service_agreement(
     command_bus: CommandBus = Depends(Provide[UserContainer.command_bus])
 ) -> JSONResponse:
     """Retrieve any Service Agreement by ID."""
-    request_schema = GetServiceAgreementRequest()
-    response_schema = GetServiceAgreementResponse(
+    request_schema = get_schema(GetServiceAgreementRequest)
+    response_schema = get_compiled_schema(
+        GetServiceAgreementResponse,
         only=('id', 'legal_validation_config',)
     )
 
     action = request_schema.load({'service_agreement_id': service_agreement_id}).data
     service_agr = command_bus.handle(action)
-    response_schema.dump(service_agr).data
     return JSONResponse(
-        content=response_schema.data_with_hypermedia,
+        content=response_schema.dump_with_hypermedia(service_agr),
         status_code=HTTPStatus.OK
     )
 
@@ -593,18 +697,20 @@ def update_legal_validation(
     command_bus: CommandBus = Depends(Provide[UserContainer.command_bus])
 ) -> JSONResponse:
     """Update a Legal Validation."""
-    request_schema = UpdateLegalValidationRequest()
-    response_schema = UpdateLegalValidationResponse(
+    request_schema = get_schema(UpdateLegalValidationRequest)
+    response_schema = get_compiled_schema(
+        UpdateLegalValidationResponse,
         url_resolver=routes.url_path_for,
         view_to_resolve='update_legal_validation',
-        view_kwargs={'user_id': user_id},
         http_methods=['PATCH']
     )
     payload.update({'user_id': user_id})
     action = request_schema.load(payload).data
     command_bus.handle(action)
-    response_schema.dump({'user_id': user_id}).data
     return JSONResponse(
-        content=response_schema.data_with_hypermedia,
+        content=response_schema.dump_with_hypermedia(
+            {'user_id': user_id},
+            view_kwargs={'user_id': user_id}
+        ),
         status_code=HTTPStatus.OK
     )
@@ -0,0 +1,130 @@
+"""Prepare a freshly started worker before it accepts requests."""
+from logging import Logger
+import socket
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from users.api.startup import WARM_UP
+from users.containers import UserContainer
+from users.core.exceptions import EntityNotFound
+
+CONTACT_METHOD_TYPES = ('EMAIL', 'PHONE', 'ADDRESS')
+DEFAULT_PORTS = {'http': 80, 'https': 443, 'amqp': 5672, 'amqps': 5671}
+
+
+def fill_connection_pool(container: UserContainer, size: int) -> None:
+    """Open ``size`` database connections at once and return them to the pool."""
+    engine = container.database().engine
+    connections = []
+    try:
+        for _ in range(size):
+            connection = engine.connect()
+            connection.execute(text('SELECT 1'))
+            connections.append(connection)
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def service_agr_ids(container: UserContainer) -> List[int]:
+    """Return the service agreements of ``WARM_UP_SERVICE_AGR_IDS`` to load."""
+    configured = container.config.warm_up_service_agr_ids() or ''
+    return [int(agr_id) for agr_id in str(configured).split(',') if agr_id.strip()]
+
+
+def prime_query_cache(container: UserContainer, logger: Logger) -> None:
+    """Configure the mappers and run the reference data lookups once.
+
+    Leaves the mappers configured and the statements of the lookups in the
+    SQLAlchemy compiled cache, so the first requests do not pay for them.
+    The entities loaded are not kept, the requests still query them.
+    Service agreements not found are logged and skipped.
+    """
+    configure_mappers()
+
+    contact_method_type_repo = container.contact_method_type_repo()
+    for description in CONTACT_METHOD_TYPES:
+        contact_method_type_repo.get(description)
+
+    service_agreement_repo = container.service_agreement_repo()
+    for service_agr_id in service_agr_ids(container):
+        try:
+            service_agreement_repo.get(service_agr_id)
+        except EntityNotFound:
+            logger.warning(f'Warm-up could not find the service agreement {service_agr_id}')
+
+
+def downstream_addresses(container: UserContainer) -> List[Tuple[str, int]]:
+    """Return the host and port of the configured downstream services."""
+    config = container.config
+    urls = (
+        config.customer_api_url(),
+        config.identity_validation_svc_url(),
+        config.merlin_api_url(),
+        config.broker_url(),
+    )
+    addresses = []
+    for url in filter(None, urls):
+        parsed = urlparse(url)
+        if parsed.hostname is None:
+            continue
+        addresses.append((
+            parsed.hostname,
+            parsed.port or DEFAULT_PORTS.get(parsed.scheme, 80)
+        ))
+    return addresses
+
+
+def connect_downstream(
+    container: UserContainer,
+    timeout: float,
+    logger: Logger
+) -> None:
+    """Resolve and connect to every downstream service.
+
+    Warms the resolver cache and reports unreachable services. A failure is
+    logged and does not stop the worker, the service may recover later.
+    """
+    for host, port in downstream_addresses(container):
+        try:
+            socket.create_connection((host, port), timeout=timeout).close()
+        except OSError as error:
+            logger.warning(f'Warm-up could not reach {host}:{port}: {error}')
+
+
+def warm_up(
+    container: UserContainer,
+    pool_size: int = 5,
+    downstream_timeout: float = 1.0,
+    logger: Optional[Logger] = None
+) -> Dict[str, float]:
+    """Run every warm-up step and return the seconds each one took.
+
+    A failing step is logged and skipped, the worker starts anyway and its
+    first requests pay for what was not warmed up.
+    """
+    logger = logger or container.logger()
+    steps = (
+        ('connection_pool', lambda: fill_connection_pool(container, pool_size)),
+        ('query_cache', lambda: prime_query_cache(container, logger)),
+        ('downstream', lambda: connect_downstream(
+            container, downstream_timeout, logger
+        )),
+    )
+
+    timings = {}
+    for name, step in steps:
+        start = perf_counter()
+        try:
+            step()
+        except Exception as error:
+            logger.warning(f'Warm-up step {name} failed: {error!r}')
+        timings[name] = perf_counter() - start
+
+    logger.info({'warm_up_seconds': timings})
+    container.startup_report().record(WARM_UP, sum(timings.values()))
+    return timings
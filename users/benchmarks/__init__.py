@@ -0,0 +1,4 @@
+"""Micro-benchmarks of the handlers, schemas and api request path.
+
+Run ``python -m users.benchmarks --help`` for the available options.
+"""
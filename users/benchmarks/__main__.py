@@ -0,0 +1,136 @@
+"""Command line entry point of the benchmark suite.
+
+Examples
+--------
+Store a baseline of the in-memory suites::
+
+    python -m users.benchmarks --save baseline.json
+
+Compare the current tree against it, failing on a slowdown above 10%::
+
+    python -m users.benchmarks --compare baseline.json --threshold 0.1
+
+Report the memory taken by the slotted models and actions::
+
+    python -m users.benchmarks --suite memory
+
+Report the cost of each event message, publishing in batches of several
+sizes to an in-memory broker::
+
+    python -m users.benchmarks --suite events
+"""
+from argparse import ArgumentParser, Namespace
+import sys
+from typing import Iterator, List
+
+from users.benchmarks import api, composites, events, handlers, memory, runner, schemas
+from users.benchmarks.context import BACKENDS, build_container, MEMORY
+
+SUITES = ('handlers', 'schemas', 'api', 'memory', 'composites', 'events')
+
+
+def parse_args(argv: List[str]) -> Namespace:
+    """Parse the command line arguments."""
+    parser = ArgumentParser(prog='python -m users.benchmarks')
+    parser.add_argument(
+        '--suite', action='append', choices=SUITES,
+        help='suite to run, repeat to run several (default: all)'
+    )
+    parser.add_argument(
+        '--backend', action='append', choices=BACKENDS,
+        help='local repositories backend, repeat to run several '
+             f'(default: {MEMORY})'
+    )
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--filter', default='', help='run benchmarks whose '
+                        'name contains this text')
+    parser.add_argument('--save', help='write the results as a baseline file')
+    parser.add_argument('--compare', help='baseline file to compare against')
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help='allowed median slowdown before flagging a regression'
+    )
+    return parser.parse_args(argv)
+
+
+def collect(
+    suites: List[str],
+    backends: List[str]
+) -> Iterator[runner.Benchmark]:
+    """Build the benchmarks of the selected suites and backends.
+
+    Every container wires the api views when built, so each backend is
+    only built once the benchmarks of the previous one have been consumed.
+    """
+    for backend in backends:
+        container = build_container(backend)
+        if 'handlers' in suites:
+            yield from handlers.benchmarks(container, backend)
+        if 'api' in suites:
+            yield from api.benchmarks(container, backend)
+
+    if 'schemas' in suites:
+        yield from schemas.benchmarks(build_container(MEMORY))
+
+    if 'memory' in suites:
+        yield from memory.benchmarks()
+
+    if 'composites' in suites:
+        yield from composites.benchmarks()
+
+    if 'events' in suites:
+        yield from events.benchmarks(build_container(MEMORY))
+
+
+def main(argv: List[str]) -> int:
+    """Run the benchmarks and return the process exit status."""
+    args = parse_args(argv)
+    suites = args.suite or list(SUITES)
+    backends = args.backend or [MEMORY]
+
+    results = []
+    for benchmark in collect(suites, backends):
+        if args.filter not in benchmark.name:
+            continue
+        result = runner.run(benchmark, args.rounds)
+        results.append(result)
+        per_item = (
+            f'  {result.per_item * 1e6:>8.2f} us per item' if result.items > 1 else ''
+        )
+        print(
+            f'{result.name:<60} median {result.median * 1e6:>10.1f} us'
+            f'  stdev {result.stdev * 1e6:>9.1f} us{per_item}'
+        )
+
+    if 'memory' in suites:
+        for footprint in memory.footprints():
+            if args.filter in footprint.name:
+                print(
+                    f'{footprint.name:<60} {footprint.bytes:>8.1f} bytes'
+                    f'  {footprint.blocks:>5.2f} blocks per instance'
+                )
+
+    if args.save:
+        runner.save(results, args.save, meta={
+            'suites': suites,
+            'backends': backends,
+            'rounds': args.rounds,
+        })
+
+    if not args.compare:
+        return 0
+
+    comparisons = runner.compare(runner.load(args.compare), results)
+    regressions = [
+        comparison for comparison in comparisons
+        if comparison.is_regression(args.threshold)
+    ]
+    for comparison in comparisons:
+        flag = 'REGRESSION' if comparison in regressions else ''
+        print(f'{comparison.name:<60} {comparison.ratio:>6.2f}x {flag}')
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,175 @@
+"""Benchmark the full FastAPI request path through the TestClient."""
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from starlette.testclient import TestClient
+
+from users.api.run import app
+from users.benchmarks.fixtures import Seeder
+from users.benchmarks.runner import Benchmark
+from users.containers import UserContainer
+from users.core.models import ContactMethod, User
+from users.core.models.states import (
+    ContactConfirmationType,
+    SignUpStage,
+    UserStatus,
+)
+
+Request = Tuple[str, str, Optional[Dict]]
+
+ROOT_ENDPOINT = '/v2/users'
+
+
+def benchmarks(container: UserContainer, backend: str) -> List[Benchmark]:
+    """Return one benchmark per endpoint, wired to the given container."""
+    client = TestClient(app)
+    seed = Seeder(container)
+
+    def send(request: Request) -> None:
+        method, path, payload = request
+        response = client.request(method, f'{ROOT_ENDPOINT}{path}', json=payload)
+        if response.status_code >= 400:
+            raise AssertionError(f'{method} {path}: {response.text}')
+
+    def benchmark(view_name: str, setup: Callable[[], Request]) -> Benchmark:
+        return Benchmark(
+            name=f'api[{backend}].{view_name}',
+            func=send,
+            setup=setup,
+        )
+
+    def pending_validation_user(
+        stage: SignUpStage,
+        *contact_methods: ContactMethod
+    ) -> User:
+        user = seed.user(
+            status=UserStatus.PENDING_VALIDATION,
+            contact_methods=[
+                seed.contact_method('EMAIL', f'{uuid4()}@email.com', True),
+                *contact_methods,
+            ]
+        )
+        seed.sign_up(user, stage)
+        return user
+
+    def get_user_by_id() -> Request:
+        return 'GET', f'/byId/{seed.active_user().id}', None
+
+    def get_user() -> Request:
+        return 'GET', f'/{seed.active_user().id}', None
+
+    def get_user_contact_methods() -> Request:
+        return 'GET', f'/{seed.active_user().id}/contact_methods', None
+
+    def get_user_by_service_agreement_id() -> Request:
+        customer = seed.customer()
+        seed.active_user(customer)
+        return (
+            'GET',
+            f'/byDocument/{customer.document_type}/{customer.document_number}/0',
+            None
+        )
+
+    def post_email_confirmation() -> Request:
+        return 'POST', '/signup/email_confirmation', {
+            'service_agr_id': 0,
+            'email': f'{uuid4()}@email.com'
+        }
+
+    def post_email_confirmation_token() -> Request:
+        email = seed.contact_method('EMAIL', f'{uuid4()}@email.com', False)
+        user = seed.user(
+            status=UserStatus.PENDING_VALIDATION,
+            contact_methods=[email]
+        )
+        seed.sign_up(user, SignUpStage.EMAIL_CONFIRMATION)
+        token = email.contact_confirmation.value
+        return 'GET', f'/signup/email_confirmation/{token}', None
+
+    def create_phone_confirmation() -> Request:
+        user = pending_validation_user(SignUpStage.LEGAL_VALIDATION)
+        return (
+            'POST',
+            f'/signup/{user.id}/phone_confirmation',
+            {'phone_number': '+5401164372323'}
+        )
+
+    def confirm_phone_number() -> Request:
+        phone = seed.contact_method(
+            'PHONE',
+            '+5401164372323',
+            False,
+            confirmation_type=ContactConfirmationType.OTP,
+            confirmation_value='1234',
+        )
+        user = pending_validation_user(SignUpStage.LEGAL_VALIDATION, phone)
+        return 'PATCH', f'/signup/{user.id}/phone_confirmation', {'otp': '1234'}
+
+    def validate_user_identity() -> Request:
+        user = pending_validation_user(SignUpStage.IDENTITY_VALIDATION)
+        return 'POST', f'/signup/{user.id}/identity_validation', {
+            'ocr': 'ocr',
+            'selfie': 'selfie',
+            'face_id': 'face_id',
+            'base64_front': 'front',
+            'base64_selfie': 'selfie',
+            'base64_back': 'back',
+        }
+
+    def get_user_identity_validation() -> Request:
+        user = pending_validation_user(SignUpStage.IDENTITY_VALIDATION)
+        seed.address(user)
+        return 'GET', f'/signup/{user.id}/identity_validation', None
+
+    def confirm_user_identity() -> Request:
+        user = pending_validation_user(SignUpStage.IDENTITY_VALIDATION)
+        address = seed.address(user)
+        return (
+            'PATCH',
+            f'/signup/{user.id}/identity_validation',
+            {'address_id': str(address.address_id)}
+        )
+
+    def get_sign_up_stage() -> Request:
+        user = pending_validation_user(SignUpStage.IDENTITY_VALIDATION)
+        return 'GET', f'/signup/{user.id}', None
+
+    def get_service_agreement() -> Request:
+        return 'GET', '/service-agreements/0', None
+
+    def update_legal_validation() -> Request:
+        user = seed.active_user()
+        seed.sign_up(user, SignUpStage.IDENTITY_VALIDATION)
+        return 'PATCH', f'/signup/{user.id}/legal_validation', {
+            'pep': False,
+            'so': False,
+            'facta': False,
+            'occupation_id': str(uuid4()),
+            'relationship': 'SINGLE',
+        }
+
+    return [
+        benchmark('get_user_by_id', get_user_by_id),
+        benchmark('get_user', get_user),
+        benchmark('get_user_contact_methods', get_user_contact_methods),
+        benchmark(
+            'get_user_by_service_agreement_id',
+            get_user_by_service_agreement_id
+        ),
+        benchmark('post_email_confirmation', post_email_confirmation),
+        benchmark(
+            'post_email_confirmation_token',
+            post_email_confirmation_token
+        ),
+        benchmark('create_phone_confirmation', create_phone_confirmation),
+        benchmark('confirm_phone_number', confirm_phone_number),
+        benchmark('validate_user_identity', validate_user_identity),
+        benchmark(
+            'get_user_identity_validation',
+            get_user_identity_validation
+        ),
+        benchmark('confirm_user_identity', confirm_user_identity),
+        benchmark('get_sign_up_stage', get_sign_up_stage),
+        benchmark('get_service_agreement', get_service_agreement),
+        benchmark('update_legal_validation', update_legal_validation),
+    ]
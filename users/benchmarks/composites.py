@@ -0,0 +1,61 @@
+"""Benchmark the composite types built on every ORM load and update.
+
+``composites.generic.*`` runs the generic ``CompositeType.recreate`` the
+generated one replaces.
+"""
+from datetime import datetime, timedelta
+from typing import List
+
+from users.benchmarks.runner import Benchmark
+from users.core.models.compositions import AuditFields, CompositeType, ContactConfirmation
+from users.core.models.states import ContactConfirmationType
+
+LIST_SIZE = 50
+
+
+def benchmarks() -> List[Benchmark]:
+    """Return the build, copy and conversion benchmarks of the composites."""
+    now = datetime.now()
+    confirmation_values = (
+        ContactConfirmationType.TOKEN, 'token', now, now + timedelta(days=1), None
+    )
+    audit_values = (None, now, None, now, None, None)
+    confirmation = ContactConfirmation(*confirmation_values)
+    audit_fields = AuditFields(*audit_values)
+
+    return [
+        Benchmark(
+            name=f'composites.ContactConfirmation.load[{LIST_SIZE}]',
+            func=lambda _: [
+                ContactConfirmation(*confirmation_values) for _ in range(LIST_SIZE)
+            ],
+        ),
+        Benchmark(
+            name=f'composites.AuditFields.load[{LIST_SIZE}]',
+            func=lambda _: [AuditFields(*audit_values) for _ in range(LIST_SIZE)],
+        ),
+        Benchmark(
+            name='composites.AuditFields.default',
+            func=lambda _: AuditFields(),
+        ),
+        Benchmark(
+            name='composites.ContactConfirmation.recreate',
+            func=lambda _: confirmation.recreate(confirmed_at=now),
+        ),
+        Benchmark(
+            name='composites.generic.ContactConfirmation.recreate',
+            func=lambda _: CompositeType.recreate(confirmation, confirmed_at=now),
+        ),
+        Benchmark(
+            name=f'composites.ContactConfirmation.__composite_values__[{LIST_SIZE}]',
+            func=lambda _: [
+                confirmation.__composite_values__() for _ in range(LIST_SIZE)
+            ],
+        ),
+        Benchmark(
+            name=f'composites.AuditFields.__composite_values__[{LIST_SIZE}]',
+            func=lambda _: [
+                audit_fields.__composite_values__() for _ in range(LIST_SIZE)
+            ],
+        ),
+    ]
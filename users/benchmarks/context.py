@@ -0,0 +1,100 @@
+"""Build the dependency container the benchmarks run against."""
+import os
+from typing import Dict
+
+from alembic.command import upgrade
+from alembic.config import Config
+from dependency_injector.providers import Factory, Object, Singleton
+
+from users.containers import UserContainer
+from users.memory import (
+    AddressMemoryRepository,
+    ContactMethodMemoryRepository,
+    ContactMethodTypeMemoryRepository,
+    CustomerMemoryRepository,
+    IdempotencyKeyMemoryRepository,
+    IdentityValidationMemoryRepository,
+    MemoryEventManager,
+    MemoryStore,
+    ServiceAgreementMemoryRepository,
+    SignUpMemoryRepository,
+    UserMemoryRepository,
+)
+from users.tests.mock_factory import identity_factory_mock
+
+MEMORY = 'memory'
+POSTGRES = 'postgres'
+BACKENDS = (MEMORY, POSTGRES)
+
+
+def settings() -> Dict:
+    """Read the container configuration from the same env vars as the app."""
+    return {
+        'db_uri': os.environ.get('DB_URI'),
+        'customer_api_url': os.environ.get('CUSTOMER_API_URL'),
+        'broker_url': os.environ.get('BROKER_URL'),
+        'jwt_secret': os.environ.get('JWT_SECRET', 'benchmark'),
+        'contact_confirmation_expiration_timedelta': os.environ.get(
+            'CONTACT_CONFIRMATION_EXPIRATION_TIMEDELTA', '48'
+        ),
+        'identity_validation_svc_url': os.environ.get(
+            'IDENTITY_VALIDATION_SVC_URL'
+        ),
+        'merlin_api_url': os.environ.get('MERLIN_API_URL'),
+    }
+
+
+def migrate() -> None:
+    """Bring the local PostgreSQL schema up to date."""
+    upgrade(Config(os.environ.get('ALEMBIC_CONFIG')), 'head')
+
+
+def use_memory_repositories(container: UserContainer) -> MemoryStore:
+    """Override the database repositories with in-memory ones."""
+    store = MemoryStore()
+    container.user_repo.override(Factory(UserMemoryRepository, store))
+    container.sign_up_repo.override(Factory(SignUpMemoryRepository, store))
+    container.contact_method_repo.override(
+        Factory(ContactMethodMemoryRepository, store)
+    )
+    container.contact_method_type_repo.override(
+        Factory(ContactMethodTypeMemoryRepository, store)
+    )
+    container.service_agreement_repo.override(
+        Factory(ServiceAgreementMemoryRepository, store)
+    )
+    container.idempotency_key_repo.override(
+        Singleton(IdempotencyKeyMemoryRepository, store)
+    )
+    return store
+
+
+def build_container(backend: str) -> UserContainer:
+    """Create a container whose external dependencies live in memory.
+
+    The local repositories use PostgreSQL for the ``postgres`` backend and
+    the in-memory store for the ``memory`` one. The api views are wired to
+    it.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f'backend must be one of {BACKENDS}')
+
+    container = UserContainer()
+    container.wire()
+    container.config.from_dict(settings())
+
+    if backend == MEMORY:
+        use_memory_repositories(container)
+    else:
+        migrate()
+
+    container.customer_repo.override(
+        Object(CustomerMemoryRepository())
+    )
+    container.identity_validation_repo.override(
+        Object(IdentityValidationMemoryRepository(identity_factory_mock()))
+    )
+    container.merlin_repo.override(Object(AddressMemoryRepository()))
+    container.event_manager.override(Object(MemoryEventManager()))
+
+    return container
@@ -0,0 +1,102 @@
+"""Benchmark the emission of the sign up and contact method events.
+
+The events are published to a ``MemoryBroker``, no broker is needed.
+``events.SavedSignUp.*`` splits the cost of each message: the ccid, a new
+``uuid4`` on every access, the payload built from the entities, resolving the
+event and serializing its message. ``events.EventPublisher.publish[...]``
+emits ``MESSAGES`` events through the publisher and waits for them to be
+published, once per batch size, reporting the time per message.
+``events.EventPublisher.emit[...]`` only times the emits, with the broker
+taking ``LATENCY`` seconds per message.
+"""
+from typing import List
+
+from users.benchmarks.fixtures import Seeder
+from users.benchmarks.runner import Benchmark
+from users.containers import UserContainer
+from users.core.models import SignUp, User
+from users.core.models.states import SignUpStage, UserStatus
+from users.events import SavedContactMethod, SavedSignUp
+from users.memory.events import MemoryBroker, message_body
+from users.publisher import EventPublisher, ResolvedEvent
+
+BATCH_SIZES = (1, 10, 100)
+MESSAGES = 100
+LATENCY = 0.0001
+
+
+def benchmarks(container: UserContainer) -> List[Benchmark]:
+    """Return the message cost and publishing benchmarks of the events."""
+    contact_method = Seeder(container).contact_method('EMAIL', 'some@email.com', False)
+    user = User(service_agr_id=0, status=UserStatus.PENDING_VALIDATION)
+    sign_up = SignUp(stage=SignUpStage.EMAIL_CONFIRMATION, user_id=user.id)
+    sign_up_saved = SavedSignUp(sign_up, user, contact_method)
+    contact_method_saved = SavedContactMethod('+5401164372323', '1234')
+    events = [
+        sign_up_saved if number % 2 else contact_method_saved
+        for number in range(MESSAGES)
+    ]
+    broker = MemoryBroker()
+
+    def publish(publisher: EventPublisher) -> None:
+        for event in events:
+            publisher.emit(event)
+        publisher.flush()
+        broker.clear()
+
+    def publishing(batch_size: int) -> Benchmark:
+        publisher = EventPublisher(broker, batch_size=batch_size)
+        return Benchmark(
+            name=f'events.EventPublisher.publish[batch={batch_size}, {MESSAGES}]',
+            func=publish,
+            setup=lambda: publisher,
+            items=MESSAGES,
+        )
+
+    def emit(publisher: EventPublisher) -> None:
+        for event in events:
+            publisher.emit(event)
+
+    slow_publisher = EventPublisher(
+        MemoryBroker(latency=LATENCY), queue_size=MESSAGES * 2
+    )
+
+    def flushed() -> EventPublisher:
+        # The events of the previous round are published untimed.
+        slow_publisher.flush()
+        return slow_publisher
+
+    return [
+        Benchmark(
+            name='events.SavedSignUp.ccid',
+            func=lambda _: sign_up_saved.ccid,
+        ),
+        Benchmark(
+            name='events.SavedSignUp.payload',
+            func=lambda _: sign_up_saved.payload,
+        ),
+        Benchmark(
+            name='events.SavedContactMethod.payload',
+            func=lambda _: contact_method_saved.payload,
+        ),
+        Benchmark(
+            name='events.SavedSignUp.resolve',
+            func=lambda _: ResolvedEvent(sign_up_saved),
+        ),
+        Benchmark(
+            name='events.SavedSignUp.message_body',
+            func=lambda _: message_body(sign_up_saved),
+        ),
+        Benchmark(
+            name='events.MemoryBroker.emit',
+            func=lambda _: broker.emit(sign_up_saved),
+            setup=broker.clear,
+        ),
+        *[publishing(batch_size) for batch_size in BATCH_SIZES],
+        Benchmark(
+            name=f'events.EventPublisher.emit[latency={LATENCY * 1e6:.0f}us, {MESSAGES}]',
+            func=emit,
+            setup=flushed,
+            items=MESSAGES,
+        ),
+    ]
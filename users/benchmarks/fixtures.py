@@ -0,0 +1,115 @@
+"""Seed fresh entities for every benchmark round."""
+from copy import deepcopy
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from uuid import UUID, uuid4
+
+from users.containers import UserContainer
+from users.core.models import (
+    Address,
+    ContactMethod,
+    Customer,
+    SignUp,
+    User,
+)
+from users.core.models.compositions import ContactConfirmation
+from users.core.models.states import (
+    ContactConfirmationType,
+    SignUpStage,
+    UserStatus,
+)
+from users.odm.schemas import CustomerResource
+from users.tests.base import BaseTestCase
+
+
+class Seeder:
+    """Persist benchmark entities through the container repositories."""
+
+    def __init__(self, container: UserContainer):
+        """Hold the container whose repositories receive the entities."""
+        self.container = container
+
+    def contact_method(
+        self,
+        type_: str,
+        value: str,
+        confirmed: bool,
+        confirmation_type: ContactConfirmationType = (
+            ContactConfirmationType.TOKEN
+        ),
+        confirmation_value: Optional[str] = None,
+    ) -> ContactMethod:
+        """Build a contact method with a still valid confirmation."""
+        now = datetime.now()
+        return ContactMethod(
+            type=self.container.contact_method_type_repo().get(type_),
+            value=value,
+            contact_confirmation=ContactConfirmation(
+                type=confirmation_type,
+                value=confirmation_value or str(uuid4()),
+                created_at=now,
+                expire_at=now + timedelta(hours=48),
+                confirmed_at=now if confirmed else None,
+            )
+        )
+
+    def user(
+        self,
+        status: UserStatus = UserStatus.ACTIVE,
+        contact_methods: Iterable[ContactMethod] = (),
+        customer_id: Optional[UUID] = None,
+        service_agr_id: int = 0,
+    ) -> User:
+        """Persist a user with the given contact methods."""
+        user = User(
+            service_agr_id=service_agr_id,
+            status=status,
+            customer_id=customer_id,
+        )
+        for contact_method in contact_methods:
+            contact_method.user_id = user.id
+            user.contact_methods.append(contact_method)
+
+        self.container.user_repo().save(user)
+        return user
+
+    def active_user(self, customer: Optional[Customer] = None) -> User:
+        """Persist a customer's user with a confirmed email and phone."""
+        return self.user(
+            customer_id=(customer or self.customer()).id,
+            contact_methods=[
+                self.contact_method('EMAIL', f'{uuid4()}@email.com', True),
+                self.contact_method('PHONE', '+5401164372323', True),
+            ]
+        )
+
+    def sign_up(self, user: User, stage: SignUpStage) -> SignUp:
+        """Persist the sign up of the user at the given stage."""
+        sign_up = SignUp(stage=stage, user_id=user.id)
+        self.container.sign_up_repo().save(sign_up)
+        return sign_up
+
+    def customer(self) -> Customer:
+        """Register a customer, loaded as the customer api returns it."""
+        dni = str(uuid4().int)[:8]
+        raw_customer = deepcopy(
+            BaseTestCase.CustomerMock().SUCCESSFUL_FILTER_RESPONSE['data'][0]
+        )
+        raw_customer['id'] = str(uuid4())
+        raw_customer['identifications']['DNI']['value'] = dni
+        raw_customer['identifications']['CUIL']['value'] = f'20{dni}5'
+
+        customer = CustomerResource().load(raw_customer).data
+        self.container.customer_repo().add(customer)
+        return customer
+
+    def address(self, user: User) -> Address:
+        """Register an address of the user in the address repository."""
+        raw_address = BaseTestCase.MerlinMock(user.id).SUCCESSFUL_GET_RESPONSE[0]
+        address = Address(**{
+            **raw_address,
+            'address_id': UUID(raw_address['address_id']),
+            'user_id': user.id,
+        })
+        self.container.merlin_repo().add(address)
+        return address
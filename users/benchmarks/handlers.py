@@ -0,0 +1,169 @@
+"""Benchmark every CommandBus handler end to end through the container."""
+from typing import Callable, List
+from uuid import uuid4
+
+from users.benchmarks.fixtures import Seeder
+from users.benchmarks.runner import Benchmark
+from users.containers import UserContainer
+from users.core.actions import (
+    ConfirmIdentity,
+    ConfirmPhoneNumber,
+    CreatePhoneConfirmation,
+    CreateSignUp,
+    GetIdentityValidation,
+    GetServiceAgreement,
+    GetSignUpStageByUserId,
+    GetUserByDocument,
+    GetUserById,
+    GetUserContactMethods,
+    UpdateLegalValidation,
+    ValidateEmailConfirmationToken,
+    ValidateUserIdentity,
+)
+from users.core.models import User
+from users.core.models.states import (
+    ContactConfirmationType,
+    SignUpStage,
+    UserStatus,
+)
+
+
+def benchmarks(container: UserContainer, backend: str) -> List[Benchmark]:
+    """Return one benchmark per action registered in the command bus."""
+    seed = Seeder(container)
+
+    def handle(action: object) -> object:
+        return container.command_bus().handle(action)
+
+    def benchmark(action_name: str, setup: Callable[[], object]) -> Benchmark:
+        return Benchmark(
+            name=f'handlers[{backend}].{action_name}',
+            func=handle,
+            setup=setup,
+        )
+
+    def get_user_by_id() -> GetUserById:
+        return GetUserById(user_id=seed.active_user().id)
+
+    def get_user_by_document() -> GetUserByDocument:
+        customer = seed.customer()
+        seed.active_user(customer)
+        return GetUserByDocument(
+            document_type=customer.document_type,
+            document_value=customer.document_number,
+            service_agr_id=0,
+        )
+
+    def create_sign_up() -> CreateSignUp:
+        return CreateSignUp(service_agr_id=0, email=f'{uuid4()}@email.com')
+
+    def create_phone_confirmation() -> CreatePhoneConfirmation:
+        user = seed.user(
+            status=UserStatus.PENDING_VALIDATION,
+            contact_methods=[
+                seed.contact_method('EMAIL', f'{uuid4()}@email.com', True)
+            ]
+        )
+        return CreatePhoneConfirmation(
+            user_id=user.id,
+            phone_number='+5401164372323'
+        )
+
+    def confirm_phone_number() -> ConfirmPhoneNumber:
+        user = seed.user(
+            status=UserStatus.PENDING_VALIDATION,
+            contact_methods=[
+                seed.contact_method('EMAIL', f'{uuid4()}@email.com', True),
+                seed.contact_method(
+                    'PHONE',
+                    '+5401164372323',
+                    False,
+                    confirmation_type=ContactConfirmationType.OTP,
+                    confirmation_value='1234',
+                ),
+            ]
+        )
+        seed.sign_up(user, SignUpStage.LEGAL_VALIDATION)
+        return ConfirmPhoneNumber(user_id=user.id, otp='1234')
+
+    def validate_email_confirmation_token() -> ValidateEmailConfirmationToken:
+        email = seed.contact_method('EMAIL', f'{uuid4()}@email.com', False)
+        user = seed.user(
+            status=UserStatus.PENDING_VALIDATION,
+            contact_methods=[email]
+        )
+        seed.sign_up(user, SignUpStage.EMAIL_CONFIRMATION)
+        return ValidateEmailConfirmationToken(
+            token=email.contact_confirmation.value
+        )
+
+    def pending_validation_user() -> User:
+        user = seed.user(
+            status=UserStatus.PENDING_VALIDATION,
+            contact_methods=[
+                seed.contact_method('EMAIL', f'{uuid4()}@email.com', True)
+            ]
+        )
+        seed.sign_up(user, SignUpStage.IDENTITY_VALIDATION)
+        return user
+
+    def validate_user_identity() -> ValidateUserIdentity:
+        return ValidateUserIdentity(
+            user_id=pending_validation_user().id,
+            ocr='ocr',
+            selfie='selfie',
+            face_id='face_id',
+            base64_front='front',
+            base64_selfie='selfie',
+            base64_back='back',
+        )
+
+    def get_sign_up_stage_by_user_id() -> GetSignUpStageByUserId:
+        return GetSignUpStageByUserId(user_id=pending_validation_user().id)
+
+    def get_service_agreement() -> GetServiceAgreement:
+        return GetServiceAgreement(service_agreement_id=0)
+
+    def get_identity_validation() -> GetIdentityValidation:
+        user = pending_validation_user()
+        seed.address(user)
+        return GetIdentityValidation(user_id=user.id)
+
+    def update_legal_validation() -> UpdateLegalValidation:
+        user = seed.active_user()
+        seed.sign_up(user, SignUpStage.IDENTITY_VALIDATION)
+        return UpdateLegalValidation(
+            user_id=user.id,
+            pep=False,
+            so=False,
+            facta=False,
+            occupation_id=uuid4(),
+            relationship='SINGLE',
+        )
+
+    def get_user_contact_methods() -> GetUserContactMethods:
+        return GetUserContactMethods(user_id=seed.active_user().id)
+
+    def confirm_identity() -> ConfirmIdentity:
+        user = pending_validation_user()
+        address = seed.address(user)
+        return ConfirmIdentity(user_id=user.id, address_id=address.address_id)
+
+    return [
+        benchmark('GetUserById', get_user_by_id),
+        benchmark('GetUserByDocument', get_user_by_document),
+        benchmark('CreateSignUp', create_sign_up),
+        benchmark('CreatePhoneConfirmation', create_phone_confirmation),
+        benchmark('ConfirmPhoneNumber', confirm_phone_number),
+        benchmark(
+            'ValidateEmailConfirmationToken',
+            validate_email_confirmation_token
+        ),
+        benchmark('ValidateUserIdentity', validate_user_identity),
+        benchmark('GetSignUpStageByUserId', get_sign_up_stage_by_user_id),
+        benchmark('GetServiceAgreement', get_service_agreement),
+        benchmark('GetIdentityValidation', get_identity_validation),
+        benchmark('UpdateLegalValidation', update_legal_validation),
+        benchmark('GetUserContactMethods', get_user_contact_methods),
+        benchmark('ConfirmIdentity', confirm_identity),
+    ]
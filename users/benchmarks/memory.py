@@ -0,0 +1,130 @@
+"""Measure the memory and allocations of the slotted models and actions.
+
+Every slotted class is compared with a twin dataclass declaring the same
+fields without ``__slots__``, the layout the classes had before. Both are
+built from the same field values, so only the instances are measured.
+``benchmarks`` times building ``COUNT`` instances of each, ``footprints``
+reports the bytes and memory blocks each instance takes.
+"""
+from dataclasses import dataclass, fields, make_dataclass
+import gc
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+from uuid import uuid4
+
+from users.benchmarks.runner import Benchmark
+from users.core.actions import (
+    CreateSignUp,
+    GetUserById,
+    UpdateLegalValidation,
+    ValidateUserIdentity,
+)
+from users.core.models import PerformIdentityValidationResponse
+from users.odm.schemas import AddressSchema, CustomerResource
+from users.tests.base import BaseTestCase
+from users.tests.mock_factory import identification_factory_mock, identity_factory_mock
+
+COUNT = 1000
+
+
+@dataclass
+class Footprint:
+    """Memory taken by one instance of a class, on average."""
+
+    name: str
+    bytes: float
+    blocks: float
+
+
+def samples() -> List[Tuple[type, Dict[str, object]]]:
+    """Return each slotted class with the field values of a typical instance."""
+    user_id = uuid4()
+    address = AddressSchema().load(
+        BaseTestCase.MerlinMock(user_id).SUCCESSFUL_GET_RESPONSE, many=True
+    ).data[0]
+    customer = CustomerResource().load(
+        BaseTestCase.CustomerMock().SUCCESSFUL_FILTER_RESPONSE['data'][0]
+    ).data
+    instances = [
+        address,
+        customer,
+        identification_factory_mock(type_='DNI'),
+        identity_factory_mock(),
+        PerformIdentityValidationResponse(user_id=user_id),
+        CreateSignUp(service_agr_id=0, email='some@email.com'),
+        GetUserById(user_id=user_id),
+        UpdateLegalValidation(
+            user_id=user_id, pep=False, so=False, facta=False,
+            occupation_id=uuid4(), relationship='SELF'
+        ),
+        ValidateUserIdentity(
+            user_id=user_id, ocr='ocr', selfie='selfie', face_id='face_id',
+            base64_front='front', base64_selfie='selfie', base64_back='back'
+        ),
+    ]
+    return [
+        (type(instance), {f.name: getattr(instance, f.name) for f in fields(instance)})
+        for instance in instances
+    ]
+
+
+def unslotted(cls: type) -> type:
+    """Return a dataclass with the fields of ``cls`` and an instance ``__dict__``."""
+    return make_dataclass(cls.__name__, [f.name for f in fields(cls)])
+
+
+def builder(cls: type, values: Dict[str, object]) -> Callable[[None], list]:
+    """Return a function building ``COUNT`` instances of the class."""
+    def build(_: None = None) -> list:
+        return [cls(**values) for _ in range(COUNT)]
+    return build
+
+
+def benchmarks() -> List[Benchmark]:
+    """Return the build benchmarks of the slotted classes and their twins."""
+    results = []
+    for cls, values in samples():
+        results += [
+            Benchmark(
+                name=f'memory.{cls.__name__}.build[{COUNT}]',
+                func=builder(cls, values),
+            ),
+            Benchmark(
+                name=f'memory.dict.{cls.__name__}.build[{COUNT}]',
+                func=builder(unslotted(cls), values),
+            ),
+        ]
+    return results
+
+
+def footprint(name: str, build: Callable[[], list]) -> Footprint:
+    """Trace the allocations of ``build`` and return them per instance."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        instances = build()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    own_traces = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = after.filter_traces(own_traces).compare_to(
+        before.filter_traces(own_traces), 'filename'
+    )
+    return Footprint(
+        name=name,
+        bytes=sum(stat.size_diff for stat in stats) / len(instances),
+        blocks=sum(stat.count_diff for stat in stats) / len(instances),
+    )
+
+
+def footprints() -> List[Footprint]:
+    """Return the footprint of each slotted class and of its twin."""
+    results = []
+    for cls, values in samples():
+        results += [
+            footprint(f'memory.{cls.__name__}', builder(cls, values)),
+            footprint(f'memory.dict.{cls.__name__}', builder(unslotted(cls), values)),
+        ]
+    return results
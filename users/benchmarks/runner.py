@@ -0,0 +1,134 @@
+"""Measure benchmarks and compare them against a stored baseline."""
+from dataclasses import asdict, dataclass
+import gc
+import json
+import platform
+import statistics
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+@dataclass
+class Benchmark:
+    """Represent a single measurable operation.
+
+    ``setup`` runs before every round outside of the timed section and its
+    return value is handed to ``func``, which is the only timed call.
+    ``items`` counts the operations of each call, when it runs several.
+    """
+
+    name: str
+    func: Callable[[Any], Any]
+    setup: Callable[[], Any] = lambda: None
+    items: int = 1
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing statistics of a benchmark, in seconds per call."""
+
+    name: str
+    rounds: int
+    min: float
+    median: float
+    mean: float
+    stdev: float
+    items: int = 1
+
+    @property
+    def per_item(self) -> float:
+        """Return the median time of each operation of a call."""
+        return self.median / self.items
+
+
+@dataclass
+class Comparison:
+    """Represent the median change of a benchmark against the baseline."""
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """Return the current median relative to the baseline one."""
+        return self.current / self.baseline if self.baseline else 1.0
+
+    def is_regression(self, threshold: float) -> bool:
+        """Return true if the slowdown is above the allowed threshold."""
+        return self.ratio > 1 + threshold
+
+
+def run(benchmark: Benchmark, rounds: int, warmup: int = 5) -> BenchmarkResult:
+    """Time ``rounds`` calls of the benchmark after some warm up calls."""
+    for _ in range(warmup):
+        benchmark.func(benchmark.setup())
+
+    timings: List[float] = []
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(rounds):
+            argument = benchmark.setup()
+            gc.disable()
+            start = perf_counter()
+            benchmark.func(argument)
+            timings.append(perf_counter() - start)
+            if gc_was_enabled:
+                gc.enable()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return BenchmarkResult(
+        name=benchmark.name,
+        rounds=rounds,
+        min=min(timings),
+        median=statistics.median(timings),
+        mean=statistics.mean(timings),
+        stdev=statistics.stdev(timings) if rounds > 1 else 0.0,
+        items=benchmark.items,
+    )
+
+
+def save(
+    results: Iterable[BenchmarkResult],
+    path: str,
+    meta: Optional[Dict] = None
+) -> None:
+    """Write the results as a machine-readable baseline file."""
+    content = {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            **(meta or {}),
+        },
+        'results': {result.name: asdict(result) for result in results},
+    }
+    with open(path, 'w') as baseline_file:
+        json.dump(content, baseline_file, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Dict[str, BenchmarkResult]:
+    """Read a baseline file written by ``save``."""
+    with open(path) as baseline_file:
+        content = json.load(baseline_file)
+
+    return {
+        name: BenchmarkResult(**result)
+        for name, result in content['results'].items()
+    }
+
+
+def compare(
+    baseline: Dict[str, BenchmarkResult],
+    results: Iterable[BenchmarkResult]
+) -> List[Comparison]:
+    """Pair each result with its baseline median, skipping new benchmarks."""
+    return [
+        Comparison(
+            name=result.name,
+            baseline=baseline[result.name].median,
+            current=result.median
+        )
+        for result in results if result.name in baseline
+    ]
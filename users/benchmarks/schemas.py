@@ -0,0 +1,156 @@
+"""Benchmark the marshmallow schemas on the hot request and response paths.
+
+Every benchmark runs three times: ``schemas.*`` builds the schema on each
+call, as the views used to, ``schemas.shared.*`` takes it from a
+``SchemaRegistry`` and ``schemas.compiled.*`` dumps with its compiled schema,
+the ``UserProjection`` of the user resources.
+"""
+from copy import deepcopy
+from typing import Callable, List
+from uuid import uuid4
+
+from users.api.routers import routes
+from users.benchmarks.fixtures import Seeder
+from users.benchmarks.runner import Benchmark
+from users.containers import UserContainer
+from users.odm.registry import SchemaRegistry
+from users.odm.schemas import (
+    AddressSchema,
+    CreateSignUpSchema,
+    CustomerResource,
+    GetUserByIdRequest,
+    GetUserContactMethodsResponse,
+    IdentitySchema,
+    UserByDocumentResource,
+    UserByIdResource,
+    UserIdentityValidationRequestSchema,
+)
+from users.tests.base import BaseTestCase
+from users.tests.mock_factory import identity_factory_mock
+
+LIST_SIZE = 50
+
+USER_BY_ID_OPTIONS = {
+    'url_resolver': routes.url_path_for,
+    'view_to_resolve': 'get_user_by_id',
+    'api_version': 2,
+    'http_methods': ['GET'],
+}
+
+
+def benchmarks(container: UserContainer) -> List[Benchmark]:
+    """Return the schema benchmarks, built per call, shared and compiled."""
+    seed = Seeder(container)
+    users = []
+    for _ in range(LIST_SIZE):
+        customer = seed.customer()
+        user = seed.active_user(customer)
+        user.customer = customer
+        users.append(user)
+
+    def build(schema_class: type, **options: object) -> object:
+        return schema_class(**options)
+
+    def dump_built_user_by_id(_: None) -> dict:
+        response_schema = UserByIdResource(
+            **USER_BY_ID_OPTIONS,
+            view_kwargs={'user_id': str(users[0].id)}
+        )
+        response_schema.dump(users[0])
+        return response_schema.data_with_hypermedia
+
+    registry = SchemaRegistry()
+
+    def dump_shared_user_by_id(_: None) -> dict:
+        return registry.get(UserByIdResource, **USER_BY_ID_OPTIONS)\
+            .dump_with_hypermedia(users[0], view_kwargs={'user_id': str(users[0].id)})
+
+    def dump_compiled_user_by_id(_: None) -> dict:
+        return registry.get_compiled(UserByIdResource, **USER_BY_ID_OPTIONS)\
+            .dump_with_hypermedia(users[0], view_kwargs={'user_id': str(users[0].id)})
+
+    return [
+        *suite('schemas', build, dump_built_user_by_id, users),
+        *suite('schemas.shared', registry.get, dump_shared_user_by_id, users),
+        *suite('schemas.compiled', registry.get_compiled, dump_compiled_user_by_id, users),
+    ]
+
+
+def suite(
+    prefix: str,
+    schema_for: Callable[..., object],
+    dump_user_by_id: Callable[[None], dict],
+    users: List
+) -> List[Benchmark]:
+    """Return the benchmarks getting their schemas from ``schema_for``."""
+    user = users[0]
+    raw_customers = [
+        deepcopy(BaseTestCase.CustomerMock().SUCCESSFUL_FILTER_RESPONSE['data'][0])
+        for _ in range(LIST_SIZE)
+    ]
+    raw_addresses = BaseTestCase.MerlinMock(user.id).SUCCESSFUL_GET_RESPONSE
+    raw_identity = BaseTestCase.IdentityValidationMock(
+        user.id, identity_factory_mock()
+    ).SUCCESSFUL_GET_RESPONSE['data']
+    raw_identity_validation = {
+        'user_id': str(user.id),
+        'ocr': 'ocr',
+        'selfie': 'selfie',
+        'face_id': 'face_id',
+        'base64_front': 'front',
+        'base64_selfie': 'selfie',
+        'base64_back': 'back',
+    }
+
+    return [
+        Benchmark(
+            name=f'{prefix}.GetUserByIdRequest.load',
+            func=lambda _: schema_for(GetUserByIdRequest).load(
+                {'user_id': str(uuid4())}
+            ),
+        ),
+        Benchmark(
+            name=f'{prefix}.CreateSignUpSchema.load',
+            func=lambda _: schema_for(CreateSignUpSchema).load({
+                'service_agr_id': 0,
+                'email': 'some@email.com'
+            }),
+        ),
+        Benchmark(
+            name=f'{prefix}.UserIdentityValidationRequestSchema.load',
+            func=lambda _: schema_for(UserIdentityValidationRequestSchema).load(
+                raw_identity_validation
+            ),
+        ),
+        Benchmark(
+            name=f'{prefix}.UserByIdResource.dump',
+            func=dump_user_by_id,
+        ),
+        Benchmark(
+            name=f'{prefix}.UserByIdResource.dump[{LIST_SIZE}]',
+            func=lambda _: schema_for(UserByIdResource).dump(users, many=True),
+        ),
+        Benchmark(
+            name=f'{prefix}.UserByDocumentResource.dump',
+            func=lambda _: schema_for(UserByDocumentResource).dump(user),
+        ),
+        Benchmark(
+            name=f'{prefix}.GetUserContactMethodsResponse.dump',
+            func=lambda _: schema_for(GetUserContactMethodsResponse).dump(
+                user.contact_methods, many=True
+            ),
+        ),
+        Benchmark(
+            name=f'{prefix}.CustomerResource.load[{LIST_SIZE}]',
+            func=lambda raw: schema_for(CustomerResource).load(raw, many=True),
+            setup=lambda: deepcopy(raw_customers),
+        ),
+        Benchmark(
+            name=f'{prefix}.AddressSchema.load[2]',
+            func=lambda _: schema_for(AddressSchema).load(raw_addresses, many=True),
+        ),
+        Benchmark(
+            name=f'{prefix}.IdentitySchema.load',
+            func=lambda _: schema_for(IdentitySchema).load(raw_identity),
+        ),
+    ]
@@ -1,5 +1,7 @@
 """Declare the IoC layer between the core and application layer."""
+from importlib import import_module
 from logging import Logger
+from typing import Callable, TYPE_CHECKING
 
 from dependency_injector.containers import (
     DeclarativeContainer,
@@ -11,12 +13,14 @@ from dependency_injector.providers import (
     Object,
     Singleton
 )
-from nwevents import BrokerConnector, EventManager
+from nwevents import EventManager
 from nwkcorelib import CommandBus, CommandBusFactory
 from nwloggers import make_logger
 from sqlalchemy import MetaData
 
+from users.api.profiling import RequestProfiler
 from users.api.providers import RestApiCCIDProvider
+from users.api.startup import StartupReport
 from users.core.actions import (
     ConfirmIdentity,
     ConfirmPhoneNumber,
@@ -28,6 +32,7 @@ from users.core.actions import (
     GetUserByDocument,
     GetUserById,
     GetUserContactMethods,
+    ImportSignUps,
     UpdateLegalValidation,
     ValidateEmailConfirmationToken,
     ValidateUserIdentity,
@@ -43,6 +48,7 @@ from users.core.handlers import (
     GetUserByDocumentHandler,
     GetUserByIdHandler,
     GetUserContactMethodsHandler,
+    ImportSignUpsHandler,
     TokenValidationHandler,
     UpdateLegalValidationHandler,
     ValidateUserIdentityHandler,
@@ -52,56 +58,98 @@ from users.core.repositories import (
     ContactMethodRepository,
     ContactMethodTypeRepository,
     CustomerRepository,
+    IdempotencyKeyRepository,
     IdentityValidationRepository,
     ServiceAgreementRepository,
     SignUpRepository,
     UserRepository,
 )
 from users.orm import Database
+from users.orm.instrumentation import SlowQueryLog
 from users.orm.mappings import metadata_obj
 from users.orm.repositories import (
     ContactMethodDbRepository,
     ContactMethodTypeDbRepository,
+    IdempotencyKeyDbRepository,
     ServiceAgreementDbRepository,
     SignUpDbRepository,
     UserDbRepository,
 )
-from users.rest_client import (
-    CustomerHttpRepository,
-    IdentityValidationHttpRepository,
-    MerlinHttpRepository,
-)
+from users.publisher import EventPublisher
+
+if TYPE_CHECKING:
+    from nwevents import BrokerConnector
+
+
+def imported_on_call(path: str) -> Callable:
+    """Return a factory of the ``module:name`` class, imported on first call.
+
+    Keeps the modules of the HTTP clients and the broker out of the startup
+    of the processes that never use them.
+    """
+    module_name, _, name = path.partition(':')
+
+    def factory(*args: object, **kwargs: object) -> object:
+        return getattr(import_module(module_name), name)(*args, **kwargs)
+
+    factory.__qualname__ = factory.__name__ = name
+    return factory
 
 
 class UserContainer(DeclarativeContainer):
     """Dependency container for the Users consumer."""
 
+    # Wired by ``wire()`` where the api is served or tested, so the jobs and
+    # scripts building a container do not import the views and schemas.
     wiring_config = WiringConfiguration(modules=[
         "users.api.views",
         "users.api.routers",
         "users.api.exceptions",
         "users.api.middlewares",
         "users.tests.seeders"
-    ])
+    ], auto_wire=False)
     config = Configuration()
     rest_api_ccid_provider: Singleton[RestApiCCIDProvider] = Singleton(
         RestApiCCIDProvider
     )
     logger: Object[Logger] = Object(make_logger('users-svc'))
     metadata: Object[MetaData] = Object(metadata_obj)
+    startup_report: Singleton[StartupReport] = Singleton(
+        StartupReport,
+        logger=logger
+    )
+    request_profiler: Singleton[RequestProfiler] = Singleton(
+        RequestProfiler,
+        token=config.profiling_token,
+        sample_rate=config.profiling_sample_rate,
+        directory=config.profiling_dir,
+        ccid_provider=rest_api_ccid_provider
+    )
+    slow_query_log: Singleton[SlowQueryLog] = Singleton(
+        SlowQueryLog,
+        threshold_ms=config.slow_query_threshold_ms,
+        logger=logger,
+        ccid_provider=rest_api_ccid_provider
+    )
     database: Singleton[Database] = Singleton(
         Database,
         config.db_uri,
-        logger
+        logger,
+        slow_query_log
     )
-    broker_connector: Singleton[BrokerConnector] = Singleton(
-        BrokerConnector,
+    broker_connector: Singleton['BrokerConnector'] = Singleton(
+        imported_on_call('nwevents:BrokerConnector'),
         broker_url=config.broker_url
     )
-    event_manager: Factory[EventManager] = Factory(
+    broker_event_manager: Singleton[EventManager] = Singleton(
         EventManager,
         connector=broker_connector
     )
+    event_manager: Singleton[EventPublisher] = Singleton(
+        EventPublisher,
+        event_manager=broker_event_manager,
+        logger=logger
+    )
     contact_method_type_repo: Factory[ContactMethodTypeRepository] = \
         Factory(ContactMethodTypeDbRepository, database.provided.session)
     user_repo: Factory[UserRepository] = Factory(
@@ -117,7 +165,7 @@ class UserContainer(DeclarativeContainer):
         session_factory=database.provided.session
     )
     customer_repo: Factory[CustomerRepository] = Factory(
-        CustomerHttpRepository,
+        imported_on_call('users.rest_client.customers:CustomerHttpRepository'),
         customer_api_url=config.customer_api_url,
         ccid_provider=rest_api_ccid_provider
     )
@@ -126,15 +174,22 @@ class UserContainer(DeclarativeContainer):
         session_factory=database.provided.session
     )
     identity_validation_repo: Factory[IdentityValidationRepository] = Factory(
-        IdentityValidationHttpRepository,
+        imported_on_call(
+            'users.rest_client.identity_validations:IdentityValidationHttpRepository'
+        ),
         identity_validation_svc_url=config.identity_validation_svc_url,
         ccid_provider=rest_api_ccid_provider
     )
     merlin_repo: Factory[AddressRepository] = Factory(
-        MerlinHttpRepository,
+        imported_on_call('users.rest_client.merlin:MerlinHttpRepository'),
         address_url=config.merlin_api_url,
         ccid_provider=rest_api_ccid_provider,
     )
+    idempotency_key_repo: Singleton[IdempotencyKeyRepository] = Singleton(
+        IdempotencyKeyDbRepository,
+        session_factory=database.provided.session,
+        ttl_seconds=config.idempotency_ttl_seconds
+    )
 
     command_bus: CommandBusFactory[CommandBus] = CommandBusFactory({
         GetUserById: Factory(
@@ -150,8 +205,15 @@ class UserContainer(DeclarativeContainer):
         CreateSignUp: Factory(
             CreateSignUpHandler,
             sign_up_repo=sign_up_repo,
-            user_repo=user_repo,
-            contact_method_repo=contact_method_repo,
+            contact_method_type_repo=contact_method_type_repo,
+            jwt_secret=config.jwt_secret,
+            event_manager=event_manager,
+            contact_confirmation_expiration_timedelta=config.
+            contact_confirmation_expiration_timedelta
+        ),
+        ImportSignUps: Factory(
+            ImportSignUpsHandler,
+            sign_up_repo=sign_up_repo,
             contact_method_type_repo=contact_method_type_repo,
             jwt_secret=config.jwt_secret,
             event_manager=event_manager,
@@ -167,8 +229,7 @@ class UserContainer(DeclarativeContainer):
         ConfirmPhoneNumber: Factory(
             ConfirmPhoneNumberHandler,
             sign_up_repo=sign_up_repo,
-            user_repo=user_repo,
-            contact_method_type_repo=contact_method_type_repo
+            user_repo=user_repo
         ),
         ValidateEmailConfirmationToken: Factory(
             TokenValidationHandler,
@@ -192,7 +253,6 @@ class UserContainer(DeclarativeContainer):
         GetIdentityValidation: Factory(
             GetIdentityHandler,
             user_repo=user_repo,
-            sign_up_repo=sign_up_repo,
             identity_validation_repo=identity_validation_repo,
             address_repo=merlin_repo,
         ),
@@ -1,14 +1,16 @@
 """Microservice's DTOs."""
 
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from users.core.models.states import (
     BusinessModel,
 )
+from users.core.slots import slotted
 
 
+@slotted
 @dataclass
 class ConfirmIdentity:
     """Action when user requests to confirm its identity and address."""
@@ -17,6 +19,7 @@ class ConfirmIdentity:
     address_id: UUID
 
 
+@slotted
 @dataclass
 class CreateSignUp:
     """Represent the action of creating a new sign up process."""
@@ -25,6 +28,15 @@ class CreateSignUp:
     email: str
 
 
+@slotted
+@dataclass
+class ImportSignUps:
+    """Represent the action of creating the sign ups of many emails at once."""
+
+    sign_ups: List[CreateSignUp]
+
+
+@slotted
 @dataclass
 class CreateUser:
     """Represent the action of create a user."""
@@ -33,6 +45,7 @@ class CreateUser:
     service_agr_id: int
 
 
+@slotted
 @dataclass
 class GetUserById:
     """Represent the action of get a user by its id."""
@@ -41,6 +54,7 @@ class GetUserById:
     fetch_customer: bool = True
 
 
+@slotted
 @dataclass
 class GetUserByDocument:
     """Represent the action of get a user by its document."""
@@ -51,6 +65,7 @@ class GetUserByDocument:
     business_model: Optional[BusinessModel] = None
 
 
+@slotted
 @dataclass
 class CreatePhoneConfirmation:
     """Represent the action to create an OTP code."""
@@ -59,6 +74,7 @@ class CreatePhoneConfirmation:
     phone_number: str
 
 
+@slotted
 @dataclass
 class ConfirmPhoneNumber:
     """Represent the action to confirm phone number."""
@@ -67,6 +83,7 @@ class ConfirmPhoneNumber:
     otp: str
 
 
+@slotted
 @dataclass
 class ValidateEmailConfirmationToken:
     """Represent the action of validating a email confirmation token."""
@@ -74,6 +91,7 @@ class ValidateEmailConfirmationToken:
     token: str
 
 
+@slotted
 @dataclass
 class ValidateUserIdentity:
     """Users' identity validation request action."""
@@ -87,6 +105,7 @@ class ValidateUserIdentity:
     base64_back: str
 
 
+@slotted
 @dataclass
 class RequestUserIdentityValidation(ValidateUserIdentity):
     """Model to request an indentity validation to identity validation implementation."""
@@ -94,6 +113,7 @@ class RequestUserIdentityValidation(ValidateUserIdentity):
     service_agreement_id: int
 
 
+@slotted
 @dataclass
 class GetSignUpStageByUserId:
     """Action to get a sign up instance from its user id."""
@@ -101,6 +121,7 @@ class GetSignUpStageByUserId:
     user_id: UUID
 
 
+@slotted
 @dataclass
 class GetServiceAgreement:
     """Action to get service agreement."""
@@ -108,6 +129,7 @@ class GetServiceAgreement:
     service_agreement_id: int
 
 
+@slotted
 @dataclass
 class GetIdentityValidation:
     """Action to get an identity validation."""
@@ -115,6 +137,7 @@ class GetIdentityValidation:
     user_id: UUID
 
 
+@slotted
 @dataclass
 class UpdateLegalValidation:
     """Represent the action of update a legal validation."""
@@ -129,6 +152,7 @@ class UpdateLegalValidation:
     pep_data: Optional[Dict] = None
 
 
+@slotted
 @dataclass
 class GetUserContactMethods:
     """Action to get a list with the user's contact methods."""
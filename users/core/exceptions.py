@@ -176,6 +176,104 @@ class EntityGoneError(UserError):
         return self.__code or 'NB-ERROR-00411'
 
 
+class IdempotencyKeyInUseError(UserError):
+    """Raised while the first request sent with an idempotency key is running."""
+
+    @property
+    def message(self) -> str:
+        """Return the exception message."""
+        return 'A request with this Idempotency-Key is still being processed.'
+
+    @property
+    def code(self) -> str:
+        """Return the error code."""
+        return 'NB-ERROR-00412'
+
+
+class IdempotencyKeyReusedError(UserError):
+    """Raised when an idempotency key is sent again with another request."""
+
+    @property
+    def message(self) -> str:
+        """Return the exception message."""
+        return 'This Idempotency-Key was already used with another request.'
+
+    @property
+    def code(self) -> str:
+        """Return the error code."""
+        return 'NB-ERROR-00413'
+
+
+class InternalAccessError(UserError):
+    """Raised when an internal resource is requested without a valid token."""
+
+    @property
+    def message(self) -> str:
+        """Return the exception message."""
+        return 'This resource requires a valid X-Internal-Token header.'
+
+    @property
+    def code(self) -> str:
+        """Return the error code."""
+        return 'NB-ERROR-00416'
+
+
+class BatchTooLargeError(UserError):
+    """Raised when a request carries more items than a batch can hold."""
+
+    def __init__(self, size: int, limit: int):
+        """Indicate the items sent and the most a batch can hold."""
+        self.size = size
+        self.limit = limit
+
+    @property
+    def message(self) -> str:
+        """Return the exception message."""
+        return f'The batch has {self.size} items, at most {self.limit} are allowed.'
+
+    @property
+    def code(self) -> str:
+        """Return the error code."""
+        return 'NB-ERROR-00415'
+
+
+class EmailClaimError(UserError):
+    """Raised when the user claiming an email no longer holds it."""
+
+    def __init__(self, email: str, user_id: UUID):
+        """Indicate the email and the user claiming it."""
+        self.email = email
+        self.user_id = user_id
+
+    @property
+    def message(self) -> str:
+        """Return the exception message."""
+        return f'The email is claimed by user_id={self.user_id}, which no longer holds it.'
+
+    @property
+    def code(self) -> str:
+        """Return the error code."""
+        return 'NB-ERROR-00414'
+
+
+class EventQueueFullError(UserError):
+    """Raised when the events can not be queued as fast as they are emitted."""
+
+    def __init__(self, event: str):
+        """Indicate the event that could not be queued."""
+        self.event = event
+
+    @property
+    def message(self) -> str:
+        """Return the exception message."""
+        return f'The {self.event} event could not be queued, try again later.'
+
+    @property
+    def code(self) -> str:
+        """Return the error code."""
+        return 'NB-ERROR-00417'
+
+
 class AttemptsExceededError(PropagableHttpError):
     """When user has exceeded its identity validation attempts."""
 
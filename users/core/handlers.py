@@ -1,7 +1,7 @@
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta, timezone
 from random import randrange
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 from uuid import UUID
 
 import jwt
@@ -19,6 +19,7 @@ from users.core.actions import (
     GetUserByDocument,
     GetUserById,
     GetUserContactMethods,
+    ImportSignUps,
     RequestUserIdentityValidation,
     UpdateLegalValidation,
     ValidateEmailConfirmationToken,
@@ -43,13 +44,16 @@ from users.core.models import (
     Identity,
     ServiceAgreement,
     SignUp,
+    SignUpImport,
     User,
     UserAddress,
 )
 from users.core.models import states
 from users.core.models.compositions import ContactConfirmation
 from users.core.models.states import (
+    ConfirmationOutcome,
     ContactConfirmationType,
+    SignUpOutcome,
     SignUpStage,
     UserStatus
 )
@@ -62,6 +66,7 @@ from users.core.repositories import (
     SignUpRepository,
     UserRepository,
 )
+from users.core.tracing import traced_action
 from users.events import SavedContactMethod, SavedSignUp
 from users.orm.repositories import ServiceAgreementDbRepository
 
@@ -71,13 +76,12 @@ class CreateSignUpHandler(CommandHandler):
     """Handler of the CreateSignUp action."""
 
     sign_up_repo: SignUpRepository
-    user_repo: UserRepository
-    contact_method_repo: ContactMethodRepository
     contact_method_type_repo: ContactMethodTypeRepository
     jwt_secret: str
     event_manager: EventManager
     contact_confirmation_expiration_timedelta: str
 
+    @traced_action
     def __call__(self, create_sign_up: CreateSignUp) -> SignUp:
         """
         Handle user sign up creation.
@@ -87,62 +91,33 @@ class CreateSignUpHandler(CommandHandler):
         is still pending to be confirmed.
         If User and ContactMethod exist but the ContactConfirmation is already
         confirmed, return a SignUpError (email is already taken).
+        The lookup and the creation or renewal run atomically in the sign up
+        repository.
         """
-        user = self.user_repo.get_by_service_agr_id_and_email(
-            service_agr_id=create_sign_up.service_agr_id,
-            email=create_sign_up.email
-        )
-
-        if user is not None:
-            contact_method = list(filter(
-                lambda cm: cm.value == create_sign_up.email,
-                user.contact_methods
-            ))[0]
-
-            contact_confirmation = contact_method.contact_confirmation
-
-            if contact_confirmation.is_expired:
-                return self.__renew_contact_confirmation(
-                    user,
-                    contact_method
-                )
+        attempt = self.sign_up_repo.create_or_renew(*self._new_sign_up(
+            create_sign_up,
+            self.contact_method_type_repo.get('EMAIL')
+        ))
 
-            elif contact_confirmation.is_still_pending:
-                raise ValidationError(
-                    'Contact confirmation for the submitted email '
-                    'is still active and pending.'
-                )
+        if attempt.outcome == SignUpOutcome.STILL_PENDING:
+            raise ValidationError(
+                'Contact confirmation for the submitted email '
+                'is still active and pending.'
+            )
+        elif attempt.outcome == SignUpOutcome.ALREADY_CONFIRMED:
             raise ValidationError(
                 'Email already taken.'
             )
 
-        return self.__perform_sign_up(create_sign_up)
-
-    def __renew_contact_confirmation(
-        self,
-        user: User,
-        contact_method: ContactMethod
-    ) -> SignUp:
-        """
-        Generate a ContactConfirmation for Users' ContactMethod again.
-
-        Called when the ContactMethod's ContactConfirmation has expired.
-        """
-        contact_method.confirmation_expire_at = (
-            datetime.now() + timedelta(
-                hours=int(self.contact_confirmation_expiration_timedelta)
-            )
+        self._emit_saved_sign_up(
+            attempt.sign_up,
+            attempt.user,
+            attempt.contact_method
         )
 
-        self.contact_method_repo.save(contact_method)
-
-        sign_up = self.sign_up_repo.get_by_user_id(user.id)
+        return attempt.sign_up
 
-        self.__emit_saved_sign_up(sign_up, user, contact_method)
-
-        return sign_up
-
-    def __emit_saved_sign_up(
+    def _emit_saved_sign_up(
         self,
         sign_up: SignUp,
         user: User,
@@ -155,7 +130,7 @@ class CreateSignUpHandler(CommandHandler):
             contact_method=contact_method
         ))
 
-    def __generate_jwt(self, contact_method_id: UUID) -> str:
+    def _generate_jwt(self, contact_method_id: UUID) -> str:
         encoded_jwt_value = jwt.encode(
             {
                 'contact_method_id': str(contact_method_id)
@@ -165,15 +140,21 @@ class CreateSignUpHandler(CommandHandler):
         )
         return encoded_jwt_value
 
-    def __perform_sign_up(self, create_sign_up: CreateSignUp) -> SignUp:
-        """Proceed with the sign up process."""
+    def _new_sign_up(
+        self,
+        create_sign_up: CreateSignUp,
+        contact_method_type: ContactMethodType
+    ) -> Tuple[SignUp, User, ContactMethod]:
+        """Build the sign up, user and contact method of a new email.
+
+        The expiration of their contact confirmation also renews the expired
+        confirmation of an email that was already registered.
+        """
         user = User(
             service_agr_id=create_sign_up.service_agr_id,
             status=UserStatus.PENDING_VALIDATION,
         )
 
-        contact_method_type = self.contact_method_type_repo.get('EMAIL')
-
         contact_method = ContactMethod(
             type=contact_method_type,
             value=create_sign_up.email,
@@ -181,7 +162,7 @@ class CreateSignUpHandler(CommandHandler):
         )
         contact_confirmation = ContactConfirmation(
             type=ContactConfirmationType.TOKEN,
-            value=self.__generate_jwt(
+            value=self._generate_jwt(
                 contact_method.id
             ),
             created_at=datetime.now(),
@@ -196,13 +177,49 @@ class CreateSignUpHandler(CommandHandler):
         sign_up = SignUp(stage=SignUpStage.EMAIL_CONFIRMATION)
         sign_up.user_id = user.id
 
-        self.user_repo.save(user)
+        return sign_up, user, contact_method
 
-        self.sign_up_repo.save(sign_up)
 
-        self.__emit_saved_sign_up(sign_up, user, contact_method)
+@dataclass
+class ImportSignUpsHandler(CreateSignUpHandler):
+    """Handler of the ImportSignUps action."""
 
-        return sign_up
+    @traced_action
+    def __call__(self, import_sign_ups: ImportSignUps) -> SignUpImport:
+        """
+        Handle the sign up of many emails at once.
+
+        The sign ups are built as CreateSignUp builds them, and created in a
+        single call to the sign up repository. Emails already registered are
+        skipped instead of failing the import or renewing their confirmation,
+        as well as the emails repeated within the import. The SavedSignUp
+        events are emitted once all the sign ups are saved.
+        """
+        contact_method_type = self.contact_method_type_repo.get('EMAIL')
+        emails = dict.fromkeys(
+            (create_sign_up.service_agr_id, create_sign_up.email)
+            for create_sign_up in import_sign_ups.sign_ups
+        )
+
+        attempts = self.sign_up_repo.create_many([
+            self._new_sign_up(
+                CreateSignUp(service_agr_id=service_agr_id, email=email),
+                contact_method_type
+            )
+            for service_agr_id, email in emails
+        ])
+
+        for attempt in attempts:
+            self._emit_saved_sign_up(
+                attempt.sign_up,
+                attempt.user,
+                attempt.contact_method
+            )
+
+        return SignUpImport(
+            created=len(attempts),
+            skipped=len(import_sign_ups.sign_ups) - len(attempts)
+        )
 
 
 @dataclass
@@ -212,9 +229,13 @@ class GetUserByIdHandler(CommandHandler):
     user_repo: UserRepository
     customer_repo: CustomerRepository
 
+    @traced_action
     def __call__(self, get_user: GetUserById) -> User:
         """Make the object callable to handle GetUserById."""
-        user: User = self.user_repo.get_by_id(get_user.user_id)
+        user: User = self.user_repo.get_by_id(
+            get_user.user_id,
+            include_archived=True
+        )
         if user is None:
             raise EntityNotFound(User)
 
@@ -263,14 +284,17 @@ class GetUserByDocumentHandler(CommandHandler):
         if service_agr_id is not None:
             return self.user_repo.get_by_customer_and_service_agr_id(
                 customer_id=customer_id,
-                service_agr_id=service_agr_id
+                service_agr_id=service_agr_id,
+                include_archived=True
             )
         elif business_model is not None:
             return self.user_repo.get_by_customer_and_business_model(
                 customer_id=customer_id,
-                business_model=business_model
+                business_model=business_model,
+                include_archived=True
             )
 
+    @traced_action
     def __call__(self, get_user: GetUserByDocument) -> Optional[User]:
         """Make the object callable to handle GetUserByDocument."""
         customers = self.__get_customers(
@@ -301,6 +325,7 @@ class CreatePhoneConfirmationHandler(CommandHandler):
     event_manager: EventManager
     PHONE_TYPE_DESCRIPTION = 'PHONE'
 
+    @traced_action
     def __call__(self, action: CreatePhoneConfirmation) -> str:
         """Handle create phone confirmatión."""
         user = self.user_repo.get_by_id(
@@ -427,20 +452,10 @@ class CreatePhoneConfirmationHandler(CommandHandler):
         user: User
     ) -> Optional[ContactMethod]:
         """Get current contact confirmation phone assigned to user."""
-        for contact_method in user.contact_methods:
-
-            is_phone_type = (
-                contact_method.type.description == self.PHONE_TYPE_DESCRIPTION
-            )
-
-            is_confirmed = (
-                contact_method.contact_confirmation.confirmed_at is not None
-            )
-
-            if is_phone_type and not is_confirmed:
-                return contact_method
-            elif is_phone_type and is_confirmed:
-                raise ValidationError("The phone number has been confirmed.")
+        if user.contact_methods_of(self.PHONE_TYPE_DESCRIPTION, confirmed=True):
+            raise ValidationError("The phone number has been confirmed.")
+        unconfirmed = user.contact_methods_of(self.PHONE_TYPE_DESCRIPTION, confirmed=False)
+        return unconfirmed[0] if unconfirmed else None
 
 
 @dataclass
@@ -449,58 +464,63 @@ class ConfirmPhoneNumberHandler(CommandHandler):
 
     sign_up_repo: SignUpRepository
     user_repo: UserRepository
-    contact_method_type_repo: ContactMethodTypeRepository
 
     PHONE_TYPE_DESCRIPTION = 'PHONE'
-
+    # The stages a phone can be confirmed at. Blocked sign ups, and the ones
+    # past the phone confirmation, are rejected before the OTP is used.
+    FROM_STAGES = (
+        SignUpStage.EMAIL_CONFIRMATION,
+        SignUpStage.IDENTITY_VALIDATION,
+        SignUpStage.LEGAL_VALIDATION,
+        SignUpStage.PHONE_CONFIRMATION,
+    )
+
+    @traced_action
     def __call__(self, action: ConfirmPhoneNumber):
         """Handle create phone confirmation."""
-        user = self.user_repo.get_by_id(
-            user_id=action.user_id
-        )
-
-        signup = self.sign_up_repo.get_by_user_id(action.user_id)
-
-        # Search contact method type = PHONE
-        self.contact_method_type_repo.get(self.PHONE_TYPE_DESCRIPTION)
+        user, sign_up = self.user_repo.get_with_sign_up(action.user_id)
+        if sign_up.stage not in self.FROM_STAGES:
+            raise ValidationError(
+                'Sign up stage can not move to PHONE_CONFIRMATION. '
+                f'(Current sign up stage: {sign_up.stage.value}).'
+            )
 
         # Find if there is a contact method such as the user's phone.
         confirmation_phone = \
             self.__get_current_contact_confirmation_phone(user)
 
-        signup.stage = states.SignUpStage.PHONE_CONFIRMATION
-        if confirmation_phone.contact_confirmation.value == action.otp:
-            confirmation_phone.contact_confirmation = \
-                confirmation_phone.contact_confirmation.recreate(
-                    confirmed_at=datetime.now()
-                )
-            self.user_repo.save(user)
-            self.sign_up_repo.save(signup)
-        else:
+        if confirmation_phone is None:
             raise ValidationError("OTP code is invalid.")
 
+        # The OTP is only used once the sign up moves.
+        outcome = self.sign_up_repo.confirm_contact_method(
+            action.user_id,
+            confirmation_phone.id,
+            action.otp,
+            datetime.now(),
+            self.FROM_STAGES,
+            SignUpStage.PHONE_CONFIRMATION
+        )
+        if outcome is ConfirmationOutcome.INVALID_CONFIRMATION:
+            raise ValidationError("OTP code is invalid.")
+        if outcome is ConfirmationOutcome.STAGE_CHANGED:
+            raise ValidationError(
+                f'Sign up stage changed from {sign_up.stage.value} '
+                'while the phone was confirmed.'
+            )
+
     def __get_current_contact_confirmation_phone(
         self,
         user: User
     ) -> Optional[ContactMethod]:
         """Get current contact confirmation phone assigned to user."""
-        for contact_method in user.contact_methods:
-            is_pending = (
-                contact_method.contact_confirmation.is_still_pending
-            )
-
-            is_phone_type = (
-                contact_method.type.description == self.PHONE_TYPE_DESCRIPTION
-            )
-
-            is_confirmed = (
-                contact_method.contact_confirmation.confirmed_at is not None
-            )
-
-            if is_phone_type and is_pending:
+        if user.contact_methods_of(self.PHONE_TYPE_DESCRIPTION, confirmed=True):
+            raise ValidationError("The phone number has been confirmed.")
+        for contact_method in user.contact_methods_of(
+            self.PHONE_TYPE_DESCRIPTION, confirmed=False
+        ):
+            if contact_method.contact_confirmation.is_still_pending:
                 return contact_method
-            elif is_phone_type and is_confirmed:
-                raise ValidationError("The phone number has been confirmed.")
 
 
 @dataclass
@@ -510,6 +530,7 @@ class TokenValidationHandler(CommandHandler):
     contact_method_repo: ContactMethodRepository
     sign_up_repo: SignUpRepository
 
+    @traced_action
     def __call__(self, validation: ValidateEmailConfirmationToken) -> SignUp:
         """
         Perform the token validation by calling this object.
@@ -520,22 +541,34 @@ class TokenValidationHandler(CommandHandler):
         email: Optional[ContactMethod] = self.\
             contact_method_repo.\
             get_by_token(validation.token)
-
-        if email is None or \
-                email.contact_confirmation.confirmed_at is not None or \
-                email.contact_confirmation.expire_at < datetime.now():
+        if email is None or not email.contact_confirmation.is_still_pending:
             raise ValidationError('Invalid confirmation token')
 
-        sign_up: SignUp = self.sign_up_repo.get_by_user_id(email.user_id)
-        sign_up.stage = SignUpStage.IDENTITY_VALIDATION
+        sign_up = self.sign_up_repo.get_by_user_id(email.user_id)
+        if sign_up.stage is not SignUpStage.EMAIL_CONFIRMATION:
+            raise ValidationError(
+                'Sign up stage is not EMAIL_CONFIRMATION. '
+                f'(Current sign up stage: {sign_up.stage.value}).'
+            )
 
-        email.contact_confirmation = email.contact_confirmation.recreate(
-            confirmed_at=datetime.now()
+        # Only a pending confirmation is confirmed, once the sign up moves.
+        outcome = self.sign_up_repo.confirm_contact_method(
+            email.user_id,
+            email.id,
+            validation.token,
+            datetime.now(),
+            SignUpStage.EMAIL_CONFIRMATION,
+            SignUpStage.IDENTITY_VALIDATION
         )
+        if outcome is ConfirmationOutcome.INVALID_CONFIRMATION:
+            raise ValidationError('Invalid confirmation token')
+        if outcome is ConfirmationOutcome.STAGE_CHANGED:
+            raise ValidationError(
+                'Sign up stage changed from EMAIL_CONFIRMATION '
+                'while the email was confirmed.'
+            )
 
-        self.contact_method_repo.save(email)
-        self.sign_up_repo.save(sign_up)
-
+        sign_up.stage = SignUpStage.IDENTITY_VALIDATION
         return sign_up
 
 
@@ -547,6 +580,7 @@ class ValidateUserIdentityHandler(CommandHandler):
     identity_validation_repo: IdentityValidationRepository
     sign_up_repo: SignUpRepository
 
+    @traced_action
     def __call__(self, validation_data: ValidateUserIdentity) -> Optional[UUID]:
         """
         Perform external identity validation request.
@@ -554,7 +588,7 @@ class ValidateUserIdentityHandler(CommandHandler):
         Return identity validation id if validation was successful and identity was
         confirmed.
         """
-        user = self.user_repo.get_by_id(validation_data.user_id)
+        user, sign_up = self.user_repo.get_with_sign_up(validation_data.user_id)
 
         if user.status is not UserStatus.PENDING_VALIDATION:
             raise ValidationError(
@@ -562,8 +596,6 @@ class ValidateUserIdentityHandler(CommandHandler):
                 f'(Current status: {user.status.value})'
             )
 
-        sign_up = self.sign_up_repo.get_by_user_id(validation_data.user_id)
-
         if sign_up.stage is not SignUpStage.IDENTITY_VALIDATION:
             raise ValidationError(
                 'Sign up stage is not IDENTITY_VALIDATION. '
@@ -593,26 +625,38 @@ class ValidateUserIdentityHandler(CommandHandler):
         return user_id
 
     def __update_on_validation_success(self, user: User) -> None:
-        user.status = UserStatus.VALIDATED
-        self.user_repo.save(user)
+        self.__set_status(user, UserStatus.VALIDATED)
 
     def __update_on_attempts_exceed_or_data_error(
             self,
             user: User,
             err: Union[AttemptsExceededError, IdentityDataError]
     ):
-        user.status = (
+        # The error is raised anyway, a status changed meanwhile is kept.
+        self.user_repo.set_status(
+            user.id,
+            user.status,
             UserStatus.BANNED_NOTIFIED if err.banned_notified else UserStatus.BANNED
         )
-        self.user_repo.save(user)
 
     def __update_on_validation_teen(self, user: User) -> None:
-        user.status = UserStatus.PENDING_AUTHORIZATION
-        self.user_repo.save(user)
+        self.__set_status(user, UserStatus.PENDING_AUTHORIZATION)
 
     def __update_on_validation_minor(self, sign_up: SignUp) -> None:
-        sign_up.stage = SignUpStage.SIGN_UP_BLOCKED
-        self.sign_up_repo.save(sign_up)
+        self.sign_up_repo.transition_stage(
+            sign_up.user_id,
+            SignUpStage.IDENTITY_VALIDATION,
+            SignUpStage.SIGN_UP_BLOCKED
+        )
+
+    def __set_status(self, user: User, status: UserStatus) -> None:
+        """Change the status the user had when it was read, or fail."""
+        if not self.user_repo.set_status(user.id, user.status, status):
+            raise ValidationError(
+                f'User status changed from {user.status.value} '
+                'while its identity was validated.'
+            )
+        user.status = status
 
 
 @dataclass
@@ -621,9 +665,13 @@ class GetSignUpStageByUserIdHandler(CommandHandler):
 
     sign_up_repo: SignUpRepository
 
+    @traced_action
     def __call__(self, get_sign_up: GetSignUpStageByUserId) -> SignUpStage:
         """Get a sign up instance stage by its user id."""
-        sign_up: SignUp = self.sign_up_repo.get_by_user_id(get_sign_up.user_id)
+        sign_up: SignUp = self.sign_up_repo.get_by_user_id(
+            get_sign_up.user_id,
+            include_archived=True
+        )
 
         return sign_up.stage
 
@@ -634,6 +682,7 @@ class GetServiceAgreementByIDHandler(CommandHandler):
 
     service_agr_repo: ServiceAgreementDbRepository
 
+    @traced_action
     def __call__(
         self,
         action: GetServiceAgreement
@@ -650,15 +699,16 @@ class GetIdentityHandler(CommandHandler):
     """Business logic for getting a user's identity validation."""
 
     user_repo: UserRepository
-    sign_up_repo: SignUpRepository
     identity_validation_repo: IdentityValidationRepository
     address_repo: AddressRepository
 
+    @traced_action
     def __call__(self, action: GetIdentityValidation) -> Identity:
         """Get a user's identity validation."""
-        user = self.user_repo.get_by_id(action.user_id)
-
-        sign_up = self.sign_up_repo.get_by_user_id(user.id)
+        user, sign_up = self.user_repo.get_with_sign_up(
+            action.user_id,
+            include_archived=True
+        )
 
         identity = self.identity_validation_repo.get_identity_by_user_id(user.id)
 
@@ -681,14 +731,30 @@ class UpdateLegalValidationHandler(CommandHandler):
     customer_repo: CustomerRepository
     sign_up_repo: SignUpRepository
 
+    # Sign ups past the legal validation are rejected.
+    FROM_STAGES = (SignUpStage.IDENTITY_VALIDATION, SignUpStage.LEGAL_VALIDATION)
+
+    @traced_action
     def __call__(self, action: UpdateLegalValidation) -> User:
         """Update a user's legal validation."""
-        user = self.user_repo.get_by_id(action.user_id)
+        user, sign_up = self.user_repo.get_with_sign_up(action.user_id)
+        if sign_up.stage not in self.FROM_STAGES:
+            raise ValidationError(
+                'Sign up stage can not move to LEGAL_VALIDATION. '
+                f'(Current sign up stage: {sign_up.stage.value}).'
+            )
+
         action.customer_id = user.customer_id
         self.customer_repo.update_legal_validation(action)
-        sign_up: SignUp = self.sign_up_repo.get_by_user_id(user.id)
-        sign_up.stage = SignUpStage.LEGAL_VALIDATION
-        self.sign_up_repo.save(sign_up)
+        if not self.sign_up_repo.transition_stage(
+            user.id,
+            self.FROM_STAGES,
+            SignUpStage.LEGAL_VALIDATION
+        ):
+            raise ValidationError(
+                f'Sign up stage changed from {sign_up.stage.value} '
+                'while the legal validation was updated.'
+            )
 
 
 @dataclass
@@ -697,9 +763,10 @@ class GetUserContactMethodsHandler(CommandHandler):
 
     user_repo: UserRepository
 
+    @traced_action
     def __call__(self, action: GetUserContactMethods) -> List[ContactMethod]:
         """Get a user or raise entity not found and fetch its contact methods list."""
-        user = self.user_repo.get_by_id(action.user_id)
+        user = self.user_repo.get_by_id(action.user_id, include_archived=True)
         return user.contact_methods
 
 
@@ -713,15 +780,14 @@ class ConfirmIdentityHandler(CommandHandler):
     customer_repo: CustomerRepository
     sign_up_repo: SignUpRepository
 
+    @traced_action
     def __call__(self, action: ConfirmIdentity) -> UUID:
         """
         Handle identity and address confirmation.
 
         Associate user to existent customer or request a new one.
         """
-        user = self.__get_user(action.user_id)
-
-        sign_up = self.__get_sign_up(action.user_id)
+        user, sign_up = self.__get_user_and_sign_up(action.user_id)
 
         user_id = self.identity_validation_repo.confirm_identity(action.user_id)
         identity = self.identity_validation_repo.get_identity_by_user_id(action.user_id)
@@ -731,30 +797,32 @@ class ConfirmIdentityHandler(CommandHandler):
 
         self.user_repo.save(user)
 
-        sign_up.stage = SignUpStage.LEGAL_VALIDATION
-        self.sign_up_repo.save(sign_up)
+        if not self.sign_up_repo.transition_stage(
+            sign_up.user_id,
+            SignUpStage.IDENTITY_VALIDATION,
+            SignUpStage.LEGAL_VALIDATION
+        ):
+            raise ValidationError(
+                'Sign up stage changed from IDENTITY_VALIDATION '
+                'while the identity was confirmed.'
+            )
 
         return user_id
 
-    def __get_user(self, user_id: UUID) -> User:
-        user = self.user_repo.get_by_id(user_id)
+    def __get_user_and_sign_up(self, user_id: UUID) -> Tuple[User, SignUp]:
+        user, sign_up = self.user_repo.get_with_sign_up(user_id)
         if user.status is not UserStatus.PENDING_VALIDATION:
             raise ValidationError(
                 'User status is not PENDING_VALIDATION. '
                 f'(Current status: {user.status.value}).'
             )
-
-        return user
-
-    def __get_sign_up(self, user_id: UUID) -> SignUp:
-        sign_up = self.sign_up_repo.get_by_user_id(user_id)
         if sign_up.stage is not SignUpStage.IDENTITY_VALIDATION:
             raise ValidationError(
                 'Sign up stage is not IDENTITY_VALIDATION. '
                 f'(Current sign up stage: {sign_up.stage.value}).'
             )
 
-        return sign_up
+        return user, sign_up
 
     def __associate_customer(self, user: User, identity: Identity):
         customers = self.customer_repo.list_by_dni(identity.dni)
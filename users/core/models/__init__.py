@@ -3,6 +3,7 @@ from users.core.models.customers import (
     Customer,
     Identification,
 )
+from users.core.models.idempotency import StoredResponse
 from users.core.models.identity_validations import (
     Identity,
     PerformIdentityValidationResponse
@@ -13,6 +14,8 @@ from users.core.models.locals import (
     SavePhoneConfirmation,
     ServiceAgreement,
     SignUp,
+    SignUpAttempt,
+    SignUpImport,
     User,
     UserAddress,
 )
@@ -29,6 +32,9 @@ __all__ = [
     PerformIdentityValidationResponse,
     SavePhoneConfirmation,
     SignUp,
+    SignUpAttempt,
+    SignUpImport,
+    StoredResponse,
     User,
     UserAddress,
 ]
@@ -1,7 +1,10 @@
 from dataclasses import dataclass
 from uuid import UUID
 
+from users.core.slots import slotted
 
+
+@slotted
 @dataclass
 class Address:
     """Represent address entity."""
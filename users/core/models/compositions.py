@@ -1,6 +1,6 @@
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field, fields, MISSING
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Type, TypeVar
 
 from . import states
 
@@ -9,15 +9,15 @@ from . import states
 class CompositeType:
     """Base class for all the classes that declare a composite type."""
 
-    def __new__(cls, *args, **kwargs):
+    def __init__(self, *args, **kwargs):
         """
         Prevent this class to be instantiated by itself.
 
-        Only classes inheriting CompositeType can be instantiated.
+        Only classes inheriting CompositeType can be instantiated, each
+        dataclass generates its own ``__init__``. Unlike a ``__new__``
+        override, this keeps the subclasses on the builtin allocation.
         """
-        if cls is CompositeType:
-            raise TypeError('This class cannot instantiate by itself.')
-        return super().__new__(cls)
+        raise TypeError('This class cannot instantiate by itself.')
 
     def recreate(self, **new_attributes) -> 'CompositeType':
         """
@@ -33,12 +33,77 @@ class CompositeType:
         CompositeType:
             A new instance of the same object with the updated attr values.
         """
-        attributes = asdict(self)
+        attributes = {f.name: getattr(self, f.name) for f in fields(self)}
         attributes.update(new_attributes)
 
         return self.__class__(**attributes)
 
 
+T = TypeVar('T', bound=CompositeType)
+
+
+def _generate(lines: List[str], namespace: Dict[str, object]) -> Callable:
+    exec('\n'.join(lines), namespace)
+    return namespace['function']
+
+
+def composite_type(cls: Type[T]) -> Type[T]:
+    """
+    Replace the generic methods of a frozen composite with generated ones.
+
+    Apply it above ``@dataclass(frozen=True)``. Composites are built on
+    every ORM load of their owner, turned into ``__composite_values__`` on
+    every flush and copied by ``recreate`` on each update. The generated
+    methods name every field and write the instance ``__dict__`` directly,
+    instead of calling ``object.__setattr__`` per field and
+    ``dataclasses.asdict``, which deep copies each value. ``recreate``
+    copies the values shallowly, which is safe as composites are immutable.
+    """
+    names = [f.name for f in fields(cls)]
+    namespace: Dict[str, object] = {'MISSING': MISSING, 'object_new': object.__new__}
+
+    params, init = [], []
+    for f in fields(cls):
+        if f.default is not MISSING:
+            namespace[f'default_{f.name}'] = f.default
+            params.append(f'{f.name}=default_{f.name}')
+        elif f.default_factory is not MISSING:
+            namespace[f'factory_{f.name}'] = f.default_factory
+            params.append(f'{f.name}=MISSING')
+            init += [
+                f'    if {f.name} is MISSING:',
+                f'        {f.name} = factory_{f.name}()',
+            ]
+        else:
+            params.append(f.name)
+
+    cls.__init__ = _generate([
+        f'def function(self, {", ".join(params)}):',
+        *init,
+        '    state = self.__dict__',
+        *[f'    state[{name!r}] = {name}' for name in names],
+    ], dict(namespace))
+    cls.recreate = _generate([
+        f'def function(self, *, {"=MISSING, ".join(names)}=MISSING):',
+        '    new = object_new(self.__class__)',
+        '    state = new.__dict__',
+        *[
+            f'    state[{name!r}] = self.{name} if {name} is MISSING else {name}'
+            for name in names
+        ],
+        '    return new',
+    ], dict(namespace))
+    cls.__composite_values__ = _generate([
+        'def function(self):',
+        f'    return ({", ".join(f"self.{name}" for name in names)},)',
+    ], dict(namespace))
+
+    for method in ('__init__', 'recreate', '__composite_values__'):
+        getattr(cls, method).__qualname__ = f'{cls.__qualname__}.{method}'
+    return cls
+
+
+@composite_type
 @dataclass(frozen=True)
 class AuditFields(CompositeType):
     """Represent the base model for audit fields."""
@@ -50,14 +115,8 @@ class AuditFields(CompositeType):
     deleted_by: Optional[str] = None
     deleted_date: Optional[datetime] = None
 
-    def __composite_values__(self) -> tuple:
-        """Return the state of the object as a tuple."""
-        return (
-            self.created_by, self.created_date, self.modified_by,
-            self.modified_date, self.deleted_by, self.deleted_date
-        )
-
 
+@composite_type
 @dataclass(frozen=True)
 class ContactConfirmation(CompositeType):
     """Represent how a new user will confirm its provided contact method."""
@@ -81,10 +140,3 @@ class ContactConfirmation(CompositeType):
         Check that the confirmation date is None and it's not expired yet.
         """
         return self.expire_at >= datetime.today() and self.confirmed_at is None
-
-    def __composite_values__(self) -> tuple:
-        """Return the state of the object as a tuple."""
-        return (
-            self.type, self.value, self.created_at, self.expire_at,
-            self.confirmed_at
-        )
@@ -3,7 +3,10 @@ from datetime import datetime
 from typing import Dict, Optional, Tuple
 from uuid import UUID
 
+from users.core.slots import slotted
 
+
+@slotted
 @dataclass
 class Identification:
     """Represent the base model for identification data."""
@@ -15,6 +18,7 @@ class Identification:
     updated_at: datetime
 
 
+@slotted
 @dataclass
 class Customer:
     """Represent the base model for customer data."""
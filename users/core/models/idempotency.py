@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class StoredResponse:
+    """Represent the response replayed to the retries of a request."""
+
+    status_code: int
+    body: bytes
+    media_type: Optional[str] = None
@@ -4,8 +4,10 @@ from typing import List, Optional
 from uuid import UUID
 
 from users.core.models import Address
+from users.core.slots import slotted
 
 
+@slotted
 @dataclass
 class Identity:
     """Represent external identity model."""
@@ -20,6 +22,7 @@ class Identity:
     addresses: Optional[List[Address]] = field(default_factory=list)
 
 
+@slotted
 @dataclass
 class PerformIdentityValidationResponse:
     """IdentityValidation microservice response after performing a request."""
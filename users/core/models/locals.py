@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import UUID, uuid4
 
 from users.core.exceptions import EntityNotFound, ResolutionError
@@ -32,6 +32,84 @@ class SignUp:
     user_id: Optional[UUID] = None
 
 
+class ContactMethodList(list):
+    """List of the contact methods of a user counting its mutations.
+
+    The contact methods added hold a reference to the list, and count the
+    changes of their type or confirmation in it.
+    """
+
+    version = 0
+
+    def __init__(self, items: Iterable['ContactMethod'] = ()) -> None:
+        """Hold the contact methods."""
+        super().__init__(items)
+        self._own(self)
+
+    def _own(self, items: Iterable['ContactMethod']) -> None:
+        for item in items:
+            object.__setattr__(item, '_contact_methods', self)
+
+    def _mutated(self) -> None:
+        self.version += 1
+
+    def append(self, item: 'ContactMethod') -> None:
+        """Append the contact method."""
+        super().append(item)
+        self._own((item,))
+        self._mutated()
+
+    def extend(self, items: Iterable['ContactMethod']) -> None:
+        """Append the contact methods."""
+        items = list(items)
+        super().extend(items)
+        self._own(items)
+        self._mutated()
+
+    def insert(self, index: int, item: 'ContactMethod') -> None:
+        """Insert the contact method before the index."""
+        super().insert(index, item)
+        self._own((item,))
+        self._mutated()
+
+    def remove(self, item: 'ContactMethod') -> None:
+        """Remove the contact method."""
+        super().remove(item)
+        self._mutated()
+
+    def pop(self, index: int = -1) -> 'ContactMethod':
+        """Remove and return the contact method at the index."""
+        item = super().pop(index)
+        self._mutated()
+        return item
+
+    def clear(self) -> None:
+        """Remove every contact method."""
+        super().clear()
+        self._mutated()
+
+    def __setitem__(self, index: object, value: object) -> None:
+        """Replace the contact methods at the index or slice."""
+        if isinstance(index, slice):
+            value = list(value)
+            super().__setitem__(index, value)
+            self._own(value)
+        else:
+            super().__setitem__(index, value)
+            self._own((value,))
+        self._mutated()
+
+    def __delitem__(self, index: object) -> None:
+        """Remove the contact methods at the index or slice."""
+        super().__delitem__(index)
+        self._mutated()
+
+    def __iadd__(self, items: Iterable['ContactMethod']) -> 'ContactMethodList':
+        """Append the contact methods."""
+        self.extend(items)
+        return self
+
+
 @dataclass
 class User:
     """Represent the base model for user data."""
@@ -39,7 +117,7 @@ class User:
     id: UUID = field(init=False, default_factory=uuid4)
     service_agr_id: int
     status: states.UserStatus
-    contact_methods: List['ContactMethod'] = field(default_factory=list)
+    contact_methods: List['ContactMethod'] = field(default_factory=ContactMethodList)
     user_addresses: List['UserAddress'] = field(default_factory=list)
     customer_id: Optional[UUID] = None
     terms_and_conditions: UUID = None
@@ -47,6 +125,12 @@ class User:
     customer: Optional[Customer] = None
     audit_fields: AuditFields = field(default=AuditFields())
 
+    def __setattr__(self, name: str, value: object) -> None:
+        """Keep the contact methods in a list counting its mutations."""
+        if name == 'contact_methods' and not isinstance(value, ContactMethodList):
+            value = ContactMethodList(value)
+        super().__setattr__(name, value)
+
     @property
     def email(self) -> str:
         """Try to return unique user email from its contact methods."""
@@ -63,6 +147,21 @@ class User:
         )
         return phone_number_value
 
+    def contact_methods_of(
+        self,
+        contact_method_type: str,
+        confirmed: Optional[bool] = None
+    ) -> Tuple['ContactMethod', ...]:
+        """Return the contact methods of a type, in the order of the user's list.
+
+        ``confirmed`` narrows them to the confirmed or unconfirmed ones.
+        """
+        contact_methods = self.contact_methods
+        index = self.__dict__.get('_contact_method_index')
+        if index is None or not index.is_current(contact_methods):
+            index = self._contact_method_index = ContactMethodIndex(contact_methods)
+        return index.by_key.get((contact_method_type, confirmed), ())
+
     def __get_contact_method(self, contact_method_type: str) -> str:
         """
         Filter by type and try to get one contact method value from instance.
@@ -70,11 +169,7 @@ class User:
         Raises exceptions if there was more than one unique contact method or
         there was none.
         """
-        results = list(filter(
-            lambda cm: (
-                cm.type.description == contact_method_type and cm.is_confirmed
-            ), self.contact_methods
-        ))
+        results = self.contact_methods_of(contact_method_type, confirmed=True)
 
         if len(results) > 1:
             raise ResolutionError(contact_method_type, self.id)
@@ -85,6 +180,35 @@ class User:
         return results[0].value
 
 
+class ContactMethodIndex:
+    """Contact methods of a user grouped by type description and confirmation.
+
+    The index remembers the list it was built from and the mutations it had
+    counted. Replacing or mutating the list, or changing the type or the
+    confirmation of one of its contact methods, invalidates it without
+    comparing the contact methods again.
+    """
+
+    def __init__(self, contact_methods: List['ContactMethod']) -> None:
+        """Group the contact methods by type description and confirmation."""
+        self.contact_methods = contact_methods
+        self.version = getattr(contact_methods, 'version', None)
+        by_key: Dict[Tuple[str, Optional[bool]], List[ContactMethod]] = {}
+        for contact_method in contact_methods:
+            description = contact_method.type.description
+            by_key.setdefault((description, None), []).append(contact_method)
+            by_key.setdefault((description, contact_method.is_confirmed), []).append(
+                contact_method
+            )
+        self.by_key = {key: tuple(grouped) for key, grouped in by_key.items()}
+
+    def is_current(self, contact_methods: List['ContactMethod']) -> bool:
+        """Return whether the index was built from these contact methods as they are."""
+        if contact_methods is not self.contact_methods or self.version is None:
+            return False
+        return contact_methods.version == self.version
+
+
 @dataclass
 class ContactMethod:
     """Represent the base model for contact method."""
@@ -96,6 +220,14 @@ class ContactMethod:
     user_id: Optional[UUID] = None
     audit_fields: AuditFields = field(default=AuditFields())
 
+    def __setattr__(self, name: str, value: object) -> None:
+        """Count the changes of the type or confirmation in the user's list."""
+        super().__setattr__(name, value)
+        if name in ('type', 'contact_confirmation'):
+            contact_methods = self.__dict__.get('_contact_methods')
+            if contact_methods is not None:
+                contact_methods._mutated()
+
     @property
     def is_confirmed(self) -> bool:
         """Evaluate contact confirmation date.
@@ -105,6 +237,31 @@ class ContactMethod:
         return self.contact_confirmation.confirmed_at is not None
 
 
+@dataclass
+class SignUpAttempt:
+    """Represent the result of creating or renewing the sign up of an email.
+
+    The user and contact method are the ones holding the email, the sign up
+    is only loaded when it was created or renewed.
+    """
+
+    outcome: states.SignUpOutcome
+    user: User
+    contact_method: ContactMethod
+    sign_up: Optional[SignUp] = None
+
+
+@dataclass
+class SignUpImport:
+    """Represent the result of importing the sign ups of many emails.
+
+    Emails already registered, or repeated within the import, are skipped.
+    """
+
+    created: int = 0
+    skipped: int = 0
+
+
 @dataclass
 class SavePhoneConfirmation:
     """Represent the response for saving phone confirmation."""
@@ -26,6 +26,23 @@ class SignUpStage(Enum):
     SIGN_UP_BLOCKED = 'SIGN_UP_BLOCKED'
 
 
+class SignUpOutcome(Enum):
+    """Represent what creating or renewing the sign up of an email did."""
+
+    CREATED = 'CREATED'
+    RENEWED = 'RENEWED'
+    STILL_PENDING = 'STILL_PENDING'
+    ALREADY_CONFIRMED = 'ALREADY_CONFIRMED'
+
+
+class ConfirmationOutcome(Enum):
+    """Represent what confirming a contact method of a sign up did."""
+
+    CONFIRMED = 'CONFIRMED'
+    INVALID_CONFIRMATION = 'INVALID_CONFIRMATION'
+    STAGE_CHANGED = 'STAGE_CHANGED'
+
+
 class UserStatus(Enum):
     """Represent possible status types for a user."""
 
@@ -37,3 +54,8 @@ class UserStatus(Enum):
     ACTIVE = 'ACTIVE'
     BLOCKED = 'BLOCKED'
     PENDING_AUTHORIZATION = 'PENDING_AUTHORIZATION'
+
+
+# Users in these statuses, or whose sign up is SIGN_UP_BLOCKED, never move on
+# and get archived.
+TERMINAL_USER_STATUSES = (UserStatus.BANNED, UserStatus.BANNED_NOTIFIED)
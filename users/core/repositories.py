@@ -3,7 +3,8 @@ from abc import (
     abstractmethod,
 )
 from dataclasses import dataclass
-from typing import List, Optional
+from datetime import datetime
+from typing import Collection, List, Optional, Tuple, Union
 from uuid import UUID
 
 from users.core.actions import RequestUserIdentityValidation
@@ -15,14 +16,26 @@ from users.core.models import (
     Identity,
     ServiceAgreement,
     SignUp,
+    SignUpAttempt,
+    StoredResponse,
     User,
 )
-from users.core.models.states import BusinessModel
+from users.core.models.states import (
+    BusinessModel,
+    ConfirmationOutcome,
+    SignUpStage,
+    UserStatus,
+)
 
 
 @dataclass
 class UserRepository(ABC):
-    """Represent an abstraction of the user repository."""
+    """Represent an abstraction of the user repository.
+
+    Archived users can not be saved, the lookups only return them when
+    ``include_archived`` is set, for reading them. Otherwise the lookups
+    raise ``EntityGoneError`` for them.
+    """
 
     @abstractmethod
     def save(self, user: User) -> None:
@@ -30,15 +43,25 @@ class UserRepository(ABC):
         pass
 
     @abstractmethod
-    def get_by_id(self, user_id: UUID) -> User:
+    def get_by_id(self, user_id: UUID, include_archived: bool = False) -> User:
         """Get a user by its id."""
         pass
 
+    @abstractmethod
+    def get_with_sign_up(
+        self,
+        user_id: UUID,
+        include_archived: bool = False
+    ) -> Tuple[User, SignUp]:
+        """Get a user by its id along with its sign up."""
+        pass
+
     @abstractmethod
     def get_by_customer_and_business_model(
         self,
         customer_id: UUID,
         business_model: BusinessModel,
+        include_archived: bool = False
     ) -> Optional[User]:
         """Get a user by its business model."""
         pass
@@ -47,7 +70,8 @@ class UserRepository(ABC):
     def get_by_customer_and_service_agr_id(
         self,
         customer_id: UUID,
-        service_agr_id: int
+        service_agr_id: int,
+        include_archived: bool = False
     ) -> Optional[User]:
         """Get a user by its service agreement id."""
         pass
@@ -56,11 +80,25 @@ class UserRepository(ABC):
     def get_by_service_agr_id_and_email(
         self,
         service_agr_id: int,
-        email: str
+        email: str,
+        include_archived: bool = False
     ) -> Optional[User]:
         """Get a user or none by its svc agreement id and email."""
         pass
 
+    @abstractmethod
+    def set_status(
+        self,
+        user_id: UUID,
+        expected: UserStatus,
+        new: UserStatus
+    ) -> bool:
+        """Change the status of the user if it is the expected one.
+
+        Return whether it was, False also when the user does not exist.
+        """
+        pass
+
 
 @dataclass
 class ContactMethodTypeRepository(ABC):
@@ -74,15 +112,19 @@ class ContactMethodTypeRepository(ABC):
 
 @dataclass
 class SignUpRepository(ABC):
-    """Represent an abstraction of the sign up repository."""
+    """Represent an abstraction of the sign up repository.
+
+    As for the users, the sign ups archived are only returned when
+    ``include_archived`` is set and raise ``EntityGoneError`` otherwise.
+    """
 
     @abstractmethod
-    def get(self, sign_up_id: UUID) -> SignUp:
+    def get(self, sign_up_id: UUID, include_archived: bool = False) -> SignUp:
         """Get a sign up object by its primary key."""
         pass
 
     @abstractmethod
-    def get_by_user_id(self, user_id: UUID) -> SignUp:
+    def get_by_user_id(self, user_id: UUID, include_archived: bool = False) -> SignUp:
         """Get a sign up object by its user id."""
         pass
 
@@ -91,6 +133,69 @@ class SignUpRepository(ABC):
         """Persist a SignUp object."""
         pass
 
+    @abstractmethod
+    def transition_stage(
+        self,
+        user_id: UUID,
+        from_stage: Union[SignUpStage, Collection[SignUpStage]],
+        to_stage: SignUpStage
+    ) -> bool:
+        """Move the sign up of the user to a stage if it is in the from one.
+
+        Return whether it was, False also when the sign up does not exist.
+        """
+        pass
+
+    @abstractmethod
+    def confirm_contact_method(
+        self,
+        user_id: UUID,
+        contact_method_id: UUID,
+        confirmation_value: str,
+        confirmed_at: datetime,
+        from_stage: Union[SignUpStage, Collection[SignUpStage]],
+        to_stage: SignUpStage
+    ) -> ConfirmationOutcome:
+        """Confirm a contact method of the user and move its sign up, at once.
+
+        The pending confirmation must have the value and not be expired at
+        ``confirmed_at``, and the sign up must be in the from stage. Nothing
+        changes unless both hold, so a confirmation is only used once the
+        sign up moved.
+        """
+        pass
+
+    @abstractmethod
+    def create_or_renew(
+        self,
+        sign_up: SignUp,
+        user: User,
+        contact_method: ContactMethod
+    ) -> SignUpAttempt:
+        """Create the sign up of the email, or renew its expired confirmation.
+
+        The email is the value of the contact method, within the service
+        agreement of the user. When a user already holds it, its confirmation
+        is renewed until the expiration of the given contact method's, if it
+        had expired; the new user, contact method and sign up are discarded.
+        Concurrent calls for the same email are serialized. Raises
+        ``EmailClaimError`` when the user holding the email no longer has it.
+        """
+        pass
+
+    @abstractmethod
+    def create_many(
+        self,
+        sign_ups: Collection[Tuple[SignUp, User, ContactMethod]]
+    ) -> List[SignUpAttempt]:
+        """Create the sign ups of the emails no user holds, at once.
+
+        Unlike ``create_or_renew``, the emails already held are skipped and
+        their confirmations are not renewed. Return the attempts of the sign
+        ups created.
+        """
+        pass
+
 
 @dataclass
 class CustomerRepository(ABC):
@@ -194,3 +299,33 @@ class AddressRepository(ABC):
     @abstractmethod
     def list(self, user_id: UUID) -> List[Address]:
         """Get user addresses."""
+
+
+class IdempotencyKeyRepository(ABC):
+    """Represent the responses stored under the idempotency keys of requests.
+
+    A key is claimed by the first request sent with it, which then completes
+    it with its response, or releases it when it failed. Keys expire after a
+    TTL, so the stored responses are bounded.
+    """
+
+    TTL_SECONDS = 24 * 60 * 60
+    # A request holding a key for longer is assumed dead, the gunicorn
+    # timeout would have killed it.
+    LOCK_SECONDS = 60
+
+    @abstractmethod
+    def claim(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """Claim the key, or return the response stored under it.
+
+        Raise IdempotencyKeyInUseError while another request holds the key and
+        IdempotencyKeyReusedError when it was claimed with another fingerprint.
+        """
+
+    @abstractmethod
+    def complete(self, key: str, fingerprint: str, response: StoredResponse) -> None:
+        """Store the response of the request that claimed the key."""
+
+    @abstractmethod
+    def release(self, key: str, fingerprint: str) -> None:
+        """Drop the claim of a request that could not complete."""
@@ -0,0 +1,32 @@
+"""Give dataclasses ``__slots__``, as ``dataclass(slots=True)`` does on 3.10."""
+from dataclasses import fields, is_dataclass
+from itertools import chain
+from typing import Type, TypeVar
+
+T = TypeVar('T')
+
+
+def slotted(cls: Type[T]) -> Type[T]:
+    """Rebuild the dataclass with a slot per field and no instance ``__dict__``.
+
+    Apply it above ``@dataclass``. Subclasses of a slotted dataclass must be
+    slotted too, or their instances get a ``__dict__`` back.
+    """
+    if not is_dataclass(cls):
+        raise TypeError(f'{cls.__name__} is not a dataclass')
+
+    inherited = set(chain.from_iterable(
+        getattr(base, '__slots__', ()) for base in cls.__mro__[1:]
+    ))
+    field_names = tuple(field.name for field in fields(cls))
+
+    namespace = dict(cls.__dict__)
+    namespace['__slots__'] = tuple(
+        name for name in field_names if name not in inherited
+    )
+    # The generated __init__ holds the defaults, the class attributes would
+    # shadow the slot descriptors.
+    for name in chain(field_names, ('__dict__', '__weakref__')):
+        namespace.pop(name, None)
+
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
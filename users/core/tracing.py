@@ -0,0 +1,22 @@
+"""Keep track of the action being handled in the current context."""
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Optional
+
+current_action: ContextVar[Optional[type]] = ContextVar(
+    'current_action',
+    default=None
+)
+
+
+def traced_action(handle: Callable) -> Callable:
+    """Expose the action type in ``current_action`` while a handler runs."""
+    @wraps(handle)
+    def traced_handle(handler: object, action: object) -> object:
+        token = current_action.set(type(action))
+        try:
+            return handle(handler, action)
+        finally:
+            current_action.reset(token)
+
+    return traced_handle
@@ -0,0 +1,6 @@
+"""Load-test harness of the onboarding funnel.
+
+The users api runs in-process against local stand-ins of the customer,
+identity-validation and merlin apis and of the broker, so a run only needs
+this repository. Run ``python -m users.loadtest --help`` for the options.
+"""
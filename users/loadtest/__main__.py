@@ -0,0 +1,113 @@
+r"""Command line entry point of the load-test harness.
+
+Examples
+--------
+Replay 20 onboarding funnels per second for a minute, with a slow merlin::
+
+    python -m users.loadtest --rps 20 --duration 60 \
+        --merlin-latency lognormal:0.2,0.6
+
+Run it against Postgres (``DB_URI``) and store the report::
+
+    python -m users.loadtest --backend postgres --output report.json
+"""
+from argparse import ArgumentParser, Namespace
+import json
+import sys
+from typing import Dict, List
+
+from users.benchmarks.context import BACKENDS, MEMORY
+from users.loadtest.scenario import drive, OnboardingFunnel, PERCENTILES, Report
+from users.loadtest.server import ApiServer, build_container
+from users.loadtest.stubs import (
+    Latency,
+    SERVICES,
+    StubApis,
+    StubProfile,
+    StubServer,
+)
+from users.memory import MemoryEventManager
+
+
+def parse_args(argv: List[str]) -> Namespace:
+    """Parse the command line arguments."""
+    parser = ArgumentParser(prog='python -m users.loadtest')
+    parser.add_argument('--rps', type=float, default=10,
+                        help='funnels started per second')
+    parser.add_argument('--duration', type=float, default=30,
+                        help='seconds during which funnels are started')
+    parser.add_argument('--workers', type=int, default=32,
+                        help='funnels allowed to run concurrently')
+    parser.add_argument('--backend', choices=BACKENDS, default=MEMORY)
+    parser.add_argument('--port', type=int, default=7105,
+                        help='port of the users api')
+    for service in SERVICES:
+        option = service.replace('_', '-')
+        parser.add_argument(
+            f'--{option}-latency', type=Latency.parse, default=Latency(),
+            help='none, constant:S, uniform:LOW,HIGH or lognormal:MEDIAN,SIGMA'
+        )
+        parser.add_argument(
+            f'--{option}-error-rate', type=float, default=0.0,
+            help='fraction of the requests answered with a 503'
+        )
+    parser.add_argument('--output', help='write the report as json')
+    return parser.parse_args(argv)
+
+
+def profiles(args: Namespace) -> Dict[str, StubProfile]:
+    """Return the stub behavior of every api from the arguments."""
+    return {
+        service: StubProfile(
+            latency=getattr(args, f'{service}_latency'),
+            error_rate=getattr(args, f'{service}_error_rate'),
+        )
+        for service in SERVICES
+    }
+
+
+def main(argv: List[str]) -> int:
+    """Run the load test and return the process exit status."""
+    args = parse_args(argv)
+    event_manager = MemoryEventManager()
+
+    stubs = StubServer(StubApis(profiles(args))).start()
+    build_container(args.backend, stubs.url, event_manager)
+    api = ApiServer(port=args.port).start()
+
+    report = Report()
+    try:
+        started = drive(
+            OnboardingFunnel(api.url, event_manager, report),
+            rps=args.rps,
+            duration=args.duration,
+            workers=args.workers,
+        )
+    finally:
+        api.stop()
+        stubs.stop()
+
+    summary = report.summary()
+    print(f'funnels started {started}, completed {report.completed_funnels}')
+    for step, stats in summary.items():
+        percentiles = ''.join(
+            f'  p{rank} {stats[f"p{rank}"] * 1e3:>8.1f} ms' for rank in PERCENTILES
+        )
+        print(
+            f'{step:<24} count {stats["count"]:>6} errors {stats["errors"]:>5}'
+            f'{percentiles}  max {stats["max"] * 1e3:>8.1f} ms'
+        )
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({
+                'started': started,
+                'completed': report.completed_funnels,
+                'steps': summary,
+            }, output, indent=2)
+
+    return 0 if report.completed_funnels == started else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
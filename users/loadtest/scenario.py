@@ -0,0 +1,211 @@
+"""Replay the onboarding funnel at a target rate and collect step latencies."""
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import local, Lock
+from time import perf_counter, sleep
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+import requests
+
+from users.loadtest.stubs import stub_address_id
+from users.memory import MemoryEventManager
+
+STEPS = (
+    'sign_up',
+    'email_token',
+    'identity_validation',
+    'identity_confirmation',
+    'legal_validation',
+)
+PERCENTILES = (50, 90, 95, 99)
+
+
+class StepError(Exception):
+    """Raised when a funnel step does not answer the expected status."""
+
+
+def percentile(sorted_values: List[float], rank: float) -> float:
+    """Return the nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, int(round(rank / 100 * len(sorted_values))) - 1)
+    return sorted_values[index]
+
+
+@dataclass
+class StepStats:
+    """Latencies, in seconds, and failures of a funnel step."""
+
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self) -> Dict:
+        """Return the count, error count and latency percentiles."""
+        latencies = sorted(self.latencies)
+        summary = {
+            'count': len(latencies),
+            'errors': self.errors,
+            'max': latencies[-1] if latencies else 0.0,
+        }
+        for rank in PERCENTILES:
+            summary[f'p{rank}'] = percentile(latencies, rank)
+        return summary
+
+
+class Report:
+    """Thread safe collector of the funnel step results."""
+
+    def __init__(self):
+        """Initialize empty stats for every step."""
+        self.steps: Dict[str, StepStats] = defaultdict(StepStats)
+        self.completed_funnels = 0
+        self.__lock = Lock()
+
+    def record(self, step: str, latency: float) -> None:
+        """Record a successful step."""
+        with self.__lock:
+            self.steps[step].latencies.append(latency)
+
+    def fail(self, step: str) -> None:
+        """Record a failed step."""
+        with self.__lock:
+            self.steps[step].errors += 1
+
+    def complete(self) -> None:
+        """Record a funnel that went through every step."""
+        with self.__lock:
+            self.completed_funnels += 1
+
+    def summary(self) -> Dict[str, Dict]:
+        """Return the summary of every step in funnel order."""
+        return {step: self.steps[step].summary() for step in STEPS}
+
+
+class OnboardingFunnel:
+    """Drive a user from the sign up to the legal validation."""
+
+    def __init__(
+        self,
+        api_url: str,
+        event_manager: MemoryEventManager,
+        report: Report,
+        service_agr_id: int = 0,
+    ):
+        """Initialize the funnel against a running users api."""
+        self.api_url = f'{api_url}/v2/users'
+        self.event_manager = event_manager
+        self.report = report
+        self.service_agr_id = service_agr_id
+        self.__sessions = local()
+
+    @property
+    def session(self) -> requests.Session:
+        """Return the http session of the current thread."""
+        if not hasattr(self.__sessions, 'session'):
+            self.__sessions.session = requests.Session()
+        return self.__sessions.session
+
+    def __step(
+        self,
+        step: str,
+        method: str,
+        path: str,
+        payload: Optional[Dict] = None
+    ) -> Dict:
+        start = perf_counter()
+        try:
+            response = self.session.request(
+                method, f'{self.api_url}{path}', json=payload
+            )
+        except requests.RequestException as error:
+            self.report.fail(step)
+            raise StepError(step) from error
+
+        latency = perf_counter() - start
+        if response.status_code >= 400:
+            self.report.fail(step)
+            raise StepError(f'{step}: {response.status_code} {response.text}')
+
+        self.report.record(step, latency)
+        return response.json() if response.content else {}
+
+    def __confirmation_token(self, email: str) -> str:
+        event = self.event_manager.last('signup', 'saved', email=email)
+        if event is None:
+            self.report.fail('email_token')
+            raise StepError('email_token: no saved sign up event was emitted')
+        return event.payload['confirmation_token']
+
+    def run(self) -> None:
+        """Go through every step, stopping at the first failure."""
+        email = f'{uuid4()}@loadtest.com'
+        try:
+            content = self.__step('sign_up', 'POST', '/signup/email_confirmation', {
+                'service_agr_id': self.service_agr_id,
+                'email': email,
+            })
+            user_id = content['user_id']
+
+            token = self.__confirmation_token(email)
+            self.__step('email_token', 'GET', f'/signup/email_confirmation/{token}')
+
+            self.__step(
+                'identity_validation',
+                'POST',
+                f'/signup/{user_id}/identity_validation',
+                {
+                    'ocr': 'ocr',
+                    'selfie': 'selfie',
+                    'face_id': 'face_id',
+                    'base64_front': 'front',
+                    'base64_selfie': 'selfie',
+                    'base64_back': 'back',
+                }
+            )
+            self.__step(
+                'identity_confirmation',
+                'PATCH',
+                f'/signup/{user_id}/identity_validation',
+                {'address_id': str(stub_address_id(user_id))}
+            )
+            self.__step(
+                'legal_validation',
+                'PATCH',
+                f'/signup/{user_id}/legal_validation',
+                {
+                    'pep': False,
+                    'so': False,
+                    'facta': False,
+                    'occupation_id': str(uuid4()),
+                    'relationship': 'SINGLE',
+                }
+            )
+        except StepError:
+            return
+
+        self.report.complete()
+
+
+def drive(
+    funnel: OnboardingFunnel,
+    rps: float,
+    duration: float,
+    workers: int
+) -> int:
+    """Start funnels at a fixed rate, open loop, and wait for all of them.
+
+    Returns the number of funnels started.
+    """
+    interval = 1 / rps
+    started = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        start = perf_counter()
+        while perf_counter() - start < duration:
+            executor.submit(funnel.run)
+            started += 1
+            next_start = start + started * interval
+            sleep(max(0.0, next_start - perf_counter()))
+
+    return started
@@ -0,0 +1,74 @@
+"""Serve the users api in-process, wired to the local stand-ins."""
+from threading import Thread
+from time import sleep
+
+from dependency_injector.providers import Object
+import uvicorn
+
+from users.api.run import app
+from users.benchmarks.context import (
+    BACKENDS,
+    MEMORY,
+    migrate,
+    settings,
+    use_memory_repositories,
+)
+from users.containers import UserContainer
+from users.memory import MemoryEventManager
+
+
+def build_container(
+    backend: str,
+    stub_url: str,
+    event_manager: MemoryEventManager
+) -> UserContainer:
+    """Create a container that talks to the stub apis and the memory broker.
+
+    It wires the api views, so it must be built after ``app`` exists.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f'backend must be one of {BACKENDS}')
+
+    container = UserContainer()
+    container.wire()
+    container.config.from_dict({
+        **settings(),
+        'customer_api_url': stub_url,
+        'identity_validation_svc_url': stub_url,
+        'merlin_api_url': stub_url,
+    })
+
+    if backend == MEMORY:
+        use_memory_repositories(container)
+    else:
+        migrate()
+
+    container.event_manager.override(Object(event_manager))
+    return container
+
+
+class ApiServer:
+    """Run uvicorn from a background thread."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 7105):
+        """Configure the server of the users api."""
+        self.server = uvicorn.Server(uvicorn.Config(
+            app,
+            host=host,
+            port=port,
+            log_level='warning',
+        ))
+        self.thread = Thread(target=self.server.run, daemon=True)
+        self.url = f'http://{host}:{port}'
+
+    def start(self) -> 'ApiServer':
+        """Start serving and wait until the server accepts requests."""
+        self.thread.start()
+        while not self.server.started:
+            sleep(0.05)
+        return self
+
+    def stop(self) -> None:
+        """Ask the server to exit and wait for it."""
+        self.server.should_exit = True
+        self.thread.join()
@@ -0,0 +1,265 @@
+"""HTTP stand-ins of the customer, identity-validation and merlin apis.
+
+A single server answers the three apis, so the three ``*_URL`` settings can
+point to it. Every api has its own latency distribution and error rate.
+Response bodies are the fixtures used by the test suite.
+"""
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import re
+from threading import Thread
+from time import sleep
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
+from uuid import UUID, uuid4, uuid5
+
+from users.tests.base import BaseTestCase
+from users.tests.mock_factory import identity_factory_mock
+
+CUSTOMER = 'customer'
+IDENTITY_VALIDATION = 'identity_validation'
+MERLIN = 'merlin'
+SERVICES = (CUSTOMER, IDENTITY_VALIDATION, MERLIN)
+
+ADDRESS_NAMESPACE = UUID('6f0c3a57-7a4c-4a39-9c55-54a1ad7f34a1')
+
+
+def stub_address_id(user_id: UUID) -> UUID:
+    """Return the id of the first address that merlin stub lists for a user."""
+    return uuid5(ADDRESS_NAMESPACE, str(user_id))
+
+
+class Latency:
+    """Distribution of the delay added to every stub response, in seconds."""
+
+    def sample(self) -> float:
+        """Draw a delay from the distribution."""
+        return 0.0
+
+    @staticmethod
+    def parse(spec: str) -> 'Latency':
+        """Parse ``constant:S``, ``uniform:LOW,HIGH`` or ``lognormal:MEDIAN,SIGMA``."""
+        kind, _, raw_params = spec.partition(':')
+        params = [float(param) for param in raw_params.split(',') if param]
+        distributions = {
+            'none': Latency,
+            'constant': ConstantLatency,
+            'uniform': UniformLatency,
+            'lognormal': LogNormalLatency,
+        }
+        if kind not in distributions:
+            raise ValueError(f'Unknown latency distribution "{kind}".')
+
+        return distributions[kind](*params)
+
+
+@dataclass
+class ConstantLatency(Latency):
+    """Always wait the same amount of time."""
+
+    seconds: float
+
+    def sample(self) -> float:
+        """Return the constant delay."""
+        return self.seconds
+
+
+@dataclass
+class UniformLatency(Latency):
+    """Wait a uniformly distributed amount of time."""
+
+    low: float
+    high: float
+
+    def sample(self) -> float:
+        """Draw a delay between low and high."""
+        return random.uniform(self.low, self.high)
+
+
+@dataclass
+class LogNormalLatency(Latency):
+    """Wait a log-normally distributed time, the usual shape of api latency."""
+
+    median: float
+    sigma: float = 0.5
+
+    def sample(self) -> float:
+        """Draw a delay whose median is the configured one."""
+        return self.median * random.lognormvariate(0, self.sigma)
+
+
+@dataclass
+class StubProfile:
+    """Behavior of a stubbed api."""
+
+    latency: Latency = field(default_factory=Latency)
+    error_rate: float = 0.0
+
+
+Response = Tuple[int, object]
+Route = Tuple[str, str, Pattern, Callable[..., Response]]
+
+
+class StubApis:
+    """Route and answer the requests of the three stubbed apis."""
+
+    def __init__(self, profiles: Optional[Dict[str, StubProfile]] = None):
+        """Initialize the routes with the behavior of every api."""
+        self.profiles = {
+            service: StubProfile() for service in SERVICES
+        }
+        self.profiles.update(profiles or {})
+        self.customer_mock = BaseTestCase.CustomerMock()
+        self.routes: List[Route] = [
+            (CUSTOMER, 'GET', r'/customers/?$', self.list_customers),
+            (CUSTOMER, 'POST', r'/customers/?$', self.create_customer),
+            (CUSTOMER, 'GET', r'/customers/(?P<customer_id>[^/]+)$',
+             self.get_customer),
+            (CUSTOMER, 'PATCH',
+             r'/customers/(?P<customer_id>[^/]+)/legal_validation$',
+             self.update_legal_validation),
+            (IDENTITY_VALIDATION, 'POST', r'/identity-validations/?$',
+             self.validate_identity),
+            (IDENTITY_VALIDATION, 'GET',
+             r'/identity-validations/(?P<user_id>[^/]+)$',
+             self.get_identity),
+            (IDENTITY_VALIDATION, 'PATCH',
+             r'/identity-validations/(?P<user_id>[^/]+)$',
+             self.confirm_identity),
+            (MERLIN, 'GET', r'/address/user/(?P<user_id>[^/]+)$',
+             self.list_addresses),
+        ]
+        self.routes = [
+            (service, method, re.compile(pattern), view)
+            for service, method, pattern, view in self.routes
+        ]
+
+    def handle(self, method: str, path: str, body: Dict) -> Response:
+        """Answer a request after the delay and failures of its api."""
+        for service, route_method, pattern, view in self.routes:
+            match = pattern.search(path.split('?')[0])
+            if route_method != method or match is None:
+                continue
+
+            profile = self.profiles[service]
+            sleep(profile.latency.sample())
+            if random.random() < profile.error_rate:
+                return HTTPStatus.SERVICE_UNAVAILABLE, {
+                    'error': {
+                        'code': 'NB-ERROR-00400',
+                        'message': f'{service} stub failure'
+                    }
+                }
+
+            return view(body=body, **match.groupdict())
+
+        return HTTPStatus.NOT_FOUND, {
+            'error': {'code': 'NB-ERROR-00401', 'message': 'Entity Not Found'}
+        }
+
+    def list_customers(self, body: Dict) -> Response:
+        """List no customer, so that identity confirmations create one."""
+        return HTTPStatus.OK, self.customer_mock.EMPTY_FILTER_RESPONSE
+
+    def create_customer(self, body: Dict) -> Response:
+        """Pretend the customer creation."""
+        return HTTPStatus.CREATED, {
+            **self.customer_mock.SUCCESSFUL_POST_RESPONSE,
+            'data': {'id': str(uuid4())},
+        }
+
+    def get_customer(self, customer_id: str, body: Dict) -> Response:
+        """Return the fixture customer under the requested id."""
+        customer = dict(self.customer_mock.SUCCESSFUL_FILTER_RESPONSE['data'][0])
+        customer['id'] = customer_id
+        return HTTPStatus.OK, {'data': customer, 'hyper': {}}
+
+    def update_legal_validation(self, customer_id: str, body: Dict) -> Response:
+        """Accept every legal validation."""
+        return HTTPStatus.OK, {'data': {'id': customer_id}, 'hyper': {}}
+
+    def validate_identity(self, body: Dict) -> Response:
+        """Accept the validation, whose result is not yet available."""
+        return HTTPStatus.PARTIAL_CONTENT, {}
+
+    def __identity_mock(
+        self,
+        user_id: str
+    ) -> BaseTestCase.IdentityValidationMock:
+        return BaseTestCase.IdentityValidationMock(
+            UUID(user_id), identity_factory_mock()
+        )
+
+    def get_identity(self, user_id: str, body: Dict) -> Response:
+        """Return the fixture identity of the user."""
+        return HTTPStatus.OK, self.__identity_mock(user_id).SUCCESSFUL_GET_RESPONSE
+
+    def confirm_identity(self, user_id: str, body: Dict) -> Response:
+        """Confirm every identity."""
+        return (
+            HTTPStatus.OK,
+            self.__identity_mock(user_id).SUCCESSFUL_PATCH_RESPONSE
+        )
+
+    def list_addresses(self, user_id: str, body: Dict) -> Response:
+        """Return the fixture addresses, the first one with a stable id."""
+        addresses = BaseTestCase.MerlinMock(
+            UUID(user_id), stub_address_id(user_id)
+        ).SUCCESSFUL_GET_RESPONSE
+        return HTTPStatus.OK, addresses
+
+
+class StubServer:
+    """Serve the stubbed apis from a background thread."""
+
+    def __init__(self, apis: StubApis, host: str = '127.0.0.1', port: int = 0):
+        """Bind the server, port 0 picks a free one."""
+        self.apis = apis
+        self.server = ThreadingHTTPServer((host, port), self.__handler_class())
+        self.server.daemon_threads = True
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Return the base url the apis are served on."""
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def __handler_class(self) -> type:
+        apis = self.apis
+
+        class StubRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def __respond(self) -> None:
+                length = int(self.headers.get('Content-Length') or 0)
+                raw_body = self.rfile.read(length) if length else b''
+                body = json.loads(raw_body) if raw_body else {}
+
+                status, content = apis.handle(self.command, self.path, body)
+
+                payload = json.dumps(content).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PATCH = __respond
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        return StubRequestHandler
+
+    def start(self) -> 'StubServer':
+        """Start serving in the background."""
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,28 @@
+from .events import MemoryBroker, MemoryEventManager
+from .repositories import (
+    AddressMemoryRepository,
+    ContactMethodMemoryRepository,
+    ContactMethodTypeMemoryRepository,
+    CustomerMemoryRepository,
+    IdempotencyKeyMemoryRepository,
+    IdentityValidationMemoryRepository,
+    MemoryStore,
+    ServiceAgreementMemoryRepository,
+    SignUpMemoryRepository,
+    UserMemoryRepository,
+)
+
+__all__ = [
+    AddressMemoryRepository,
+    ContactMethodMemoryRepository,
+    ContactMethodTypeMemoryRepository,
+    CustomerMemoryRepository,
+    IdempotencyKeyMemoryRepository,
+    IdentityValidationMemoryRepository,
+    MemoryBroker,
+    MemoryEventManager,
+    MemoryStore,
+    ServiceAgreementMemoryRepository,
+    SignUpMemoryRepository,
+    UserMemoryRepository,
+]
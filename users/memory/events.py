@@ -0,0 +1,130 @@
+"""Declare an in-memory stand-in of the broker event emission."""
+from dataclasses import dataclass
+import json
+from random import Random
+from threading import Lock
+import time
+from typing import Callable, Dict, List, Optional, Text
+from uuid import UUID
+
+from nwevents import Event
+
+
+@dataclass
+class EmittedEvent:
+    """Represent an event as it would have been published to the broker."""
+
+    ccid: UUID
+    source: Text
+    name: Text
+    payload: Dict
+
+
+class MemoryEventManager:
+    """Record emitted events instead of publishing them to the broker.
+
+    Honors the ``emit`` contract of ``nwevents.EventManager`` so it can
+    override the ``event_manager`` provider of the container.
+    """
+
+    def __init__(self):
+        """Initialize an empty record of emitted events."""
+        self.events: List[EmittedEvent] = []
+
+    def emit(self, event: Event) -> None:
+        """Record the event with its payload resolved at emission time."""
+        self.events.append(EmittedEvent(
+            ccid=event.ccid,
+            source=event.source,
+            name=event.name,
+            payload=event.payload
+        ))
+
+    def last(
+        self,
+        source: Text,
+        name: Text,
+        **payload: object
+    ) -> Optional[EmittedEvent]:
+        """Return the latest recorded event for the exchange and name.
+
+        Keyword arguments narrow the search to events whose payload holds
+        the same values.
+        """
+        for event in reversed(self.events):
+            if event.source != source or event.name != name:
+                continue
+            if all(event.payload.get(k) == v for k, v in payload.items()):
+                return event
+
+        return None
+
+    def clear(self) -> None:
+        """Forget every recorded event."""
+        self.events.clear()
+
+
+@dataclass
+class PublishedMessage:
+    """Represent a message as the broker would have received it."""
+
+    exchange: Text
+    routing_key: Text
+    body: bytes
+
+
+def message_body(event: Event) -> bytes:
+    """Serialize the event as the JSON body of its message."""
+    return json.dumps(
+        {'ccid': event.ccid, 'payload': event.payload},
+        default=str
+    ).encode()
+
+
+class MemoryBroker:
+    """Publish the events as messages kept in memory instead of the broker.
+
+    Honors the ``emit`` contract of ``nwevents.EventManager`` so it can
+    override the ``broker_event_manager`` provider of the container, behind
+    the ``EventPublisher``. Each event is serialized once, as its message, and
+    publishing can be delayed ``latency`` seconds or fail with a
+    ``ConnectionError`` at ``failure_rate``, to benchmark and tune the
+    emission of events without a broker.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """Initialize an empty record of published messages."""
+        self.messages: List[PublishedMessage] = []
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failures = 0
+        self.__random = Random(seed)
+        self.__sleep = sleep
+        self.__lock = Lock()
+
+    def emit(self, event: Event) -> None:
+        """Publish the message of the event, unless a failure is simulated."""
+        if self.latency:
+            self.__sleep(self.latency)
+        message = PublishedMessage(
+            exchange=event.source,
+            routing_key=event.name,
+            body=message_body(event)
+        )
+        with self.__lock:
+            if self.failure_rate and self.__random.random() < self.failure_rate:
+                self.failures += 1
+                raise ConnectionError('simulated broker failure')
+            self.messages.append(message)
+
+    def clear(self) -> None:
+        """Forget every published message and failure."""
+        with self.__lock:
+            self.messages.clear()
+            self.failures = 0
@@ -0,0 +1,562 @@
+"""Declare in-memory implementations of the core repositories.
+
+They keep the same contracts as the database and http repositories but hold
+the state in plain python collections, so the handlers can be exercised
+without PostgreSQL or the external services.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Collection, Dict, List, Optional, Tuple, Union
+from uuid import UUID, uuid4
+
+from users.core.actions import (
+    RequestUserIdentityValidation,
+    UpdateLegalValidation,
+)
+from users.core.exceptions import (
+    EntityNotFound,
+    IdempotencyKeyInUseError,
+    IdempotencyKeyReusedError,
+    MissingAddressError,
+)
+from users.core.models import (
+    Address,
+    ContactMethod,
+    ContactMethodType,
+    Customer,
+    Identity,
+    ServiceAgreement,
+    SignUp,
+    SignUpAttempt,
+    StoredResponse,
+    User,
+)
+from users.core.models.states import (
+    BusinessModel,
+    ConfirmationOutcome,
+    SignUpOutcome,
+    SignUpStage,
+    UserStatus,
+)
+from users.core.repositories import (
+    AddressRepository,
+    ContactMethodRepository,
+    ContactMethodTypeRepository,
+    CustomerRepository,
+    IdempotencyKeyRepository,
+    IdentityValidationRepository,
+    ServiceAgreementRepository,
+    SignUpRepository,
+    UserRepository,
+)
+
+
+@dataclass
+class MemoryStore:
+    """Shared state of the in-memory repositories.
+
+    Seeded with the same reference data that the migrations insert. Sign
+    ups are keyed by their user id, which is unique as in the sign_ups table.
+    """
+
+    users: Dict[UUID, User] = field(default_factory=dict)
+    sign_ups: Dict[UUID, SignUp] = field(default_factory=dict)
+    contact_methods: Dict[UUID, ContactMethod] = field(default_factory=dict)
+    idempotency_keys: Dict[str, Tuple[str, Optional[StoredResponse], datetime]] = field(
+        default_factory=dict
+    )
+    sign_up_lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+    contact_method_types: Dict[str, ContactMethodType] = field(
+        default_factory=lambda: {
+            description: ContactMethodType(description=description)
+            for description in ('EMAIL', 'PHONE', 'ADDRESS')
+        }
+    )
+    service_agreements: Dict[int, ServiceAgreement] = field(
+        default_factory=lambda: {
+            0: ServiceAgreement(id=0, business_model=BusinessModel.NUBI),
+            1: ServiceAgreement(id=1, business_model=BusinessModel.NUBIZ),
+        }
+    )
+
+    def clear(self) -> None:
+        """Drop every stored entity except the reference data."""
+        self.users.clear()
+        self.sign_ups.clear()
+        self.contact_methods.clear()
+        self.idempotency_keys.clear()
+
+
+class MemoryRepository:
+    """Superclass of all *MemoryRepository objects."""
+
+    def __init__(self, store: MemoryStore):
+        """Initialize the shared store for the subclasses."""
+        self.store = store
+
+
+class UserMemoryRepository(MemoryRepository, UserRepository):
+    """Access to elements of the User collection."""
+
+    def save(self, user: User) -> None:
+        """Persist a User object and index its contact methods."""
+        self.store.users[user.id] = user
+        for contact_method in user.contact_methods:
+            contact_method.user_id = user.id
+            self.store.contact_methods[contact_method.id] = contact_method
+
+    def get_by_id(self, user_id: UUID, include_archived: bool = False) -> User:
+        """Retrieve a User object by user id, none is archived in memory."""
+        user = self.store.users.get(user_id)
+
+        if user is None:
+            raise EntityNotFound(User)
+
+        return user
+
+    def get_with_sign_up(
+        self,
+        user_id: UUID,
+        include_archived: bool = False
+    ) -> Tuple[User, SignUp]:
+        """Retrieve a User object and its SignUp."""
+        user = self.get_by_id(user_id)
+        sign_up = self.store.sign_ups.get(user_id)
+
+        if sign_up is None:
+            raise EntityNotFound(SignUp)
+
+        return user, sign_up
+
+    def get_by_customer_and_business_model(
+        self,
+        customer_id: UUID,
+        business_model: BusinessModel,
+        include_archived: bool = False
+    ) -> Optional[User]:
+        """Get a user by its business model."""
+        service_agr_ids = [
+            service_agreement.id
+            for service_agreement in self.store.service_agreements.values()
+            if service_agreement.business_model == business_model
+        ]
+        return next((
+            user for user in self.store.users.values()
+            if user.customer_id == customer_id
+            if user.service_agr_id in service_agr_ids
+        ), None)
+
+    def get_by_customer_and_service_agr_id(
+        self,
+        customer_id: UUID,
+        service_agr_id: int,
+        include_archived: bool = False
+    ) -> Optional[User]:
+        """Retrieve a User object by service agreement id."""
+        return next((
+            user for user in self.store.users.values()
+            if user.customer_id == customer_id
+            if user.service_agr_id == service_agr_id
+        ), None)
+
+    def get_by_service_agr_id_and_email(
+        self,
+        service_agr_id: int,
+        email: str,
+        include_archived: bool = False
+    ) -> Optional[User]:
+        """Get a user or none by its svc agreement id and email."""
+        return next((
+            user for user in self.store.users.values()
+            if user.service_agr_id == service_agr_id
+            if any(
+                contact_method.value == email
+                for contact_method in user.contact_methods
+                if contact_method.type.description == 'EMAIL'
+            )
+        ), None)
+
+    def set_status(
+        self,
+        user_id: UUID,
+        expected: UserStatus,
+        new: UserStatus
+    ) -> bool:
+        """Change the status of the user if it is the expected one."""
+        user = self.store.users.get(user_id)
+        if user is None or user.status != expected:
+            return False
+
+        user.status = new
+        return True
+
+
+class ContactMethodTypeMemoryRepository(
+        MemoryRepository,
+        ContactMethodTypeRepository
+):
+    """Access to elements of the ContactMethodType collection."""
+
+    def get(self, description: str) -> ContactMethodType:
+        """Retrieve a contact method type by its description."""
+        return self.store.contact_method_types.get(description)
+
+
+class SignUpMemoryRepository(MemoryRepository, SignUpRepository):
+    """Access to elements of the SignUp collection."""
+
+    def get(self, sign_up_id: UUID, include_archived: bool = False) -> SignUp:
+        """Get a sign up object by its primary key."""
+        sign_up = next((
+            sign_up for sign_up in self.store.sign_ups.values()
+            if sign_up.id == sign_up_id
+        ), None)
+
+        if sign_up is None:
+            raise EntityNotFound(SignUp)
+
+        return sign_up
+
+    def get_by_user_id(self, user_id: UUID, include_archived: bool = False) -> SignUp:
+        """Get a sign up object by its user id."""
+        sign_up = self.store.sign_ups.get(user_id)
+
+        if sign_up is None:
+            raise EntityNotFound(SignUp)
+
+        return sign_up
+
+    def save(self, sign_up: SignUp) -> None:
+        """Persist a SignUp object, unique by its user id."""
+        self.store.sign_ups[sign_up.user_id] = sign_up
+
+    def transition_stage(
+        self,
+        user_id: UUID,
+        from_stage: Union[SignUpStage, Collection[SignUpStage]],
+        to_stage: SignUpStage
+    ) -> bool:
+        """Move the sign up of the user to a stage if it is in the from one."""
+        from_stages = (from_stage,) if isinstance(from_stage, SignUpStage) \
+            else from_stage
+        sign_up = self.store.sign_ups.get(user_id)
+        if sign_up is None or sign_up.stage not in from_stages:
+            return False
+
+        sign_up.stage = to_stage
+        return True
+
+    def confirm_contact_method(
+        self,
+        user_id: UUID,
+        contact_method_id: UUID,
+        confirmation_value: str,
+        confirmed_at: datetime,
+        from_stage: Union[SignUpStage, Collection[SignUpStage]],
+        to_stage: SignUpStage
+    ) -> ConfirmationOutcome:
+        """Confirm the contact method and move the sign up if both can change."""
+        from_stages = (from_stage,) if isinstance(from_stage, SignUpStage) \
+            else from_stage
+        with self.store.sign_up_lock:
+            contact_method = self.store.contact_methods.get(contact_method_id)
+            confirmation = contact_method.contact_confirmation \
+                if contact_method is not None and contact_method.user_id == user_id \
+                else None
+            if confirmation is None or confirmation.value != confirmation_value or \
+                    confirmation.confirmed_at is not None or \
+                    confirmation.expire_at < confirmed_at:
+                return ConfirmationOutcome.INVALID_CONFIRMATION
+
+            sign_up = self.store.sign_ups.get(user_id)
+            if sign_up is None or sign_up.stage not in from_stages:
+                return ConfirmationOutcome.STAGE_CHANGED
+
+            contact_method.contact_confirmation = confirmation.recreate(
+                confirmed_at=confirmed_at
+            )
+            sign_up.stage = to_stage
+        return ConfirmationOutcome.CONFIRMED
+
+    def create_or_renew(
+        self,
+        sign_up: SignUp,
+        user: User,
+        contact_method: ContactMethod
+    ) -> SignUpAttempt:
+        """Create the sign up of the email, or renew its expired confirmation."""
+        users = UserMemoryRepository(self.store)
+        with self.store.sign_up_lock:
+            registered_user = users.get_by_service_agr_id_and_email(
+                user.service_agr_id, contact_method.value
+            )
+            if registered_user is None:
+                users.save(user)
+                self.save(sign_up)
+                return SignUpAttempt(
+                    SignUpOutcome.CREATED, user, contact_method, sign_up
+                )
+
+            registered_contact_method = next(
+                cm for cm in registered_user.contact_methods_of('EMAIL')
+                if cm.value == contact_method.value
+            )
+            confirmation = registered_contact_method.contact_confirmation
+            if not confirmation.is_expired:
+                return SignUpAttempt(
+                    SignUpOutcome.STILL_PENDING
+                    if confirmation.is_still_pending
+                    else SignUpOutcome.ALREADY_CONFIRMED,
+                    registered_user,
+                    registered_contact_method
+                )
+
+            registered_contact_method.contact_confirmation = confirmation.recreate(
+                expire_at=contact_method.contact_confirmation.expire_at
+            )
+            return SignUpAttempt(
+                SignUpOutcome.RENEWED,
+                registered_user,
+                registered_contact_method,
+                self.get_by_user_id(registered_user.id)
+            )
+
+    def create_many(
+        self,
+        sign_ups: Collection[Tuple[SignUp, User, ContactMethod]]
+    ) -> List[SignUpAttempt]:
+        """Create the sign ups of the emails no user holds, at once."""
+        users = UserMemoryRepository(self.store)
+        created = []
+        with self.store.sign_up_lock:
+            for sign_up, user, contact_method in sign_ups:
+                if users.get_by_service_agr_id_and_email(
+                    user.service_agr_id, contact_method.value
+                ) is None:
+                    users.save(user)
+                    self.save(sign_up)
+                    created.append(SignUpAttempt(
+                        SignUpOutcome.CREATED, user, contact_method, sign_up
+                    ))
+
+        return created
+
+
+class ContactMethodMemoryRepository(
+        MemoryRepository,
+        ContactMethodRepository
+):
+    """Access to elements of the ContactMethod collection."""
+
+    def get(self, contact_method_id: UUID) -> ContactMethod:
+        """Retrieve a contact method object by its ID."""
+        contact_method = self.store.contact_methods.get(contact_method_id)
+
+        if contact_method is None:
+            raise EntityNotFound(ContactMethod)
+
+        return contact_method
+
+    def save(self, contact_method: ContactMethod) -> None:
+        """Persist a ContactMethod object."""
+        self.store.contact_methods[contact_method.id] = contact_method
+
+        user = self.store.users.get(contact_method.user_id)
+        if user is not None and contact_method not in user.contact_methods:
+            user.contact_methods.append(contact_method)
+
+    def get_by_type_and_value(
+        self,
+        type_: str,
+        value: str,
+        user_id: UUID
+    ) -> Optional[ContactMethod]:
+        """Get a contact method or none by its value, type and user_id."""
+        return next((
+            contact_method
+            for contact_method in self.store.contact_methods.values()
+            if contact_method.type.description == type_
+            if contact_method.value == value
+            if contact_method.user_id == user_id
+        ), None)
+
+    def get_by_token(self, token: str) -> Optional[ContactMethod]:
+        """Get the contact method or none by its validation token value."""
+        return next((
+            contact_method
+            for contact_method in self.store.contact_methods.values()
+            if contact_method.contact_confirmation.value == token
+        ), None)
+
+
+class ServiceAgreementMemoryRepository(
+    MemoryRepository,
+    ServiceAgreementRepository
+):
+    """Access to elements of the service_agreement collection."""
+
+    def save(self, service_agreement: ServiceAgreement) -> None:
+        """Insert a service agreement in the store."""
+        self.store.service_agreements[service_agreement.id] = service_agreement
+
+    def get(self, service_agreement_id: int) -> ServiceAgreement:
+        """Retrieve a service agreement object by its ID."""
+        service_agreement = self.store.service_agreements.get(
+            service_agreement_id
+        )
+
+        if service_agreement is None:
+            raise EntityNotFound(ServiceAgreement)
+
+        return service_agreement
+
+
+class CustomerMemoryRepository(CustomerRepository):
+    """Stand-in for the external Customer collection."""
+
+    def __init__(self, customers: Optional[List[Customer]] = None):
+        """Initialize the repository with the known customers."""
+        self.customers: Dict[UUID, Customer] = {
+            customer.id: customer for customer in customers or []
+        }
+        self.legal_validations: List[UpdateLegalValidation] = []
+
+    def __list_by_identification(
+        self,
+        type_: str,
+        value: str
+    ) -> List[Customer]:
+        return [
+            customer for customer in self.customers.values()
+            if customer.identifications.get(type_, {}).get('value') == value
+        ]
+
+    def get_by_id(self, customer_id: UUID) -> Customer:
+        """Get a customer by its id value."""
+        customer = self.customers.get(customer_id)
+
+        if customer is None:
+            raise EntityNotFound(Customer)
+
+        return customer
+
+    def list_by_dni(self, dni: str) -> List[Customer]:
+        """List customers by their dni."""
+        return self.__list_by_identification('DNI', dni)
+
+    def list_by_cuil(self, cuil: str) -> List[Customer]:
+        """List customers by their cuil."""
+        return self.__list_by_identification('CUIL', cuil)
+
+    def update_legal_validation(self, action: UpdateLegalValidation) -> None:
+        """Record the legal validation update."""
+        self.legal_validations.append(action)
+
+    def create(self, from_identity: Identity) -> UUID:
+        """Pretend the customer creation and return a new ID."""
+        return uuid4()
+
+    def add(self, customer: Customer) -> None:
+        """Make a customer available to the lookups."""
+        self.customers[customer.id] = customer
+
+
+class IdentityValidationMemoryRepository(IdentityValidationRepository):
+    """Stand-in for the identity-validation-svc operations."""
+
+    def __init__(self, identity: Identity):
+        """Initialize the repository with the identity every user resolves to."""
+        self.identity = identity
+
+    def validate_identity(
+        self,
+        data: RequestUserIdentityValidation
+    ) -> Optional[UUID]:
+        """Accept every identity validation request."""
+        return data.user_id
+
+    def get_identity_by_user_id(
+        self,
+        user_id: UUID
+    ) -> Optional[Identity]:
+        """Get an identity by its user ID."""
+        return self.identity
+
+    def confirm_identity(self, user_id: UUID) -> UUID:
+        """Confirm user's identity."""
+        return user_id
+
+
+class IdempotencyKeyMemoryRepository(MemoryRepository, IdempotencyKeyRepository):
+    """Access to the responses stored under the idempotency keys.
+
+    Keys are stored as (fingerprint, response, expire_at), the response is
+    None while the claiming request runs.
+    """
+
+    def __init__(self, store: MemoryStore):
+        """Initialize the lock serializing the claims of the keys."""
+        super().__init__(store)
+        self.lock = Lock()
+
+    def claim(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """Claim the key, or return the response stored under it."""
+        now = datetime.utcnow()
+        with self.lock:
+            stored = self.store.idempotency_keys.get(key)
+            if stored is None or stored[2] < now:
+                self.store.idempotency_keys[key] = (
+                    fingerprint, None, now + timedelta(seconds=self.LOCK_SECONDS)
+                )
+                return None
+
+        stored_fingerprint, response, _ = stored
+        if stored_fingerprint != fingerprint:
+            raise IdempotencyKeyReusedError()
+        if response is None:
+            raise IdempotencyKeyInUseError()
+
+        return response
+
+    def complete(self, key: str, fingerprint: str, response: StoredResponse) -> None:
+        """Store the response under the key claimed by the request."""
+        with self.lock:
+            stored = self.store.idempotency_keys.get(key)
+            if stored is not None and stored[0] == fingerprint:
+                self.store.idempotency_keys[key] = (
+                    fingerprint,
+                    response,
+                    datetime.utcnow() + timedelta(seconds=self.TTL_SECONDS)
+                )
+
+    def release(self, key: str, fingerprint: str) -> None:
+        """Delete the claim of the request on the key."""
+        with self.lock:
+            stored = self.store.idempotency_keys.get(key)
+            if stored is not None and stored[:2] == (fingerprint, None):
+                del self.store.idempotency_keys[key]
+
+
+class AddressMemoryRepository(AddressRepository):
+    """Stand-in for the merlin-api address operations."""
+
+    def __init__(self, addresses: Optional[List[Address]] = None):
+        """Initialize the repository with the known addresses."""
+        self.addresses: List[Address] = list(addresses or [])
+
+    def add(self, address: Address) -> None:
+        """Make an address available to the lookups."""
+        self.addresses.append(address)
+
+    def list(self, user_id: UUID) -> List[Address]:
+        """Retrieve a list of user's addresses."""
+        addresses = [
+            address for address in self.addresses
+            if address.user_id == user_id
+        ]
+
+        if not addresses:
+            raise MissingAddressError()
+
+        return addresses
@@ -1,7 +1,52 @@
+from typing import Dict, List, Optional
+
 from nwodm.schemas import BaseAnnotationSchema
 
+HYPERMEDIA_OPTIONS = ('url_resolver', 'view_to_resolve', 'api_version', 'http_methods')
+
 
 class UserAnnotationSchema(BaseAnnotationSchema):
     """Override base schema with microservice's validation error code."""
 
     validation_error_code: str = 'NB-ERROR-00402'
+
+    def __init__(self, *args: object, **kwargs: object):
+        """Keep the hypermedia options to resolve the url at dump time."""
+        super().__init__(*args, **kwargs)
+        self.hypermedia_options = {
+            option: kwargs.get(option) for option in HYPERMEDIA_OPTIONS
+        }
+
+    def hypermedia_url(self, view_kwargs: Optional[Dict] = None) -> str:
+        """Resolve the url of the configured view with the given arguments."""
+        url_resolver = self.hypermedia_options['url_resolver']
+        if url_resolver is None:
+            return ''
+
+        url = str(url_resolver(
+            self.hypermedia_options['view_to_resolve'],
+            **(view_kwargs or {})
+        ))
+        api_version = self.hypermedia_options['api_version']
+        return f'/v{api_version}{url}' if api_version else url
+
+    def dump_with_hypermedia(
+        self,
+        obj: object,
+        view_kwargs: Optional[Dict] = None,
+        many: Optional[bool] = None
+    ) -> Dict:
+        """Dump the object along its hypermedia, as ``data_with_hypermedia``.
+
+        Unlike ``data_with_hypermedia``, the result does not depend on state
+        left on the schema, so a single instance can serve every request.
+        """
+        return {
+            'data': self.dump(obj, many=many).data,
+            'hyper': self.hypermedia(view_kwargs),
+        }
+
+    def hypermedia(self, view_kwargs: Optional[Dict] = None) -> Dict[str, List[str]]:
+        """Return the configured view url and its http methods."""
+        http_methods = self.hypermedia_options['http_methods'] or []
+        return {self.hypermedia_url(view_kwargs): list(http_methods)}
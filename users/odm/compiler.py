@@ -0,0 +1,312 @@
+"""Compile schema dumps into plain Python functions.
+
+Marshmallow serializes every field through ``Marshaller.call_and_store``,
+``Field.serialize`` and ``Field.get_value``, which costs several calls per
+field and object. ``CompiledSchema`` generates, for each type of object it
+dumps, a function reading the attributes directly and formatting the values
+of the standard fields inline. Other fields keep their own ``_serialize``,
+and the pre and post dump processors of the schema run as usual.
+
+The compiled dump returns what ``Schema.dump`` returns, the validation
+errors of the fields are stored as ``Marshaller.call_and_store`` does. Schemas
+the compiler does not support, found when they are wrapped, dump with the
+schema's own dump; any other error is logged and raised. Loads are always
+delegated to the schema.
+"""
+from itertools import count
+import logging
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+from uuid import UUID
+
+from marshmallow import fields, MarshalResult, missing, Schema, ValidationError
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from marshmallow.marshalling import FIELD
+from marshmallow.utils import ensure_text_type, is_collection, is_iterable_but_not_string
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledSchema:
+    """Dump with functions generated for the fields of a schema instance."""
+
+    def __init__(self, schema: Schema):
+        """Wrap the schema, compiling on the first dump of each type."""
+        self.schema = schema
+        self.supported = _is_supported(schema)
+        self._dumpers: Dict[type, Callable] = {}
+        self._lock = Lock()
+
+    def load(self, *args: object, **kwargs: object) -> MarshalResult:
+        """Load with the schema."""
+        return self.schema.load(*args, **kwargs)
+
+    def dump(self, obj: object, many: Optional[bool] = None) -> MarshalResult:
+        """Dump as ``Schema.dump`` does, with the compiled functions."""
+        many = self.schema.many if many is None else bool(many)
+        if not self.supported or (many and obj is None):
+            return self.schema.dump(obj, many=many)
+
+        try:
+            return MarshalResult(self.marshal(obj, many), {})
+        except ValidationError as error:
+            return self.report(obj, error)
+        except Exception:
+            logger.exception('Compiled dump of %s failed', type(self.schema).__name__)
+            raise
+
+    def report(self, obj: object, error: ValidationError) -> MarshalResult:
+        """Report the errors of a dump as ``Schema.dump`` does."""
+        schema = self.schema
+        errors = error.messages
+        if schema.__error_handler__ and callable(schema.__error_handler__):
+            schema.__error_handler__(errors, obj)
+        exc = ValidationError(errors, data=obj)
+        schema.handle_error(exc, obj)
+        if schema.strict:
+            raise exc
+        return MarshalResult(error.data, errors)
+
+    def dump_with_hypermedia(
+        self,
+        obj: object,
+        view_kwargs: Optional[Dict] = None,
+        many: Optional[bool] = None
+    ) -> Dict:
+        """Dump the object along the hypermedia of the schema."""
+        return {
+            'data': self.dump(obj, many=many).data,
+            'hyper': self.schema.hypermedia(view_kwargs),
+        }
+
+    def marshal(self, obj: object, many: bool) -> object:
+        """Return the dumped data.
+
+        Raises a ``ValidationError`` holding the errors of the dump and the
+        data ``Schema.dump`` returns along them.
+        """
+        schema = self.schema
+        if many and is_iterable_but_not_string(obj):
+            obj = list(obj)
+
+        processed = obj
+        if schema._has_processors:
+            try:
+                processed = schema._invoke_dump_processors(
+                    PRE_DUMP, obj, many, original_data=obj
+                )
+            except ValidationError as error:
+                raise ValidationError(error.normalized_messages())
+
+        errors: Dict = {}
+        if many:
+            result = []
+            for index, each in enumerate(processed):
+                each_errors = {} if schema.opts.index_errors else errors
+                result.append(self.dumper(type(each))(each, each_errors))
+                if each_errors and each_errors is not errors:
+                    errors[index] = each_errors
+        else:
+            result = self.dumper(type(processed))(processed, errors)
+        result = schema._postprocess(result, many, obj=obj)
+        if errors:
+            raise ValidationError(errors, data=result)
+
+        if schema._has_processors:
+            try:
+                result = schema._invoke_dump_processors(
+                    POST_DUMP, result, many, original_data=obj
+                )
+            except ValidationError as error:
+                raise ValidationError(error.normalized_messages(), data=result)
+        return result
+
+    def dumper(self, obj_type: type) -> Callable:
+        """Return the dump function of a single object of the type."""
+        dumper = self._dumpers.get(obj_type)
+        if dumper is None:
+            with self._lock:
+                dumper = self._dumpers.get(obj_type)
+                if dumper is None:
+                    dumper = self._dumpers[obj_type] = compile_dumper(
+                        self.schema, obj_type
+                    )
+        return dumper
+
+
+class NestedDumper:
+    """Serialize a nested field value as ``fields.Nested`` does."""
+
+    def __init__(self, field: fields.Nested):
+        """Compile the schema of the nested field lazily."""
+        self.field = field
+        self.compiled: Optional[CompiledSchema] = None
+
+    def __call__(self, value: object) -> object:
+        """Return the nested value dumped by the compiled schema."""
+        if self.compiled is None:
+            self.compiled = CompiledSchema(self.field.schema)
+        if value is None:
+            return None
+
+        compiled = self.compiled
+        return compiled.marshal(value, compiled.schema.many or self.field.many)
+
+
+def _store(errors: Dict, key: str, error: ValidationError) -> object:
+    """Store the messages of the field error as ``call_and_store`` does."""
+    if isinstance(error.messages, dict):
+        errors[key] = error.messages
+    elif isinstance(errors.get(key), dict):
+        errors[key].setdefault(FIELD, []).extend(error.messages)
+    else:
+        errors.setdefault(key, []).extend(error.messages)
+    return error.data or missing
+
+
+def _is_supported(schema: Schema) -> bool:
+    only = schema.only
+    if only is not None and not set(only).issubset(schema.declared_fields):
+        return False
+    return not schema.prefix
+
+
+def _overrides(field: fields.Field, name: str) -> bool:
+    return getattr(type(field), name) is not getattr(fields.Field, name)
+
+
+def _accessor_is_default(schema: Schema) -> bool:
+    return type(schema).get_attribute is Schema.get_attribute
+
+
+class _Generator:
+    """Write the source of a dump function and its namespace."""
+
+    def __init__(self, schema: Schema, obj_type: type):
+        self.schema = schema
+        self.inline_getattr = (
+            _accessor_is_default(schema) and not hasattr(obj_type, '__getitem__')
+        )
+        self.namespace: Dict[str, object] = {
+            'MISSING': missing,
+            'UUID': UUID,
+            'ValidationError': ValidationError,
+            'store': _store,
+            'dict_class': schema.dict_class,
+            'accessor': schema.get_attribute,
+            'is_collection': is_collection,
+            'text': ensure_text_type,
+        }
+        self.names = count()
+        self.lines: List[str] = []
+
+    def name(self, value: object, prefix: str) -> str:
+        name = f'{prefix}{next(self.names)}'
+        self.namespace[name] = value
+        return name
+
+    def value(self, field: fields.Field, var: str, attr: str, depth: int = 0) -> str:
+        """Return the expression of ``field._serialize(var, attr, obj)``."""
+        field_type = type(field)
+        if field_type in (fields.Field, fields.Raw):
+            return var
+        if field_type is fields.String:
+            return f'(None if {var} is None else {var} if {var}.__class__ is str ' \
+                   f'else text({var}))'
+        if field_type is fields.UUID:
+            return f'(None if {var} is None else str({var}) if {var}.__class__ is UUID ' \
+                   f'else {self.name(field, "f")}._serialize({var}, {attr!r}, obj))'
+        if field_type is fields.Integer and not field.as_string:
+            return f'(None if {var} is None else {var} if {var}.__class__ is int ' \
+                   f'else {self.name(field, "f")}._serialize({var}, {attr!r}, obj))'
+        if field_type is fields.Boolean:
+            return f'(None if {var} is None else {var} if {var}.__class__ is bool ' \
+                   f'else {self.name(field, "f")}._serialize({var}, {attr!r}, obj))'
+        if field_type is fields.Nested and not isinstance(field.only, str) and \
+                _is_supported(field.schema):
+            return f'{self.name(NestedDumper(field), "n")}({var})'
+        if field_type is fields.List:
+            item = f'e{depth}'
+            item_value = self.value(field.container, item, attr, depth + 1)
+            return f'(None if {var} is None else ' \
+                   f'[{item_value} for {item} in {var}] if is_collection({var}) ' \
+                   f'else [{self.value(field.container, var, attr, depth + 1)}])'
+        return f'{self.name(field, "f")}._serialize({var}, {attr!r}, obj)'
+
+    def field(self, attr: str, field: fields.Field) -> None:
+        """Write the lines storing the serialized field into ``result``."""
+        key = field.dump_to or attr
+        if not field._CHECK_ATTRIBUTE or _overrides(field, 'serialize') or (
+            _overrides(field, 'get_value') and not (
+                type(field) is fields.List and not field.container.attribute
+            )
+        ):
+            self.lines += [
+                f'    v = {self.name(field, "f")}.serialize({attr!r}, obj, '
+                'accessor=accessor)',
+                '    if v is not MISSING:',
+                f'        result[{key!r}] = v',
+            ]
+            return
+
+        source = attr if field.attribute is None else field.attribute
+        if self.inline_getattr and '.' not in source:
+            self.lines += [
+                f'    v = getattr(obj, {source!r}, MISSING)',
+                '    if v is not MISSING and callable(v):',
+                '        v = v()',
+            ]
+        else:
+            self.lines.append(f'    v = accessor({source!r}, obj, MISSING)')
+
+        value = self.value(field, 'v', attr)
+        if field.default is missing:
+            self.lines += [
+                '    if v is not MISSING:',
+                f'        result[{key!r}] = {value}',
+            ]
+            return
+
+        default = self.name(field.default, 'd')
+        if callable(field.default):
+            default = f'{default}()'
+        self.lines += [
+            '    if v is MISSING:',
+            f'        v = {default}',
+            '        if v is not MISSING:',
+            f'            result[{key!r}] = v',
+            '    else:',
+            f'        result[{key!r}] = {value}',
+        ]
+
+    def source(self) -> str:
+        self.lines = ['def dump(obj, errors):', '    result = dict_class()']
+        for attr, field in self.schema.fields.items():
+            if not getattr(field, 'load_only', False):
+                start = len(self.lines)
+                self.field(attr, field)
+                key = field.dump_to or attr
+                self.lines[start:] = [
+                    '    try:',
+                    *(f'    {line}' for line in self.lines[start:]),
+                    '    except ValidationError as error:',
+                    f'        v = store(errors, {key!r}, error)',
+                    '        if v is not MISSING:',
+                    f'            result[{key!r}] = v',
+                ]
+        self.lines.append('    return result')
+        return '\n'.join(self.lines)
+
+
+def compile_dumper(schema: Schema, obj_type: type) -> Callable:
+    """Generate the function dumping one object of the type, without hooks.
+
+    The function stores the errors of the fields into the dict it is given.
+    """
+    generator = _Generator(schema, obj_type)
+    source = generator.source()
+    filename = f'<dump {type(schema).__name__} {obj_type.__name__}>'
+    exec(compile(source, filename, 'exec'), generator.namespace)
+    dumper = generator.namespace['dump']
+    dumper.source = source
+    return dumper
@@ -0,0 +1,202 @@
+"""Dump users straight into the flat shape of the user resources.
+
+``UserByIdResource`` and ``UserByDocumentResource`` dump the whole user, its
+contact methods and its customer, and ``flatten_object`` then picks a few
+values back out of the nested dicts. ``UserProjection`` produces the
+flattened dict directly: each value is formatted by the same bound field the
+schema would use, the customer is never dumped as a dict, and the confirmed
+email and phone number are read from the contact method index of the user.
+"""
+from typing import Callable, Dict, Optional, Tuple
+
+from marshmallow import fields, missing, Schema, ValidationError
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+
+from users.odm.compiler import CompiledSchema
+from users.odm.schemas import UserByDocumentResource, UserByIdResource
+
+USER = 'user'
+CUSTOMER = 'customer'
+IDENTIFICATIONS = 'identifications'
+
+# Output key, source and key of the value in the dump of the source, in the
+# order ``flatten_object`` builds them.
+LAYOUTS = {
+    UserByIdResource: (
+        ('id', USER, 'id'),
+        ('type', USER, 'type'),
+        ('lastName', CUSTOMER, 'last_name'),
+        ('gender', CUSTOMER, 'gender'),
+        ('documentType', CUSTOMER, 'document_type'),
+        ('documentNumber', CUSTOMER, 'document_number'),
+        ('mobileNumber', USER, 'phone_number'),
+        ('birthDate', CUSTOMER, 'birth_date'),
+        ('identifications', IDENTIFICATIONS, 'identifications'),
+        ('firstName', CUSTOMER, 'first_name'),
+        ('createdAt', CUSTOMER, 'created_at'),
+        ('email', USER, 'email'),
+        ('updatedAt', CUSTOMER, 'updated_at'),
+        ('status', USER, 'status'),
+        ('nationality_id', CUSTOMER, 'nationality_id'),
+    ),
+    UserByDocumentResource: (
+        ('type', USER, 'type'),
+        ('status', USER, 'status'),
+        ('customer_status', CUSTOMER, 'status'),
+        ('lastName', CUSTOMER, 'last_name'),
+        ('firstName', CUSTOMER, 'first_name'),
+        ('email', USER, 'email'),
+        ('gender', CUSTOMER, 'gender'),
+        ('documentType', CUSTOMER, 'document_type'),
+        ('documentNumber', CUSTOMER, 'document_number'),
+        ('mobileNumber', USER, 'phone_number'),
+        ('birthDate', CUSTOMER, 'birth_date'),
+        ('identifications', IDENTIFICATIONS, 'identifications'),
+        ('createdAt', CUSTOMER, 'created_at'),
+        ('updatedAt', CUSTOMER, 'updated_at'),
+        ('nationality_id', CUSTOMER, 'nationality_id'),
+    ),
+}
+
+# Dump keys of the user properties resolved from its contact methods.
+CONTACT_METHOD_KEYS = {'email': 'EMAIL', 'phone_number': 'PHONE'}
+
+Getter = Callable[[object], object]
+
+
+class ProjectionUnsupported(Exception):
+    """The object needs the schema dump to reproduce its output."""
+
+
+def _dump_processors(schema: Schema, tag: str) -> list:
+    processors = schema.__processors__
+    return processors.get((tag, False), []) + processors.get((tag, True), [])
+
+
+def _getters(schema: Schema) -> Dict[str, Getter]:
+    """Return a function per dump key formatting the value of an object."""
+    getters = {}
+    for attr, field in schema.fields.items():
+        if getattr(field, 'load_only', False):
+            continue
+
+        def getter(obj: object, attr: str = attr, field: fields.Field = field) -> object:
+            value = field.serialize(attr, obj, accessor=schema.get_attribute)
+            return None if value is missing else value
+
+        getters[field.dump_to or attr] = getter
+    return getters
+
+
+def _confirmed_contact_values(user: object) -> Dict[str, object]:
+    """Return the unique confirmed value of each contact method type."""
+    values = {}
+    for key, description in CONTACT_METHOD_KEYS.items():
+        found = [
+            contact_method.value
+            for contact_method in user.contact_methods_of(description, confirmed=True)
+        ]
+        if len(found) != 1:
+            # The user properties raise their own errors, let the schema do it.
+            raise ProjectionUnsupported()
+        values[key] = found[0]
+    return values
+
+
+class UserProjection(CompiledSchema):
+    """Dump the user resources in a single traversal.
+
+    Falls back to the compiled dump of the schema when its hooks or fields
+    are not the ones the projection was written for.
+    """
+
+    def __init__(self, schema: Schema):
+        """Resolve the fields of the user and customer values."""
+        super().__init__(schema)
+        self.layout = self._resolve(schema)
+
+    def _resolve(self, schema: Schema) -> Optional[Tuple[Tuple, ...]]:
+        layout = LAYOUTS.get(type(schema))
+        customer_field = schema.fields.get('customer')
+        if layout is None or not self.supported:
+            return None
+        if _dump_processors(schema, PRE_DUMP) or \
+                _dump_processors(schema, POST_DUMP) != ['flatten_object']:
+            return None
+        if type(customer_field) is not fields.Nested or \
+                isinstance(customer_field.only, str) or customer_field.many:
+            return None
+
+        customer_schema = customer_field.schema
+        if customer_schema.many or _dump_processors(customer_schema, PRE_DUMP) or \
+                _dump_processors(customer_schema, POST_DUMP):
+            return None
+
+        user_getters = _getters(schema)
+        customer_getters = _getters(customer_schema)
+        self.contact_method_fields = {
+            key: (attr, field)
+            for attr, field in schema.fields.items()
+            for key in [field.dump_to or attr]
+            if key in CONTACT_METHOD_KEYS
+        }
+        if len(self.contact_method_fields) != len(CONTACT_METHOD_KEYS):
+            return None
+        self.customer_id = user_getters.get('customer_id', lambda user: None)
+
+        resolved = []
+        for key, source, source_key in layout:
+            if source == USER and source_key in CONTACT_METHOD_KEYS:
+                getter = None
+            elif source == USER:
+                getter = user_getters.get(source_key, lambda user: None)
+            else:
+                getter = customer_getters.get(source_key, lambda customer: None)
+            resolved.append((key, source, source_key, getter))
+        return tuple(resolved)
+
+    def marshal(self, obj: object, many: bool) -> object:
+        """Return the flat resource of each user."""
+        if self.layout is None:
+            return super().marshal(obj, many)
+
+        try:
+            if many:
+                return [self.project(user) for user in obj]
+            return self.project(obj)
+        except (ProjectionUnsupported, ValidationError):
+            # The projection runs no hooks, the compiled dump reports the errors.
+            return super().marshal(obj, many)
+
+    def project(self, user: object) -> Dict:
+        """Return the flat resource of a user."""
+        customer = user.customer
+        if customer is None:
+            raise ProjectionUnsupported()
+        contact_values = _confirmed_contact_values(user)
+
+        result = {}
+        for key, source, source_key, getter in self.layout:
+            if source == CUSTOMER:
+                result[key] = getter(customer)
+            elif source == IDENTIFICATIONS:
+                result[key] = self.identifications(user, getter(customer))
+            elif getter is not None:
+                result[key] = getter(user)
+            else:
+                attr, field = self.contact_method_fields[source_key]
+                result[key] = field._serialize(contact_values[source_key], attr, user)
+        return result
+
+    def identifications(self, user: object, identifications: Dict) -> list:
+        """Return the identifications as ``flatten_object`` lists them."""
+        customer_id = self.customer_id(user)
+        return [
+            {
+                'type': k,
+                'number': v['value'],
+                'customer_identification_id': customer_id,
+                'createdAt': v['audit_fields']['created_date'],
+                'updatedAt': v['audit_fields']['modified_date'],
+            } for k, v in identifications.items()
+        ]
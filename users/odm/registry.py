@@ -0,0 +1,107 @@
+"""Share the schema instances of the process instead of building them per use.
+
+Marshmallow deep copies the declared fields of a schema and binds them on
+every construction, which costs more than most of the loads and dumps the
+views perform. The registry builds each schema configuration once per thread.
+
+Marshmallow 2 schemas are not thread safe: ``load`` and ``dump`` rebind their
+fields and read their options from the instance. The views run on the threads
+of the FastAPI pool, so each thread gets its own instances, and a thread
+serves one request at a time. The ``data`` and ``data_with_hypermedia`` left
+on the instance are still overwritten by the next request of the thread: use
+the values ``load``, ``dump`` and ``dump_with_hypermedia`` return.
+"""
+from threading import local
+from typing import Callable, Dict, Hashable, Type, TypeVar
+
+from marshmallow import Schema
+
+from users.odm.compiler import CompiledSchema
+from users.odm.projections import LAYOUTS, UserProjection
+
+SchemaType = TypeVar('SchemaType', bound=Schema)
+
+REQUEST_OPTIONS = ('view_kwargs',)
+
+
+def _freeze(value: object) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class SchemaRegistry:
+    """Schema instances of each thread, by class and constructor options."""
+
+    def __init__(self) -> None:
+        """Start with no schema built."""
+        self._local = local()
+        self._generation = 0
+
+    def get(self, schema_class: Type[SchemaType], **options: object) -> SchemaType:
+        """Return the schema built with the options, building it only once."""
+        return self._get(
+            (schema_class, _freeze(options)),
+            lambda: schema_class(**options),
+            options
+        )
+
+    def get_compiled(
+        self,
+        schema_class: Type[Schema],
+        **options: object
+    ) -> CompiledSchema:
+        """Return the compiled dumps of the schema built with the options.
+
+        The user resources get their dedicated ``UserProjection``.
+        """
+        compiled_class = UserProjection if schema_class in LAYOUTS else CompiledSchema
+        return self._get(
+            (CompiledSchema, schema_class, _freeze(options)),
+            lambda: compiled_class(self.get(schema_class, **options)),
+            options
+        )
+
+    def _get(self, key: Hashable, build: Callable[[], object], options: Dict) -> object:
+        request_options = [option for option in REQUEST_OPTIONS if option in options]
+        if request_options:
+            raise TypeError(
+                f'{", ".join(request_options)} vary per request, '
+                'pass them at dump time'
+            )
+
+        schemas = self._schemas()
+        schema = schemas.get(key)
+        if schema is None:
+            schema = schemas[key] = build()
+        return schema
+
+    def _schemas(self) -> Dict[Hashable, object]:
+        # Every thread drops the schemas it built before the last clear.
+        if getattr(self._local, 'generation', None) != self._generation:
+            self._local.schemas = {}
+            self._local.generation = self._generation
+        return self._local.schemas
+
+    def clear(self) -> None:
+        """Forget every built schema, in every thread."""
+        self._generation += 1
+
+    def __len__(self) -> int:
+        """Return the amount of schema configurations built by this thread."""
+        return len(self._schemas())
+
+
+schema_registry = SchemaRegistry()
+
+
+def get_schema(schema_class: Type[SchemaType], **options: object) -> SchemaType:
+    """Return the schema of the process registry for the class and options."""
+    return schema_registry.get(schema_class, **options)
+
+
+def get_compiled_schema(schema_class: Type[Schema], **options: object) -> CompiledSchema:
+    """Return the compiled schema of the process registry."""
+    return schema_registry.get_compiled(schema_class, **options)
@@ -30,6 +30,7 @@ from users.core.actions import (
     GetUserByDocument,
     GetUserById,
     GetUserContactMethods,
+    ImportSignUps,
     RequestUserIdentityValidation,
     UpdateLegalValidation,
     ValidateEmailConfirmationToken,
@@ -412,6 +413,18 @@ class CreateSignUpSchema(UserAnnotationSchema):
         register_as_scheme = True
 
 
+class ImportSignUpsSchema(UserAnnotationSchema):
+    """Request schema for the import of many email confirmations."""
+
+    sign_ups = fields.List(fields.Nested(CreateSignUpSchema), required=True)
+
+    class Meta(UserAnnotationSchema.Meta):
+        """Schema target configurations."""
+
+        target = ImportSignUps
+        register_as_scheme = True
+
+
 class SignUpResourceSchema(UserAnnotationSchema):
     """Response schema for email confirmation."""
 
@@ -0,0 +1,162 @@
+"""Sign up the customer bases partners migrate, many emails at once.
+
+Run it with ``python -m users.onboarding FILE`` instead of posting each email
+to ``/signup/email_confirmation``. The file, or the standard input when it is
+``-``, is a CSV with the ``service_agr_id`` and ``email`` columns. Emails are
+signed up in chunks of ``--chunk-size``, each created in one transaction with
+its ``SavedSignUp`` events emitted after it; emails already registered are
+skipped. Rows without an integer ``service_agr_id`` or an ``email`` are
+reported with their line number and skipped.
+
+After each chunk the rows imported are counted in ``--checkpoint``; running
+the import again with the same checkpoint and file resumes after them.
+``POST /v2/users/signup/bulk`` imports the emails of its body the same way,
+up to ``MAX_BULK_SIGN_UPS`` per request.
+"""
+from argparse import ArgumentParser, Namespace
+import csv
+from itertools import islice
+import os
+import sys
+from typing import Callable, Iterable, Iterator, List, TextIO
+
+from nwkcorelib import CommandBus
+
+from users.containers import UserContainer
+from users.core.actions import CreateSignUp, ImportSignUps
+from users.core.models import SignUpImport
+
+# The most emails ``POST /v2/users/signup/bulk`` signs up per request.
+MAX_BULK_SIGN_UPS = 1000
+
+
+def read_sign_ups(
+    lines: TextIO,
+    invalid: Callable[[int, str], None] = lambda line, reason: None
+) -> Iterator[CreateSignUp]:
+    """Read the sign ups of the CSV rows.
+
+    Invalid rows are skipped, ``invalid`` is called with their line number and
+    the reason.
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        try:
+            service_agr_id = int(row['service_agr_id'])
+        except (TypeError, ValueError):
+            invalid(reader.line_num, f"invalid service_agr_id {row['service_agr_id']!r}")
+            continue
+        email = (row['email'] or '').strip()
+        if not email:
+            invalid(reader.line_num, 'missing email')
+            continue
+
+        yield CreateSignUp(service_agr_id=service_agr_id, email=email)
+
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Yield the items in lists of up to ``size``."""
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_sign_ups(
+    command_bus: CommandBus,
+    sign_ups: Iterable[CreateSignUp],
+    chunk_size: int = 500,
+    progress: Callable[[int, SignUpImport], None] = lambda rows, total: None
+) -> SignUpImport:
+    """Sign up the emails a chunk at a time and return the totals.
+
+    ``progress`` is called with the rows of each chunk and the totals so far,
+    once the chunk is imported.
+    """
+    total = SignUpImport()
+    for chunk in chunked(sign_ups, chunk_size):
+        imported: SignUpImport = command_bus.handle(ImportSignUps(sign_ups=chunk))
+        total.created += imported.created
+        total.skipped += imported.skipped
+        progress(len(chunk), total)
+
+    return total
+
+
+def parse_args(argv: List[str]) -> Namespace:
+    """Parse the command line arguments."""
+    parser = ArgumentParser(prog='python -m users.onboarding')
+    parser.add_argument('file', help='CSV with the service_agr_id and email columns, '
+                                     'or - for the standard input')
+    parser.add_argument('--chunk-size', type=int, default=500,
+                        help='emails signed up per transaction')
+    parser.add_argument('--checkpoint',
+                        help='file counting the rows imported, to resume from')
+    return parser.parse_args(argv)
+
+
+def read_checkpoint(path: str) -> int:
+    """Return the rows counted in the checkpoint, if any."""
+    if path is None or not os.path.exists(path):
+        return 0
+
+    with open(path) as checkpoint:
+        return int(checkpoint.read().strip() or 0)
+
+
+def write_checkpoint(path: str, rows: int) -> None:
+    """Store the rows in the checkpoint, replacing it at once."""
+    with open(f'{path}.tmp', 'w') as checkpoint:
+        checkpoint.write(str(rows))
+    os.replace(f'{path}.tmp', path)
+
+
+def main(argv: List[str]) -> int:
+    """Import the file into the database of ``DB_URI`` and return the exit status."""
+    args = parse_args(argv)
+    container = UserContainer()
+    container.config.db_uri.from_env('DB_URI')
+    container.config.jwt_secret.from_env('JWT_SECRET')
+    container.config.broker_url.from_env('BROKER_URL')
+    container.config.contact_confirmation_expiration_timedelta.from_env(
+        'CONTACT_CONFIRMATION_EXPIRATION_TIMEDELTA'
+    )
+    done = read_checkpoint(args.checkpoint)
+
+    def progress(rows: int, total: SignUpImport) -> None:
+        nonlocal done
+        done += rows
+        if args.checkpoint:
+            write_checkpoint(args.checkpoint, done)
+        print(
+            f'{done} rows imported: {total.created} created, '
+            f'{total.skipped} skipped.',
+            file=sys.stderr
+        )
+
+    def invalid(line: int, reason: str) -> None:
+        print(f'Skipped line {line}: {reason}.', file=sys.stderr)
+
+    lines = open(args.file, newline='') if args.file != '-' else sys.stdin
+    try:
+        total = import_sign_ups(
+            container.command_bus(),
+            islice(read_sign_ups(lines, invalid), done, None),
+            args.chunk_size,
+            progress
+        )
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+
+    print(
+        f'Created {total.created} sign ups, skipped {total.skipped} emails.',
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
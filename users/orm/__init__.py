@@ -2,23 +2,34 @@ from __future__ import annotations
 
 from contextlib import AbstractContextManager, contextmanager
 from logging import Logger
-from typing import Callable
+from typing import Callable, Optional, Union
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import scoped_session, Session, sessionmaker
 
+from users.orm.instrumentation import instrument, SlowQueryLog
+
 
 class Database:
     """Represent the database objent interface."""
 
-    def __init__(self, db_uri: str, logger: Logger):
+    def __init__(
+        self,
+        db_uri: str,
+        logger: Logger,
+        slow_query_log: Optional[SlowQueryLog] = None
+    ):
         """Initialize the database connection base components."""
         self.__logger = logger
-        self.__engine = create_engine(
-            db_uri,
-            echo=False,
-            future=True,
-            pool_pre_ping=True
+        self.__engine = instrument(
+            create_engine(
+                db_uri,
+                echo=False,
+                future=True,
+                pool_pre_ping=True
+            ),
+            slow_query_log
         )
         self.__session_factory = scoped_session(
             sessionmaker(
@@ -29,6 +40,20 @@ class Database:
             )
         )
 
+    @property
+    def engine(self) -> Engine:
+        """Provide the engine the sessions connect through by default."""
+        return self.__engine
+
+    def bind(self, bind: Union[Engine, Connection]) -> None:
+        """Make the upcoming sessions run on the given engine or connection.
+
+        The test suite binds a connection holding an outer transaction, so
+        every test is rolled back instead of migrating the schema again.
+        """
+        self.__session_factory.remove()
+        self.__session_factory.configure(bind=bind)
+
     @contextmanager
     def session(self) -> Callable[..., AbstractContextManager[Session]]:
         """Provide a session on a context manager for the repositories."""
@@ -0,0 +1,140 @@
+"""Move the users that never move on to the archive tables.
+
+Run it with ``python -m users.orm.archive`` from a scheduled job. Users
+``BANNED`` or ``BANNED_NOTIFIED``, and users whose sign up is
+``SIGN_UP_BLOCKED``, are moved with their contact methods, addresses and
+sign up to the ``archived_*`` tables. Their emails stay claimed. The
+repositories look them up in the archive when they miss in the tables the
+onboarding works on, the hot set.
+
+Users are walked by id in batches of ``--batch-size``, each moved in its own
+transaction, sleeping ``--pause`` seconds between batches. ``hot_set_size``
+reports the size of the hot set, also served by
+``GET /v2/users/internal/hot-set``.
+"""
+from argparse import ArgumentParser, Namespace
+from datetime import datetime
+import sys
+from typing import Dict, List
+
+from sqlalchemy import DateTime, delete, exists, func, insert, literal, or_, select, Table
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+from users.containers import UserContainer
+from users.core.models.states import SignUpStage, TERMINAL_USER_STATUSES
+from users.orm.batches import add_batch_arguments, BatchJob
+from users.orm.mappings import (
+    archived_contact_method_table,
+    archived_sign_up_table,
+    archived_user_address_table,
+    archived_user_table,
+    contact_method_table,
+    sign_up_table,
+    user_address_table,
+    user_table,
+)
+
+# The tables holding the rows of a user and their archives, the user last.
+ARCHIVES = (
+    (contact_method_table, archived_contact_method_table),
+    (user_address_table, archived_user_address_table),
+    (sign_up_table, archived_sign_up_table),
+    (user_table, archived_user_table),
+)
+
+
+def terminal() -> ColumnElement:
+    """Return the condition of the users never moving on."""
+    return or_(
+        user_table.c.status.in_(TERMINAL_USER_STATUSES),
+        exists().where(
+            sign_up_table.c.user_id == user_table.c.id,
+            sign_up_table.c.stage == SignUpStage.SIGN_UP_BLOCKED
+        ),
+    )
+
+
+def hot_set_size(session: Session) -> Dict[str, int]:
+    """Count the rows of the hot set, the terminal ones and the archived users."""
+    def count(table: Table, *criteria: ColumnElement) -> int:
+        return session.execute(
+            select(func.count()).select_from(table).where(*criteria)
+        ).scalar_one()
+
+    return {
+        'users': count(user_table),
+        'contact_methods': count(contact_method_table),
+        'sign_ups': count(sign_up_table),
+        'terminal_users': count(user_table, terminal()),
+        'archived_users': count(archived_user_table),
+    }
+
+
+class Archiver(BatchJob):
+    """Move the terminal users to the archive tables in bounded batches."""
+
+    def archive(self) -> int:
+        """Archive the terminal users and return how many were."""
+        return self.walk(
+            user_table.c.id,
+            user_table.c.status.in_(TERMINAL_USER_STATUSES),
+            self.__move
+        ) + self.walk(
+            sign_up_table.c.user_id,
+            sign_up_table.c.stage == SignUpStage.SIGN_UP_BLOCKED,
+            self.__move
+        )
+
+    def __move(self, session: Session, user_ids: List) -> int:
+        # The users changing meanwhile are moved once their change commits.
+        user_ids = session.execute(
+            select(user_table.c.id)
+            .where(user_table.c.id.in_(user_ids), terminal())
+            .with_for_update()
+        ).scalars().all()
+
+        archived_at = literal(datetime.now(), DateTime)
+        for table, archive in ARCHIVES:
+            key = table.c.id if table is user_table else table.c.user_id
+            session.execute(
+                insert(archive).from_select(
+                    [*table.columns.keys(), 'archived_at'],
+                    select(*table.columns, archived_at).where(key.in_(user_ids))
+                )
+            )
+            session.execute(delete(table).where(key.in_(user_ids)))
+
+        return len(user_ids)
+
+
+def parse_args(argv: List[str]) -> Namespace:
+    """Parse the command line arguments."""
+    parser = ArgumentParser(prog='python -m users.orm.archive')
+    return add_batch_arguments(parser).parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    """Archive the database of ``DB_URI`` and return the exit status."""
+    args = parse_args(argv)
+    container = UserContainer()
+    container.config.db_uri.from_env('DB_URI')
+    database = container.database()
+    archived = Archiver(
+        database.session,
+        batch_size=args.batch_size,
+        pause=args.pause,
+        dry_run=args.dry_run,
+    ).archive()
+
+    with database.session() as session:
+        size = hot_set_size(session)
+
+    verb = 'Found' if args.dry_run else 'Archived'
+    print(f'{verb} {archived} terminal users.')
+    print(', '.join(f'{name}: {rows}' for name, rows in size.items()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,74 @@
+"""Change the rows matching a condition, a bounded batch at a time.
+
+The maintenance jobs walk the rows by a key in batches of ``batch_size``,
+each changed in its own transaction, sleeping ``pause`` seconds between
+batches so the jobs do not compete with the traffic for the database.
+"""
+from argparse import ArgumentParser
+from contextlib import AbstractContextManager
+import time
+from typing import Callable, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+
+class BatchJob:
+    """Superclass of the jobs changing rows in batches."""
+
+    def __init__(
+        self,
+        session_factory: Callable[..., AbstractContextManager[Session]],
+        batch_size: int = 500,
+        pause: float = 1.0,
+        dry_run: bool = False,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        """Initialize the batch limits."""
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.pause = pause
+        self.dry_run = dry_run
+        self.__sleep = sleep
+
+    def walk(
+        self,
+        key: ColumnElement,
+        condition: ColumnElement,
+        apply: Callable[[Session, List], int]
+    ) -> int:
+        """Apply ``apply`` to the keys matching, a batch at a time.
+
+        ``apply`` returns the amount of rows it changed. Dry runs only count
+        the keys matching.
+        """
+        changed, last = 0, None
+        while True:
+            query = select(key).where(condition).order_by(key).limit(self.batch_size)
+            if last is not None:
+                query = query.where(key > last)
+
+            with self.session_factory() as session:
+                keys = session.execute(query).scalars().all()
+                if keys and not self.dry_run:
+                    changed += apply(session, keys)
+                elif keys:
+                    changed += len(keys)
+                session.commit()
+
+            if len(keys) < self.batch_size:
+                return changed
+            last = keys[-1]
+            self.__sleep(self.pause)
+
+
+def add_batch_arguments(parser: ArgumentParser) -> ArgumentParser:
+    """Add the arguments limiting the batches to the parser."""
+    parser.add_argument('--batch-size', type=int, default=500,
+                        help='rows changed per transaction')
+    parser.add_argument('--pause', type=float, default=1.0,
+                        help='seconds slept between batches')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='count the rows without changing them')
+    return parser
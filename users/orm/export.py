@@ -0,0 +1,249 @@
+"""Stream the users with their contact methods, sign up and service agreement.
+
+Run it with ``python -m users.orm.export`` instead of reading the users one
+by one through the API. Users are exported by id, a page of ``--batch-size``
+users at a time. Each page is streamed from the database in a query of its
+own and written before the next one is read, so the memory used does not grow
+with the users exported. The users archived are not exported.
+
+After each page the last id exported is stored in ``--checkpoint``; running
+the export again with the same checkpoint and output resumes after it.
+"""
+from argparse import ArgumentParser, Namespace
+from contextlib import AbstractContextManager
+import csv
+from datetime import datetime
+from enum import Enum
+from itertools import groupby
+import json
+import os
+import sys
+from typing import Callable, Dict, Iterator, List, Optional, TextIO
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from users.containers import UserContainer
+from users.core.models.states import UserStatus
+from users.orm.mappings import (
+    contact_method_table,
+    contact_method_type_table,
+    service_agreement_table,
+    sign_up_table,
+    user_table,
+)
+
+# The columns of the users exported, as named in the records.
+USER_COLUMNS = {
+    'id': user_table.c.id,
+    'customer_id': user_table.c.customer_id,
+    'service_agr_id': user_table.c.service_agr_id,
+    'business_model': service_agreement_table.c.business_model,
+    'status': user_table.c.status,
+    'stage': sign_up_table.c.stage,
+    'created_date': user_table.c.created_date,
+    'modified_date': user_table.c.modified_date,
+}
+
+
+def plain(value: object) -> object:
+    """Return the value as JSON and CSV can hold it."""
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class UserExport:
+    """Read the users matching the filters, a page at a time."""
+
+    def __init__(
+        self,
+        session_factory: Callable[..., AbstractContextManager[Session]],
+        batch_size: int = 1000,
+        service_agr_id: Optional[int] = None,
+        status: Optional[UserStatus] = None
+    ) -> None:
+        """Initialize the page size and the filters."""
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.criteria = []
+        if service_agr_id is not None:
+            self.criteria.append(user_table.c.service_agr_id == service_agr_id)
+        if status is not None:
+            self.criteria.append(user_table.c.status == status)
+
+    def pages(self, after: Optional[UUID] = None) -> Iterator[List[Dict]]:
+        """Yield the records of the users after the id, a page at a time."""
+        while True:
+            with self.session_factory() as session:
+                page = list(self.__page(session, after))
+
+            if page:
+                yield page
+            if len(page) < self.batch_size:
+                return
+            after = page[-1]['id']
+
+    def __page(self, session: Session, after: Optional[UUID]) -> Iterator[Dict]:
+        user_ids = select(user_table.c.id)\
+            .where(*self.criteria)\
+            .order_by(user_table.c.id)\
+            .limit(self.batch_size)
+        if after is not None:
+            user_ids = user_ids.where(user_table.c.id > after)
+        user_ids = user_ids.subquery()
+
+        rows = session.execute(
+            select(
+                *(column.label(name) for name, column in USER_COLUMNS.items()),
+                contact_method_type_table.c.description.label('type'),
+                contact_method_table.c.value,
+                contact_method_table.c.confirmation_confirmed_at.label('confirmed_at'),
+            )
+            .join_from(user_table, user_ids, user_ids.c.id == user_table.c.id)
+            .join(service_agreement_table)
+            .outerjoin(sign_up_table, sign_up_table.c.user_id == user_table.c.id)
+            .outerjoin(
+                contact_method_table, contact_method_table.c.user_id == user_table.c.id
+            )
+            .outerjoin(contact_method_type_table)
+            .order_by(user_table.c.id, contact_method_table.c.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+
+        # The rows of a user come together, one per contact method.
+        for _, user_rows in groupby(rows, key=lambda row: row.id):
+            user_rows = list(user_rows)
+            record = {name: getattr(user_rows[0], name) for name in USER_COLUMNS}
+            record['contact_methods'] = [
+                {
+                    'type': row.type,
+                    'value': row.value,
+                    'confirmed': row.confirmed_at is not None,
+                }
+                for row in user_rows if row.type is not None
+            ]
+            yield record
+
+
+def write_ndjson(output: TextIO, records: List[Dict], first: bool) -> None:
+    """Write the records as JSON, one per line."""
+    for record in records:
+        output.write(json.dumps(record, default=plain) + '\n')
+
+
+def write_csv(output: TextIO, records: List[Dict], first: bool) -> None:
+    """Write the records as CSV rows, the contact methods in one column.
+
+    The header goes before the first page of the output, not when resuming.
+    """
+    writer = csv.DictWriter(output, fieldnames=[*USER_COLUMNS, 'contact_methods'])
+    if first:
+        writer.writeheader()
+    for record in records:
+        writer.writerow({
+            **{name: plain(record[name]) for name in USER_COLUMNS},
+            'contact_methods': ';'.join(
+                f"{cm['type']}:{cm['value']}" for cm in record['contact_methods']
+            ),
+        })
+
+
+WRITERS = {'ndjson': write_ndjson, 'csv': write_csv}
+
+
+def export(
+    user_export: UserExport,
+    output: TextIO,
+    write: Callable[[TextIO, List[Dict], bool], None] = write_ndjson,
+    after: Optional[UUID] = None,
+    checkpoint: Callable[[UUID], None] = lambda user_id: None
+) -> int:
+    """Write the users after the id to the output and return how many were.
+
+    ``write`` is told whether the page is the first of the output, that is
+    whether the export starts from the beginning. ``checkpoint`` is called
+    with the last id of each page once written.
+    """
+    exported = 0
+    for page in user_export.pages(after):
+        write(output, page, after is None)
+        output.flush()
+        exported += len(page)
+        after = page[-1]['id']
+        checkpoint(after)
+
+    return exported
+
+
+def parse_args(argv: List[str]) -> Namespace:
+    """Parse the command line arguments."""
+    parser = ArgumentParser(prog='python -m users.orm.export')
+    parser.add_argument('--format', choices=WRITERS, default='ndjson',
+                        help='format of the records')
+    parser.add_argument('--output', help='file written, the standard output by default')
+    parser.add_argument('--checkpoint',
+                        help='file holding the last id exported, to resume from')
+    parser.add_argument('--after', type=UUID, help='id the export starts after')
+    parser.add_argument('--service-agr-id', type=int,
+                        help='export the users of this service agreement')
+    parser.add_argument('--status', type=UserStatus,
+                        choices=list(UserStatus), metavar='STATUS',
+                        help='export the users in this status')
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help='users read per page')
+    return parser.parse_args(argv)
+
+
+def read_checkpoint(path: Optional[str]) -> Optional[UUID]:
+    """Return the id stored in the checkpoint, if any."""
+    if path is None or not os.path.exists(path):
+        return None
+
+    with open(path) as checkpoint:
+        content = checkpoint.read().strip()
+
+    return UUID(content) if content else None
+
+
+def write_checkpoint(path: str, user_id: UUID) -> None:
+    """Store the id in the checkpoint, replacing it at once."""
+    with open(f'{path}.tmp', 'w') as checkpoint:
+        checkpoint.write(str(user_id))
+    os.replace(f'{path}.tmp', path)
+
+
+def main(argv: List[str]) -> int:
+    """Export the users of the database of ``DB_URI`` and return the exit status."""
+    args = parse_args(argv)
+    container = UserContainer()
+    container.config.db_uri.from_env('DB_URI')
+    user_export = UserExport(
+        container.database().session,
+        batch_size=args.batch_size,
+        service_agr_id=args.service_agr_id,
+        status=args.status,
+    )
+    after = args.after or read_checkpoint(args.checkpoint)
+    checkpoint = (lambda user_id: write_checkpoint(args.checkpoint, user_id)) \
+        if args.checkpoint else (lambda user_id: None)
+
+    output = open(args.output, 'a' if after else 'w', newline='') \
+        if args.output else sys.stdout
+    try:
+        exported = export(user_export, output, WRITERS[args.format], after, checkpoint)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f'Exported {exported} users.', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
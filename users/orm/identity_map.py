@@ -0,0 +1,86 @@
+"""Share the entities loaded within a request among its repositories.
+
+Every repository opens its own session, so a handler reading the same entity
+through two repositories, or twice, queries it twice. Within the
+``identity_map`` opened per request, next to its CCID, the database
+repositories keep the entities they load by class and key and return them
+instead of querying again. Writes discard the entries they may change.
+Outside of an identity map, every read queries.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Hashable, Iterator, Optional, Tuple, Type, TypeVar
+
+T = TypeVar('T')
+
+_current_map: ContextVar[Optional['IdentityMap']] = ContextVar(
+    'identity_map',
+    default=None
+)
+
+
+class IdentityMap:
+    """Entities loaded within a request, by class and key."""
+
+    def __init__(self):
+        """Start with no entities."""
+        self.__entities: Dict[Tuple[type, Hashable], object] = {}
+
+    def __len__(self) -> int:
+        """Return the amount of entities held."""
+        return len(self.__entities)
+
+    def get(self, cls: Type[T], key: Hashable) -> Optional[T]:
+        """Return the entity of the class held under the key, if any."""
+        return self.__entities.get((cls, key))
+
+    def add(self, cls: Type[T], key: Hashable, entity: T) -> None:
+        """Hold the entity of the class under the key."""
+        self.__entities[cls, key] = entity
+
+    def discard(self, cls: type, key: Optional[Hashable] = None) -> None:
+        """Drop the entity of the class held under the key, or all of them."""
+        if key is not None:
+            self.__entities.pop((cls, key), None)
+            return
+
+        for entry in [entry for entry in self.__entities if entry[0] is cls]:
+            self.__entities.pop(entry, None)
+
+
+def current_identity_map() -> Optional[IdentityMap]:
+    """Return the identity map of the current context, if any."""
+    return _current_map.get()
+
+
+@contextmanager
+def identity_map() -> Iterator[IdentityMap]:
+    """Share the entities loaded within the block."""
+    entities = IdentityMap()
+    token = _current_map.set(entities)
+    try:
+        yield entities
+    finally:
+        _current_map.reset(token)
+
+
+def cached(cls: Type[T], key: Hashable, load: Callable[[], T]) -> T:
+    """Return the entity held under the key, or load and hold it."""
+    entities = _current_map.get()
+    if entities is None:
+        return load()
+
+    entity = entities.get(cls, key)
+    if entity is None:
+        entity = load()
+        if entity is not None:
+            entities.add(cls, key, entity)
+
+    return entity
+
+
+def invalidate(cls: type, key: Optional[Hashable] = None) -> None:
+    """Drop the entity of the class held under the key, or all of them."""
+    entities = _current_map.get()
+    if entities is not None:
+        entities.discard(cls, key)
@@ -0,0 +1,249 @@
+"""Count the SQL statements executed and the time spent on them.
+
+Statements are accounted to the ``QueryStats`` of the current context, opened
+with ``track_queries`` per request, command or test block. Statements issued
+outside of a tracked context are not accounted.
+
+Statements slower than a threshold are also aggregated by fingerprint in the
+``SlowQueryLog`` of the engine.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from logging import Logger
+import re
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional, Set, Union
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExceptionContext
+
+from users.core.tracing import current_action
+
+# SAVEPOINT bookkeeping is issued by the session, not by the code under study.
+IGNORED_PREFIXES = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAMETER = re.compile(r'%\(\w+\)s|%s')
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PARAMETER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_SPACES = re.compile(r'\s+')
+
+_current_stats: ContextVar[Optional['QueryStats']] = ContextVar(
+    'query_stats',
+    default=None
+)
+
+
+@dataclass
+class QueryStats:
+    """Statements executed within a tracked context."""
+
+    statements: List[str] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def count(self) -> int:
+        """Return the amount of statements executed."""
+        return len(self.statements)
+
+    def repeated(self) -> Dict[str, int]:
+        """Return the statements executed more than once, the N+1 suspects."""
+        return {
+            statement: times
+            for statement, times in Counter(self.statements).items()
+            if times > 1
+        }
+
+    def as_log(self) -> Dict:
+        """Return the stats as structured log fields."""
+        return {
+            'statements': self.count,
+            'duration_ms': round(self.duration * 1000, 3),
+            'repeated_statements': len(self.repeated()),
+        }
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Return the stats of the tracked context, if any."""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Account the statements executed within the block to new stats."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so its executions with any literal match."""
+    normalized = _STRING.sub('?', statement)
+    normalized = _PARAMETER.sub('?', normalized)
+    normalized = _NUMBER.sub('?', normalized)
+    normalized = _PARAMETER_LIST.sub('(...)', normalized)
+    return _SPACES.sub(' ', normalized).strip()
+
+
+@dataclass
+class SlowQuery:
+    """Slow executions of a statement fingerprint."""
+
+    fingerprint: str
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    actions: Set[str] = field(default_factory=set)
+    last_ccid: Optional[UUID] = None
+
+    def as_dict(self) -> Dict:
+        """Return the aggregate as a json serializable dict."""
+        return {
+            'fingerprint': self.fingerprint,
+            'count': self.count,
+            'total_ms': round(self.total * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+            'mean_ms': round(self.total / self.count * 1000, 3),
+            'actions': sorted(self.actions),
+            'last_ccid': str(self.last_ccid) if self.last_ccid else None,
+        }
+
+
+class SlowQueryLog:
+    """Log and aggregate the statements slower than a threshold.
+
+    A ``None`` threshold disables the log. At most ``capacity`` fingerprints
+    are aggregated, the one with the least total time is evicted first.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: Optional[Union[float, str]],
+        logger: Logger,
+        ccid_provider: Callable[[], UUID],
+        capacity: int = 500
+    ):
+        """Initialize an empty aggregate."""
+        self.threshold = float(threshold_ms) / 1000 if threshold_ms else None
+        self.__logger = logger
+        self.__ccid_provider = ccid_provider
+        self.__capacity = capacity
+        self.__queries: Dict[str, SlowQuery] = {}
+        self.__lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether statements are being recorded."""
+        return self.threshold is not None
+
+    def record(self, statement: str, duration: float) -> None:
+        """Record the statement when it is slower than the threshold."""
+        if not self.enabled or duration < self.threshold:
+            return
+
+        statement_fingerprint = fingerprint(statement)
+        ccid = self.__ccid_provider()
+        action = current_action.get()
+        action_name = action.__name__ if action is not None else None
+
+        with self.__lock:
+            query = self.__queries.get(statement_fingerprint)
+            if query is None:
+                if len(self.__queries) >= self.__capacity:
+                    self.__evict()
+                query = SlowQuery(statement_fingerprint)
+                self.__queries[statement_fingerprint] = query
+
+            query.count += 1
+            query.total += duration
+            query.max = max(query.max, duration)
+            query.last_ccid = ccid
+            if action_name is not None:
+                query.actions.add(action_name)
+
+        self.__logger.bind(
+            ccid=str(ccid),
+            db={
+                'fingerprint': statement_fingerprint,
+                'duration_ms': round(duration * 1000, 3),
+                'action': action_name,
+            }
+        ).warning('slow query')
+
+    def __evict(self) -> None:
+        cheapest = min(self.__queries.values(), key=lambda query: query.total)
+        del self.__queries[cheapest.fingerprint]
+
+    def top(self, limit: int = 10) -> List[Dict]:
+        """Return the fingerprints that took the most total time."""
+        with self.__lock:
+            queries = sorted(
+                self.__queries.values(),
+                key=lambda query: query.total,
+                reverse=True
+            )
+            return [query.as_dict() for query in queries[:limit]]
+
+    def clear(self) -> None:
+        """Forget the aggregated statements."""
+        with self.__lock:
+            self.__queries.clear()
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: object,
+    statement: str,
+    parameters: object,
+    context: object,
+    executemany: bool
+) -> None:
+    conn.info.setdefault('query_start', []).append(perf_counter())
+
+
+def _handle_error(exception_context: ExceptionContext) -> None:
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('query_start'):
+        connection.info['query_start'].pop()
+
+
+def instrument(
+    engine: Engine,
+    slow_query_log: Optional[SlowQueryLog] = None
+) -> Engine:
+    """Account the statements executed through the engine.
+
+    Statements are added to the tracked ``QueryStats`` and handed to the
+    slow query log, if any.
+    """
+    def after_cursor_execute(
+        conn: Connection,
+        cursor: object,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool
+    ) -> None:
+        duration = perf_counter() - conn.info['query_start'].pop()
+        if statement.startswith(IGNORED_PREFIXES):
+            return
+
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.statements.append(statement)
+            stats.duration += duration
+
+        if slow_query_log is not None:
+            slow_query_log.record(statement, duration)
+
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
+    return engine
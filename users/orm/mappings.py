@@ -5,7 +5,9 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     MetaData,
     String,
     Table,
@@ -13,6 +15,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import (
+    aliased,
     composite,
     registry,
     relationship,
@@ -28,6 +31,7 @@ from users.core.models import (
 )
 from users.core.models import states
 from users.core.models.compositions import AuditFields, ContactConfirmation
+from users.core.models.locals import ContactMethodList
 
 metadata_obj = MetaData()
 
@@ -71,6 +75,8 @@ sign_up_table = Table(
     Column('user_id', UUID(as_uuid=True), ForeignKey('users.id')),
     Column('stage', Enum(states.SignUpStage), nullable=False),
     UniqueConstraint('user_id', name='u_sign_ups_user_id'),
+    # Walked by the sweeper, the sign ups of a stage by user.
+    Index('ix_sign_ups_stage_user_id', 'stage', 'user_id'),
 )
 
 user_table = Table(
@@ -89,6 +95,12 @@ user_table = Table(
     Column('address_id', UUID(as_uuid=True), nullable=True),
     *deepcopy(audit_fields)
 )
+# Walked by the archiver, the users in a terminal status.
+Index(
+    'ix_users_terminal',
+    user_table.c.id,
+    postgresql_where=user_table.c.status.in_(states.TERMINAL_USER_STATUSES)
+)
 
 user_address_table = Table(
     'user_address',
@@ -127,6 +139,78 @@ contact_method_table = Table(
     *deepcopy(contact_confirmation),
     *deepcopy(audit_fields)
 )
+# Walked by the sweeper, the contact methods never confirmed.
+Index(
+    'ix_contact_methods_unconfirmed',
+    contact_method_table.c.id,
+    postgresql_where=contact_method_table.c.confirmation_confirmed_at.is_(None)
+)
+
+# The user holding each email within a service agreement. The primary key
+# serializes the sign ups of an email, which are claimed before their user is
+# inserted. Archived users keep holding their emails.
+sign_up_email_table = Table(
+    'sign_up_emails',
+    metadata_obj,
+    Column(
+        'service_agr_id',
+        Integer(),
+        ForeignKey('service_agreements.id'),
+        nullable=False,
+        primary_key=True
+    ),
+    Column('email', String(), nullable=False, primary_key=True),
+    Column(
+        'user_id',
+        UUID(as_uuid=True),
+        nullable=False
+    ),
+)
+
+# Responses replayed to the retries of the requests sent with an
+# Idempotency-Key. Keys claimed by a running request have no status code.
+idempotency_key_table = Table(
+    'idempotency_keys',
+    metadata_obj,
+    Column('key', String(), nullable=False, primary_key=True),
+    Column('fingerprint', String(64), nullable=False),
+    Column('status_code', Integer(), nullable=True),
+    Column('body', LargeBinary(), nullable=True),
+    Column('media_type', String(), nullable=True),
+    Column('created_at', DateTime, nullable=False),
+    Column('expire_at', DateTime, nullable=False, index=True),
+)
+
+
+def archive_table(table: Table, *indexes: str) -> Table:
+    """Declare the table the rows of ``table`` are archived to.
+
+    It has the columns of ``table`` and the time they were archived at, but
+    not its constraints, and an index on each of ``indexes``.
+    """
+    return Table(
+        f'archived_{table.name}',
+        metadata_obj,
+        *(
+            Column(
+                column.name,
+                column.type.copy(),
+                nullable=column.nullable,
+                primary_key=column.primary_key,
+                index=column.name in indexes
+            )
+            for column in table.columns
+        ),
+        Column('archived_at', DateTime, nullable=False),
+    )
+
+
+# The users in a terminal status or sign up stage, moved out of the tables the
+# onboarding works on.
+archived_user_table = archive_table(user_table, 'customer_id')
+archived_contact_method_table = archive_table(contact_method_table, 'user_id', 'value')
+archived_user_address_table = archive_table(user_address_table)
+archived_sign_up_table = archive_table(sign_up_table, 'user_id')
 
 mapper_registry.map_imperatively(
     User,
@@ -135,7 +219,8 @@ mapper_registry.map_imperatively(
         'contact_methods': relationship(
             ContactMethod,
             lazy='joined',
-            order_by='asc(ContactMethod.id)'
+            order_by='asc(ContactMethod.id)',
+            collection_class=ContactMethodList
         ),
         'user_addresses': relationship(
             UserAddress,
@@ -208,3 +293,13 @@ mapper_registry.map_imperatively(
     SignUp,
     sign_up_table
 )
+
+# The entities of the archive tables, loaded with the mappings of the entities.
+ArchivedUser = aliased(User, archived_user_table, adapt_on_names=True)
+ArchivedContactMethod = aliased(
+    ContactMethod, archived_contact_method_table, adapt_on_names=True
+)
+ArchivedUserAddress = aliased(
+    UserAddress, archived_user_address_table, adapt_on_names=True
+)
+ArchivedSignUp = aliased(SignUp, archived_sign_up_table, adapt_on_names=True)
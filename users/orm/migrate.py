@@ -0,0 +1,100 @@
+"""Bring the database schema to head, skipping alembic when it already is.
+
+Run it with ``python -m users.orm.migrate``. ``MIGRATE_ON_START`` selects
+the behavior:
+
+- ``upgrade`` (default): upgrade when the database is behind.
+- ``check``: fail when the database is behind, a migration job owns upgrades.
+- ``skip``: do nothing, a migration job owns upgrades.
+
+The head revision is read from the revision files without importing them,
+and the current one with a single query, so a database already at head
+never loads the migration environment.
+"""
+import ast
+import os
+import re
+import sys
+from typing import Optional, Set
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+UPGRADE = 'upgrade'
+CHECK = 'check'
+SKIP = 'skip'
+VERSIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations', 'versions')
+
+_REVISION = re.compile(r'^revision\s*=\s*(.+)$', re.MULTILINE)
+_DOWN_REVISION = re.compile(r'^down_revision\s*=\s*(.+)$', re.MULTILINE)
+
+
+def head_revisions(versions_dir: str = VERSIONS_DIR) -> Set[str]:
+    """Return the revisions no other revision builds upon."""
+    revisions, down_revisions = set(), set()
+    for filename in os.listdir(versions_dir):
+        if not filename.endswith('.py'):
+            continue
+        with open(os.path.join(versions_dir, filename)) as file:
+            source = file.read()
+
+        revision = _REVISION.search(source)
+        if revision is None:
+            continue
+        revisions.add(ast.literal_eval(revision.group(1).strip()))
+
+        down_revision = ast.literal_eval(_DOWN_REVISION.search(source).group(1).strip())
+        if isinstance(down_revision, str):
+            down_revisions.add(down_revision)
+        elif down_revision is not None:
+            down_revisions.update(down_revision)
+
+    return revisions - down_revisions
+
+
+def current_revisions(db_uri: str) -> Optional[Set[str]]:
+    """Return the revisions the database is at, None if never migrated."""
+    engine = create_engine(db_uri, future=True)
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(text('SELECT version_num FROM alembic_version'))
+            return {row.version_num for row in rows}
+    except (OperationalError, ProgrammingError):
+        return None
+    finally:
+        engine.dispose()
+
+
+def is_at_head(db_uri: str) -> bool:
+    """Return whether the database schema is at the head revision."""
+    return current_revisions(db_uri) == head_revisions()
+
+
+def upgrade() -> None:
+    """Run alembic up to head."""
+    from alembic.command import upgrade as alembic_upgrade
+    from alembic.config import Config
+
+    alembic_upgrade(Config(os.environ.get('ALEMBIC_CONFIG')), 'head')
+
+
+def main() -> int:
+    """Apply the ``MIGRATE_ON_START`` behavior and return the exit status."""
+    mode = os.environ.get('MIGRATE_ON_START', UPGRADE)
+    if mode == SKIP:
+        return 0
+
+    if is_at_head(os.environ.get('DB_URI')):
+        print('Database schema at head, migrations skipped.')
+        return 0
+
+    if mode == CHECK:
+        print('Database schema behind head, run the migration job.', file=sys.stderr)
+        return 1
+
+    upgrade()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,7 +3,7 @@ from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
-from users.containers import UserContainer
+from users.orm.mappings import metadata_obj
 from alembic import context
 
 # this is the Alembic Config object, which provides
@@ -18,7 +18,7 @@ fileConfig(config.config_file_name)
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-target_metadata = UserContainer.metadata()
+target_metadata = metadata_obj
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -60,6 +60,13 @@ def run_migrations_online():
     and associate a connection with the context.
 
     """
+    connection = config.attributes.get('connection')
+    if connection is not None:
+        # The caller owns the connection, e.g. the test suite migrating the
+        # schema of a pytest-xdist worker.
+        run_migrations_on(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section),
         prefix="sqlalchemy.",
@@ -67,14 +74,19 @@ def run_migrations_online():
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-            compare_type=True
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+        run_migrations_on(connection)
+
+
+def run_migrations_on(connection):
+    """Run the migrations on the given connection."""
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        compare_type=True
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
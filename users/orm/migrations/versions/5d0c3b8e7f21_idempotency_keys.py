@@ -0,0 +1,40 @@
+"""idempotency keys
+
+Revision ID: 5d0c3b8e7f21
+Revises: 39a24b4fe078
+Create Date: 2026-10-19 05:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5d0c3b8e7f21'
+down_revision = '39a24b4fe078'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('body', sa.LargeBinary(), nullable=True),
+        sa.Column('media_type', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('expire_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(
+        op.f('ix_idempotency_keys_expire_at'),
+        'idempotency_keys',
+        ['expire_at'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_idempotency_keys_expire_at'), table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
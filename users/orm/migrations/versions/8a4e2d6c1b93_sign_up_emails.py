@@ -0,0 +1,51 @@
+"""sign up emails
+
+Revision ID: 8a4e2d6c1b93
+Revises: 5d0c3b8e7f21
+Create Date: 2026-10-19 07:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '8a4e2d6c1b93'
+down_revision = '5d0c3b8e7f21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'sign_up_emails',
+        sa.Column('service_agr_id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.ForeignKeyConstraint(['service_agr_id'], ['service_agreements.id'], ),
+        sa.ForeignKeyConstraint(
+            ['user_id'], ['users.id'], deferrable=True, initially='DEFERRED'
+        ),
+        sa.PrimaryKeyConstraint('service_agr_id', 'email')
+    )
+    # The first user that registered each email holds it.
+    op.execute(
+        """
+        INSERT INTO sign_up_emails (service_agr_id, email, user_id)
+        SELECT DISTINCT ON (users.service_agr_id, contact_methods.value)
+            users.service_agr_id, contact_methods.value, users.id
+        FROM users
+        JOIN contact_methods ON contact_methods.user_id = users.id
+        JOIN contact_method_types
+            ON contact_method_types.id = contact_methods.contact_method_type_id
+        WHERE contact_method_types.description = 'EMAIL'
+        ORDER BY
+            users.service_agr_id,
+            contact_methods.value,
+            contact_methods.confirmation_created_at
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('sign_up_emails')
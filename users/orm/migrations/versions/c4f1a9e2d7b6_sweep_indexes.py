@@ -0,0 +1,36 @@
+"""sweep indexes
+
+Revision ID: c4f1a9e2d7b6
+Revises: 8a4e2d6c1b93
+Create Date: 2026-10-19 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c4f1a9e2d7b6'
+down_revision = '8a4e2d6c1b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_sign_ups_stage_user_id',
+        'sign_ups',
+        ['stage', 'user_id'],
+        unique=False
+    )
+    op.create_index(
+        'ix_contact_methods_unconfirmed',
+        'contact_methods',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text('confirmation_confirmed_at IS NULL')
+    )
+
+
+def downgrade():
+    op.drop_index('ix_contact_methods_unconfirmed', table_name='contact_methods')
+    op.drop_index('ix_sign_ups_stage_user_id', table_name='sign_ups')
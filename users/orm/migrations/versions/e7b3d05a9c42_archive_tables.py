@@ -0,0 +1,140 @@
+"""archive tables
+
+Revision ID: e7b3d05a9c42
+Revises: c4f1a9e2d7b6
+Create Date: 2026-10-19 11:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'e7b3d05a9c42'
+down_revision = 'c4f1a9e2d7b6'
+branch_labels = None
+depends_on = None
+
+
+def audit_fields():
+    return [
+        sa.Column('created_by', sa.String(length=20), nullable=True),
+        sa.Column('created_date', sa.DateTime(), nullable=False),
+        sa.Column('modified_by', sa.String(length=20), nullable=True),
+        sa.Column('modified_date', sa.DateTime(), nullable=False),
+        sa.Column('deleted_by', sa.String(length=20), nullable=True),
+        sa.Column('deleted_date', sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade():
+    op.create_table(
+        'archived_users',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('customer_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('service_agr_id', sa.Integer(), nullable=False),
+        sa.Column(
+            'status',
+            postgresql.ENUM(name='userstatus', create_type=False),
+            nullable=False
+        ),
+        sa.Column('terms_and_conditions', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('address_id', postgresql.UUID(as_uuid=True), nullable=True),
+        *audit_fields(),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_archived_users_customer_id', 'archived_users', ['customer_id'], unique=False
+    )
+    op.create_table(
+        'archived_user_address',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('address_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=True),
+        *audit_fields(),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'address_id')
+    )
+    op.create_table(
+        'archived_contact_methods',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('contact_method_type_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('value', sa.String(), nullable=False),
+        sa.Column(
+            'confirmation_type',
+            postgresql.ENUM(name='contactconfirmationtype', create_type=False),
+            nullable=False
+        ),
+        sa.Column('confirmation_value', sa.String(), nullable=False),
+        sa.Column('confirmation_created_at', sa.DateTime(), nullable=False),
+        sa.Column('confirmation_expire_at', sa.DateTime(), nullable=False),
+        sa.Column('confirmation_confirmed_at', sa.DateTime(), nullable=True),
+        *audit_fields(),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_archived_contact_methods_user_id',
+        'archived_contact_methods',
+        ['user_id'],
+        unique=False
+    )
+    op.create_index(
+        'ix_archived_contact_methods_value',
+        'archived_contact_methods',
+        ['value'],
+        unique=False
+    )
+    op.create_table(
+        'archived_sign_ups',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column(
+            'stage',
+            postgresql.ENUM(name='signupstage', create_type=False),
+            nullable=False
+        ),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_archived_sign_ups_user_id', 'archived_sign_ups', ['user_id'], unique=False
+    )
+    op.create_index(
+        'ix_users_terminal',
+        'users',
+        ['id'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('BANNED', 'BANNED_NOTIFIED')")
+    )
+    # Archived users keep holding their emails.
+    op.drop_constraint('sign_up_emails_user_id_fkey', 'sign_up_emails', type_='foreignkey')
+
+
+def downgrade():
+    # The emails of the archived users are released along with the archive.
+    op.execute(
+        "DELETE FROM sign_up_emails "
+        "WHERE NOT EXISTS (SELECT 1 FROM users WHERE users.id = sign_up_emails.user_id)"
+    )
+    op.create_foreign_key(
+        'sign_up_emails_user_id_fkey',
+        'sign_up_emails',
+        'users',
+        ['user_id'],
+        ['id'],
+        deferrable=True,
+        initially='DEFERRED'
+    )
+    op.drop_index('ix_users_terminal', table_name='users')
+    op.drop_index('ix_archived_sign_ups_user_id', table_name='archived_sign_ups')
+    op.drop_table('archived_sign_ups')
+    op.drop_index('ix_archived_contact_methods_value', table_name='archived_contact_methods')
+    op.drop_index('ix_archived_contact_methods_user_id', table_name='archived_contact_methods')
+    op.drop_table('archived_contact_methods')
+    op.drop_table('archived_user_address')
+    op.drop_index('ix_archived_users_customer_id', table_name='archived_users')
+    op.drop_table('archived_users')
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
 from contextlib import AbstractAsyncContextManager
-from typing import Callable
-from typing import Optional
+from datetime import datetime, timedelta
+from itertools import count
+from typing import Callable, Hashable, Type, TypeVar
+from typing import Collection, List, Optional, Tuple, Union
 from uuid import UUID
 
-from sqlalchemy.orm import Session
-from sqlalchemy.orm.exc import NoResultFound
+from sqlalchemy import delete, exists, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import noload, Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import ColumnElement, Update
 
 from users.core.exceptions import (
+    EmailClaimError,
+    EntityGoneError,
     EntityNotFound,
+    IdempotencyKeyInUseError,
+    IdempotencyKeyReusedError,
     StorageReadError
 )
 from users.core.models import (
@@ -17,16 +26,110 @@ from users.core.models import (
     ContactMethodType,
     ServiceAgreement,
     SignUp,
+    SignUpAttempt,
+    StoredResponse,
     User,
 )
-from users.core.models.states import BusinessModel
+from users.core.models.states import (
+    BusinessModel,
+    ConfirmationOutcome,
+    SignUpOutcome,
+    SignUpStage,
+    UserStatus,
+)
 from users.core.repositories import (
     ContactMethodRepository,
     ContactMethodTypeRepository,
+    IdempotencyKeyRepository,
     ServiceAgreementRepository,
     SignUpRepository,
     UserRepository,
 )
+from users.orm.identity_map import cached, current_identity_map, invalidate
+from users.orm.mappings import (
+    ArchivedContactMethod,
+    ArchivedSignUp,
+    ArchivedUser,
+    ArchivedUserAddress,
+    idempotency_key_table,
+    sign_up_email_table,
+)
+
+T = TypeVar('T')
+
+
+def archived_user(session: Session, *criteria: ColumnElement) -> Optional[User]:
+    """Load the archived user matching, with its contact methods and addresses.
+
+    Archived users are read only, they are mapped as the users of the tables
+    not archived so saving one would UPDATE rows that are gone.
+    """
+    user = session.execute(
+        select(ArchivedUser).where(*criteria).options(noload('*'))
+    ).scalar_one_or_none()
+    if user is None:
+        return None
+
+    # The relationships of the mappings join the tables not archived.
+    contact_methods = session.execute(
+        select(ArchivedContactMethod, ContactMethodType)
+        .join(
+            ContactMethodType,
+            ContactMethodType.id == ArchivedContactMethod.contact_method_type_id
+        )
+        .where(ArchivedContactMethod.user_id == user.id)
+        .order_by(ArchivedContactMethod.id)
+        .options(noload('*'))
+    ).all()
+    for contact_method, contact_method_type in contact_methods:
+        set_committed_value(contact_method, 'type', contact_method_type)
+    set_committed_value(
+        user, 'contact_methods', [contact_method for contact_method, _ in contact_methods]
+    )
+    set_committed_value(user, 'user_addresses', session.execute(
+        select(ArchivedUserAddress).where(ArchivedUserAddress.user_id == user.id)
+    ).scalars().all())
+    return user
+
+
+def archived_sign_up(session: Session, *criteria: ColumnElement) -> Optional[SignUp]:
+    """Load the archived sign up matching."""
+    return session.execute(
+        select(ArchivedSignUp).where(*criteria)
+    ).scalar_one_or_none()
+
+
+def read_archive(
+    session: Session,
+    include_archived: bool,
+    entity: type,
+    load: Callable[..., Optional[T]],
+    *criteria: ColumnElement
+) -> Optional[T]:
+    """Load the archived entity matching, when the archive is included.
+
+    Otherwise raise EntityGoneError when one matches, the caller could try
+    to save it.
+    """
+    if include_archived:
+        return load(session, *criteria)
+    if session.execute(select(exists().where(*criteria))).scalar():
+        raise EntityGoneError(f'{entity.__name__} was archived.')
+    return None
+
+
+def stage_update(
+    user_id: UUID,
+    from_stage: Union[SignUpStage, Collection[SignUpStage]],
+    to_stage: SignUpStage
+) -> Update:
+    """Build the UPDATE moving the sign up of the user from the from stages."""
+    from_stages = [from_stage] if isinstance(from_stage, SignUpStage) \
+        else list(from_stage)
+    return update(SignUp)\
+        .where(SignUp.user_id == user_id, SignUp.stage.in_(from_stages))\
+        .values(stage=to_stage)\
+        .execution_options(synchronize_session=False)
 
 
 class DatabaseRepository:
@@ -42,30 +145,104 @@ class DatabaseRepository:
         """Initialize the session_factory for the subclasses."""
         self.session_factory = session_factory
 
+    def _get(self, entity: Type[T], key: Hashable) -> Optional[T]:
+        """Get an entity by its primary key, from the identity map if held."""
+        def load() -> Optional[T]:
+            with self.session_factory() as session:
+                return session.get(entity, key)
+
+        return cached(entity, key, load)
+
 
 class UserDbRepository(DatabaseRepository, UserRepository):
     """Access to elements of the User collection."""
 
     def save(self, user: User) -> None:
         """Persist a User object."""
+        invalidate(User, user.id)
+        # Its contact methods are saved along.
+        invalidate(ContactMethod)
         with self.session_factory() as session:
             session.add(user)
             session.commit()
 
-    def get_by_id(self, user_id: UUID) -> User:
-        """Retrieve a User object by user id."""
-        with self.session_factory() as session:
-            user = session.get(User, user_id)
+    def get_by_id(self, user_id: UUID, include_archived: bool = False) -> User:
+        """Retrieve a User object by user id.
+
+        Archived users are not held in the identity map, it only holds users
+        that can be saved.
+        """
+        user = self._get(User, user_id)
+        if user is None:
+            with self.session_factory() as session:
+                user = read_archive(
+                    session,
+                    include_archived,
+                    User,
+                    archived_user,
+                    ArchivedUser.id == user_id
+                )
 
         if user is None:
             raise EntityNotFound(User)
 
         return user
 
+    def get_with_sign_up(
+        self,
+        user_id: UUID,
+        include_archived: bool = False
+    ) -> Tuple[User, SignUp]:
+        """Retrieve a User object and its SignUp in a single statement.
+
+        Archived users are looked up when the statement finds none.
+        """
+        entities = current_identity_map()
+        if entities is not None:
+            user, sign_up = entities.get(User, user_id), entities.get(SignUp, user_id)
+            if user is not None and sign_up is not None:
+                return user, sign_up
+
+        with self.session_factory() as session:
+            row = session\
+                .query(User, SignUp)\
+                .outerjoin(SignUp, SignUp.user_id == User.id)\
+                .filter(User.id == user_id)\
+                .one_or_none()
+            archived = row is None
+            if archived:
+                user = read_archive(
+                    session,
+                    include_archived,
+                    User,
+                    archived_user,
+                    ArchivedUser.id == user_id
+                )
+                sign_up = user and archived_sign_up(
+                    session, ArchivedSignUp.user_id == user_id
+                )
+            else:
+                user, sign_up = row
+
+        if archived:
+            # Archived entities are read only, not held for the writes.
+            entities = None
+        if user is None:
+            raise EntityNotFound(User)
+        if entities is not None:
+            entities.add(User, user_id, user)
+        if sign_up is None:
+            raise EntityNotFound(SignUp)
+        if entities is not None:
+            entities.add(SignUp, user_id, sign_up)
+
+        return user, sign_up
+
     def get_by_customer_and_business_model(
         self,
         customer_id: UUID,
         business_model: BusinessModel,
+        include_archived: bool = False
     ) -> Optional[User]:
         """Get a user by its business model."""
         with self.session_factory() as session:
@@ -75,12 +252,24 @@ class UserDbRepository(DatabaseRepository, UserRepository):
                 .filter(
                     ServiceAgreement.business_model == business_model,
                     User.customer_id == customer_id)\
-                .one_or_none()
+                .one_or_none() \
+                or read_archive(
+                    session,
+                    include_archived,
+                    User,
+                    archived_user,
+                    ArchivedUser.customer_id == customer_id,
+                    ArchivedUser.service_agr_id.in_(
+                        select(ServiceAgreement.id)
+                        .where(ServiceAgreement.business_model == business_model)
+                    )
+                )
 
     def get_by_customer_and_service_agr_id(
         self,
         customer_id: UUID,
-        service_agr_id: int
+        service_agr_id: int,
+        include_archived: bool = False
     ) -> Optional[User]:
         """Retrieve a User object by service agreement id."""
         with self.session_factory() as session:
@@ -89,12 +278,21 @@ class UserDbRepository(DatabaseRepository, UserRepository):
                 .filter(
                     User.service_agr_id == service_agr_id,
                     User.customer_id == customer_id)\
-                .one_or_none()
+                .one_or_none() \
+                or read_archive(
+                    session,
+                    include_archived,
+                    User,
+                    archived_user,
+                    ArchivedUser.service_agr_id == service_agr_id,
+                    ArchivedUser.customer_id == customer_id
+                )
 
     def get_by_service_agr_id_and_email(
         self,
         service_agr_id: int,
-        email: str
+        email: str,
+        include_archived: bool = False
     ) -> Optional[User]:
         """Get a user or none by its svc agreement id and email."""
         with self.session_factory() as session:
@@ -107,7 +305,43 @@ class UserDbRepository(DatabaseRepository, UserRepository):
                     ContactMethodType.description == 'EMAIL',
                     ContactMethod.value == email
             ).one_or_none()
-            return obtained_user
+            return obtained_user or read_archive(
+                session,
+                include_archived,
+                User,
+                archived_user,
+                ArchivedUser.service_agr_id == service_agr_id,
+                ArchivedUser.id.in_(
+                    select(ArchivedContactMethod.user_id)
+                    .join(
+                        ContactMethodType,
+                        ContactMethodType.id == ArchivedContactMethod.contact_method_type_id
+                    )
+                    .where(
+                        ContactMethodType.description == 'EMAIL',
+                        ArchivedContactMethod.value == email
+                    )
+                )
+            )
+
+    def set_status(
+        self,
+        user_id: UUID,
+        expected: UserStatus,
+        new: UserStatus
+    ) -> bool:
+        """Change the status with an UPDATE conditioned on the expected one."""
+        invalidate(User, user_id)
+        with self.session_factory() as session:
+            changed = session.execute(
+                update(User)
+                .where(User.id == user_id, User.status == expected)
+                .values(status=new)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            session.commit()
+
+        return changed == 1
 
 
 class ContactMethodTypeDbRepository(
@@ -118,53 +352,310 @@ class ContactMethodTypeDbRepository(
 
     def get(self, description: str) -> ContactMethodType:
         """Retrieve a contact method type by its description."""
-        with self.session_factory() as session:
-            contact_method_type = session.query(ContactMethodType).filter(
-                ContactMethodType.description == description
-            ).one_or_none()
-            return contact_method_type
+        def load() -> Optional[ContactMethodType]:
+            with self.session_factory() as session:
+                return session.query(ContactMethodType).filter(
+                    ContactMethodType.description == description
+                ).one_or_none()
+
+        return cached(ContactMethodType, description, load)
 
 
 class SignUpDbRepository(DatabaseRepository, SignUpRepository):
     """Access to elements of the SignUp collection."""
 
-    def get(self, sign_up_id: UUID) -> SignUp:
+    def get(self, sign_up_id: UUID, include_archived: bool = False) -> SignUp:
         """Get a sign up object by its primary key."""
         with self.session_factory() as session:
-            sign_up: SignUp = session.get(SignUp, sign_up_id)
+            sign_up: Optional[SignUp] = session.get(SignUp, sign_up_id)
+            if sign_up is None:
+                sign_up = read_archive(
+                    session,
+                    include_archived,
+                    SignUp,
+                    archived_sign_up,
+                    ArchivedSignUp.id == sign_up_id
+                )
 
         if sign_up is None:
             raise EntityNotFound(SignUp)
 
         return sign_up
 
-    def get_by_user_id(self, user_id: UUID) -> SignUp:
-        """Get a sign up object by its user id."""
-        with self.session_factory() as session:
-            try:
+    def get_by_user_id(self, user_id: UUID, include_archived: bool = False) -> SignUp:
+        """Get a sign up object by its user id.
+
+        Sign ups are held in the identity map by their user id, the archived
+        ones are not.
+        """
+        def load() -> Optional[SignUp]:
+            with self.session_factory() as session:
                 return session.query(SignUp)\
                     .filter(SignUp.user_id == user_id)\
-                    .one()
-            except NoResultFound as err:
-                raise EntityNotFound(SignUp) from err
+                    .one_or_none()
+
+        sign_up = cached(SignUp, user_id, load)
+        if sign_up is None:
+            with self.session_factory() as session:
+                sign_up = read_archive(
+                    session,
+                    include_archived,
+                    SignUp,
+                    archived_sign_up,
+                    ArchivedSignUp.user_id == user_id
+                )
+
+        if sign_up is None:
+            raise EntityNotFound(SignUp)
+
+        return sign_up
 
     def save(self, sign_up: SignUp) -> None:
         """Persist a SignUp object."""
+        invalidate(SignUp)
         with self.session_factory() as session:
             session.add(sign_up)
             session.commit()
 
+    def transition_stage(
+        self,
+        user_id: UUID,
+        from_stage: Union[SignUpStage, Collection[SignUpStage]],
+        to_stage: SignUpStage
+    ) -> bool:
+        """Change the stage with an UPDATE conditioned on the from ones."""
+        invalidate(SignUp, user_id)
+        with self.session_factory() as session:
+            changed = session.execute(
+                stage_update(user_id, from_stage, to_stage)
+            ).rowcount
+            session.commit()
+
+        return changed == 1
+
+    def confirm_contact_method(
+        self,
+        user_id: UUID,
+        contact_method_id: UUID,
+        confirmation_value: str,
+        confirmed_at: datetime,
+        from_stage: Union[SignUpStage, Collection[SignUpStage]],
+        to_stage: SignUpStage
+    ) -> ConfirmationOutcome:
+        """Run the conditional UPDATEs of both in a transaction.
+
+        It is rolled back as soon as one of them matches no row.
+        """
+        invalidate(ContactMethod, contact_method_id)
+        invalidate(User, user_id)
+        invalidate(SignUp, user_id)
+        with self.session_factory() as session:
+            confirmed = session.execute(
+                update(ContactMethod)
+                .where(
+                    ContactMethod.id == contact_method_id,
+                    ContactMethod.user_id == user_id,
+                    ContactMethod.confirmation_value == confirmation_value,
+                    ContactMethod.confirmation_confirmed_at.is_(None),
+                    ContactMethod.confirmation_expire_at >= confirmed_at
+                )
+                .values(confirmation_confirmed_at=confirmed_at)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if confirmed != 1:
+                session.rollback()
+                return ConfirmationOutcome.INVALID_CONFIRMATION
+
+            moved = session.execute(
+                stage_update(user_id, from_stage, to_stage)
+            ).rowcount
+            if moved != 1:
+                session.rollback()
+                return ConfirmationOutcome.STAGE_CHANGED
+
+            session.commit()
+
+        return ConfirmationOutcome.CONFIRMED
+
+    def create_or_renew(
+        self,
+        sign_up: SignUp,
+        user: User,
+        contact_method: ContactMethod
+    ) -> SignUpAttempt:
+        """Create the sign up of the email, or renew its expired confirmation.
+
+        The email is claimed in sign_up_emails with an ``INSERT .. ON CONFLICT
+        DO UPDATE``, which returns the user holding it and locks its row until
+        the transaction ends.
+        """
+        table = sign_up_email_table
+        # Users saved without signing up, as the seeders do, hold their email
+        # without a row in sign_up_emails.
+        registered_user_id = select(ContactMethod.user_id)\
+            .join(User, User.id == ContactMethod.user_id)\
+            .join(ContactMethodType)\
+            .where(
+                User.service_agr_id == user.service_agr_id,
+                ContactMethodType.description == 'EMAIL',
+                ContactMethod.value == contact_method.value)\
+            .limit(1)\
+            .scalar_subquery()
+        claim = insert(table).values(
+            service_agr_id=user.service_agr_id,
+            email=contact_method.value,
+            user_id=func.coalesce(
+                registered_user_id, literal(user.id, table.c.user_id.type)
+            )
+        )
+        claim = claim.on_conflict_do_update(
+            index_elements=[table.c.service_agr_id, table.c.email],
+            set_={'user_id': table.c.user_id}
+        ).returning(table.c.user_id)
+
+        with self.session_factory() as session:
+            user_id = session.execute(claim).scalar_one()
+            if user_id == user.id:
+                return self.__create(session, sign_up, user, contact_method)
+
+            # The confirmation of the registered user may be renewed below.
+            invalidate(User, user_id)
+            invalidate(SignUp, user_id)
+            invalidate(ContactMethod)
+            # Archived users confirmed their email, they are never renewed.
+            registered_user = session.get(User, user_id) \
+                or archived_user(session, ArchivedUser.id == user_id)
+            if registered_user is None:
+                # The user was deleted without its claim, which is still
+                # locked: the new user takes it over.
+                session.execute(
+                    update(table)
+                    .where(
+                        table.c.service_agr_id == user.service_agr_id,
+                        table.c.email == contact_method.value
+                    )
+                    .values(user_id=user.id)
+                )
+                return self.__create(session, sign_up, user, contact_method)
+
+            registered_contact_method = next(
+                (
+                    cm for cm in registered_user.contact_methods_of('EMAIL')
+                    if cm.value == contact_method.value
+                ),
+                None
+            )
+            if registered_contact_method is None:
+                raise EmailClaimError(contact_method.value, user_id)
+            confirmation = registered_contact_method.contact_confirmation
+            if not confirmation.is_expired:
+                session.commit()
+                return SignUpAttempt(
+                    SignUpOutcome.STILL_PENDING
+                    if confirmation.is_still_pending
+                    else SignUpOutcome.ALREADY_CONFIRMED,
+                    registered_user,
+                    registered_contact_method
+                )
+
+            registered_contact_method.contact_confirmation = confirmation.recreate(
+                expire_at=contact_method.contact_confirmation.expire_at
+            )
+            registered_sign_up = session.query(SignUp)\
+                .filter(SignUp.user_id == user_id)\
+                .one()
+            session.commit()
+
+        return SignUpAttempt(
+            SignUpOutcome.RENEWED,
+            registered_user,
+            registered_contact_method,
+            registered_sign_up
+        )
+
+    def __create(
+        self,
+        session: Session,
+        sign_up: SignUp,
+        user: User,
+        contact_method: ContactMethod
+    ) -> SignUpAttempt:
+        """Save the user and its sign up on the session holding the claim."""
+        # The sign up is not related to the user in the mappings, the user is
+        # flushed first for its foreign key.
+        session.add(user)
+        session.flush()
+        session.add(sign_up)
+        session.commit()
+        return SignUpAttempt(SignUpOutcome.CREATED, user, contact_method, sign_up)
+
+    def create_many(
+        self,
+        sign_ups: Collection[Tuple[SignUp, User, ContactMethod]]
+    ) -> List[SignUpAttempt]:
+        """Create the sign ups of the emails no user holds, at once.
+
+        The emails held by the users saved without signing up are looked up
+        in one query, the rest are claimed in one ``INSERT .. ON CONFLICT DO
+        NOTHING``, which skips the emails already claimed. The users, contact
+        methods and sign ups of the emails claimed are inserted a table at a
+        time.
+        """
+        if not sign_ups:
+            return []
+
+        table = sign_up_email_table
+        emails = [
+            (user.service_agr_id, contact_method.value)
+            for _, user, contact_method in sign_ups
+        ]
+
+        with self.session_factory() as session:
+            registered = set(session.execute(
+                select(User.service_agr_id, ContactMethod.value)
+                .join(ContactMethod, ContactMethod.user_id == User.id)
+                .join(ContactMethodType)
+                .where(
+                    ContactMethodType.description == 'EMAIL',
+                    tuple_(User.service_agr_id, ContactMethod.value).in_(emails)
+                )
+            ).all())
+            claims = [
+                {
+                    'service_agr_id': user.service_agr_id,
+                    'email': contact_method.value,
+                    'user_id': user.id,
+                }
+                for _, user, contact_method in sign_ups
+                if (user.service_agr_id, contact_method.value) not in registered
+            ]
+            claimed = set(session.execute(
+                insert(table).values(claims).on_conflict_do_nothing(
+                    index_elements=[table.c.service_agr_id, table.c.email]
+                ).returning(table.c.user_id)
+            ).scalars()) if claims else set()
+
+            created = [
+                SignUpAttempt(SignUpOutcome.CREATED, user, contact_method, sign_up)
+                for sign_up, user, contact_method in sign_ups
+                if user.id in claimed
+            ]
+            # The sign ups are not related to the users in the mappings, the
+            # users are flushed first for their foreign keys.
+            session.add_all([attempt.user for attempt in created])
+            session.flush()
+            session.add_all([attempt.sign_up for attempt in created])
+            session.commit()
+
+        return created
+
 
 class ContactMethodDbRepository(DatabaseRepository, ContactMethodRepository):
     """Access to elements of the ContactMethod collection."""
 
     def get(self, contact_method_id: UUID) -> ContactMethod:
         """Retrieve a contact method object by its ID."""
-        with self.session_factory() as session:
-            contact_method: ContactMethod = session.get(
-                ContactMethod,
-                contact_method_id
-            )
+        contact_method = self._get(ContactMethod, contact_method_id)
 
         if contact_method is None:
             raise EntityNotFound(ContactMethod)
@@ -173,6 +664,9 @@ class ContactMethodDbRepository(DatabaseRepository, ContactMethodRepository):
 
     def save(self, contact_method: ContactMethod) -> None:
         """Persist a ContactMethod object."""
+        invalidate(ContactMethod, contact_method.id)
+        # Users hold their contact methods.
+        invalidate(User, contact_method.user_id)
         with self.session_factory() as session:
             session.add(contact_method)
             session.commit()
@@ -213,6 +707,7 @@ class ServiceAgreementDbRepository(
 
     def save(self, service_agreement: ServiceAgreement) -> None:
         """Insert a service agreement in the database."""
+        invalidate(ServiceAgreement, service_agreement.id)
         with self.session_factory() as session:
             session.add(service_agreement)
             session.commit()
@@ -220,11 +715,7 @@ class ServiceAgreementDbRepository(
     def get(self, service_agreement_id: int) -> ServiceAgreement:
         """Retrieve a contact method object by its ID."""
         try:
-            with self.session_factory() as session:
-                service_agreement: ServiceAgreement = session.get(
-                    ServiceAgreement,
-                    service_agreement_id
-                )
+            service_agreement = self._get(ServiceAgreement, service_agreement_id)
         except Exception as error:
             raise StorageReadError(
                 "Tried to retrieve service agreements."
@@ -233,3 +724,97 @@ class ServiceAgreementDbRepository(
             raise EntityNotFound(ServiceAgreement)
 
         return service_agreement
+
+
+class IdempotencyKeyDbRepository(DatabaseRepository, IdempotencyKeyRepository):
+    """Access to the responses stored in the idempotency_keys table.
+
+    Claims are taken with an ``INSERT .. ON CONFLICT DO NOTHING``, so two
+    requests racing for a key can not both run. The expired keys are deleted
+    every ``purge_every`` claims.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[..., AbstractAsyncContextManager[Session]],
+        ttl_seconds: Optional[Union[int, str]] = None,
+        purge_every: int = 100
+    ):
+        """Initialize the expiration of the keys."""
+        super().__init__(session_factory)
+        self.ttl = timedelta(seconds=int(ttl_seconds or self.TTL_SECONDS))
+        self.lock = timedelta(seconds=self.LOCK_SECONDS)
+        self.purge_every = purge_every
+        self.__claims = count()
+
+    def claim(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """Claim the key, or return the response stored under it."""
+        table = idempotency_key_table
+        now = datetime.utcnow()
+        claimed_values = {
+            'fingerprint': fingerprint,
+            'status_code': None,
+            'body': None,
+            'media_type': None,
+            'created_at': now,
+            'expire_at': now + self.lock,
+        }
+        with self.session_factory() as session:
+            if next(self.__claims) % self.purge_every == 0:
+                session.execute(delete(table).where(table.c.expire_at < now))
+
+            claimed = session.execute(
+                insert(table)
+                .values(key=key, **claimed_values)
+                .on_conflict_do_nothing(index_elements=[table.c.key])
+            ).rowcount or session.execute(
+                update(table)
+                .where(table.c.key == key, table.c.expire_at < now)
+                .values(**claimed_values)
+            ).rowcount
+            stored = None if claimed else session.execute(
+                select(table).where(table.c.key == key)
+            ).one_or_none()
+            session.commit()
+
+        if claimed:
+            return None
+        if stored is not None and stored.fingerprint != fingerprint:
+            raise IdempotencyKeyReusedError()
+        if stored is None or stored.status_code is None:
+            raise IdempotencyKeyInUseError()
+
+        return StoredResponse(
+            status_code=stored.status_code,
+            body=stored.body,
+            media_type=stored.media_type
+        )
+
+    def complete(self, key: str, fingerprint: str, response: StoredResponse) -> None:
+        """Store the response under the key claimed by the request."""
+        table = idempotency_key_table
+        with self.session_factory() as session:
+            session.execute(
+                update(table)
+                .where(table.c.key == key, table.c.fingerprint == fingerprint)
+                .values(
+                    status_code=response.status_code,
+                    body=response.body,
+                    media_type=response.media_type,
+                    expire_at=datetime.utcnow() + self.ttl
+                )
+            )
+            session.commit()
+
+    def release(self, key: str, fingerprint: str) -> None:
+        """Delete the claim of the request on the key."""
+        table = idempotency_key_table
+        with self.session_factory() as session:
+            session.execute(
+                delete(table).where(
+                    table.c.key == key,
+                    table.c.fingerprint == fingerprint,
+                    table.c.status_code.is_(None)
+                )
+            )
+            session.commit()
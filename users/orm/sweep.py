@@ -0,0 +1,172 @@
+"""Delete the sign ups abandoned and the contact confirmations expired long ago.
+
+Run it with ``python -m users.orm.sweep`` from a scheduled job. Rows expired
+for longer than ``--retention-days`` are swept:
+
+- Abandoned sign ups: sign ups still in ``EMAIL_CONFIRMATION`` whose contact
+  methods are unconfirmed and expired. Their users go along with their
+  contact methods, addresses and the claim of their email, which can sign up
+  again from scratch.
+- Expired confirmations: contact methods other than emails, as the phones,
+  never confirmed. Emails are only swept along with their sign ups, they
+  hold the claim of the email.
+
+Rows are walked by primary key in batches of ``--batch-size``, each deleted
+in its own transaction, sleeping ``--pause`` seconds between batches.
+"""
+from argparse import ArgumentParser, Namespace
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import sys
+import time
+from typing import Callable, List, Optional
+
+from sqlalchemy import and_, delete, exists, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+from users.containers import UserContainer
+from users.core.models.states import SignUpStage
+from users.orm.batches import add_batch_arguments, BatchJob
+from users.orm.mappings import (
+    contact_method_table,
+    contact_method_type_table,
+    sign_up_email_table,
+    sign_up_table,
+    user_address_table,
+    user_table,
+)
+
+# The tables holding the rows of a user, deleted before the user.
+USER_TABLES = (
+    contact_method_table,
+    user_address_table,
+    sign_up_table,
+    sign_up_email_table,
+)
+
+
+@dataclass
+class Sweep:
+    """Rows swept, or found when dry running."""
+
+    sign_ups: int = 0
+    contact_methods: int = 0
+
+
+class Sweeper(BatchJob):
+    """Sweep the rows expired before the retention in bounded batches."""
+
+    def __init__(
+        self,
+        session_factory: Callable[..., AbstractContextManager[Session]],
+        retention: timedelta,
+        batch_size: int = 500,
+        pause: float = 1.0,
+        dry_run: bool = False,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        """Initialize the retention and the batch limits."""
+        super().__init__(
+            session_factory,
+            batch_size=batch_size,
+            pause=pause,
+            dry_run=dry_run,
+            sleep=sleep
+        )
+        self.retention = retention
+
+    def sweep(self, now: Optional[datetime] = None) -> Sweep:
+        """Sweep the abandoned sign ups, then the expired confirmations."""
+        cutoff = (now or datetime.now()) - self.retention
+        return Sweep(
+            sign_ups=self.sweep_sign_ups(cutoff),
+            contact_methods=self.sweep_contact_methods(cutoff),
+        )
+
+    def sweep_sign_ups(self, cutoff: datetime) -> int:
+        """Delete the users whose sign up was abandoned before the cutoff."""
+        abandoned = self.__abandoned(cutoff)
+
+        def delete_users(session: Session, user_ids: List) -> int:
+            # Renewals claim the email first, waiting for them lets the check
+            # below see the confirmations they renew.
+            session.execute(
+                select(sign_up_email_table.c.email)
+                .where(sign_up_email_table.c.user_id.in_(user_ids))
+                .with_for_update()
+            )
+            user_ids = session.execute(
+                select(sign_up_table.c.user_id)
+                .where(sign_up_table.c.user_id.in_(user_ids), abandoned)
+            ).scalars().all()
+            for table in USER_TABLES:
+                session.execute(delete(table).where(table.c.user_id.in_(user_ids)))
+            session.execute(delete(user_table).where(user_table.c.id.in_(user_ids)))
+            return len(user_ids)
+
+        return self.walk(sign_up_table.c.user_id, abandoned, delete_users)
+
+    def sweep_contact_methods(self, cutoff: datetime) -> int:
+        """Delete the contact methods, but emails, expired before the cutoff."""
+        expired = and_(
+            contact_method_table.c.confirmation_confirmed_at.is_(None),
+            contact_method_table.c.confirmation_expire_at < cutoff,
+            contact_method_table.c.contact_method_type_id.in_(
+                select(contact_method_type_table.c.id)
+                .where(contact_method_type_table.c.description != 'EMAIL')
+            ),
+        )
+
+        def delete_contact_methods(session: Session, ids: List) -> int:
+            # Confirmations renewed meanwhile no longer match.
+            return session.execute(
+                delete(contact_method_table)
+                .where(contact_method_table.c.id.in_(ids), expired)
+            ).rowcount
+
+        return self.walk(contact_method_table.c.id, expired, delete_contact_methods)
+
+    def __abandoned(self, cutoff: datetime) -> ColumnElement:
+        alive = contact_method_table.c.user_id == sign_up_table.c.user_id
+        return and_(
+            sign_up_table.c.stage == SignUpStage.EMAIL_CONFIRMATION,
+            ~exists().where(alive, or_(
+                contact_method_table.c.confirmation_confirmed_at.isnot(None),
+                contact_method_table.c.confirmation_expire_at >= cutoff,
+            )),
+        )
+
+
+def parse_args(argv: List[str]) -> Namespace:
+    """Parse the command line arguments."""
+    parser = ArgumentParser(prog='python -m users.orm.sweep')
+    parser.add_argument('--retention-days', type=float, default=30,
+                        help='days the expired rows are kept')
+    return add_batch_arguments(parser).parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    """Sweep the database of ``DB_URI`` and return the exit status."""
+    args = parse_args(argv)
+    container = UserContainer()
+    container.config.db_uri.from_env('DB_URI')
+    sweep = Sweeper(
+        container.database().session,
+        retention=timedelta(days=args.retention_days),
+        batch_size=args.batch_size,
+        pause=args.pause,
+        dry_run=args.dry_run,
+    ).sweep()
+
+    verb = 'Found' if args.dry_run else 'Swept'
+    print(
+        f'{verb} {sweep.sign_ups} abandoned sign ups and '
+        f'{sweep.contact_methods} expired contact confirmations.'
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
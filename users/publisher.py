@@ -0,0 +1,229 @@
+"""Publish the events emitted by the handlers off the request path.
+
+``EventManager.emit`` publishes an event to the broker before it returns, so
+every sign up waited for the broker and a broker hiccup showed up as HTTP
+latency. The ``EventPublisher`` of each process takes its place: ``emit``
+resolves the properties of the event and queues it, and a background thread
+publishes the queued events in batches through a single ``EventManager``,
+which keeps using the channel of the ``BrokerConnector``.
+
+The queue is bounded. Events failing to publish are retried, in order,
+pausing longer each time, until the broker takes them, so the queue fills up
+while it is down. ``emit`` then waits up to ``full_timeout`` seconds for room
+and raises ``EventQueueFullError``, answered as 503, instead of dropping the
+event. The events queued are published when the process exits, for a while;
+the ones left are counted in the log.
+
+The payloads hold the emails, phones and codes of the users, only the names
+and ccids of the events are logged.
+"""
+import atexit
+from dataclasses import dataclass
+from logging import Logger
+import os
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+import time
+from typing import Callable, Dict, List, Optional, Text
+from uuid import UUID
+
+from nwevents import Event, EventManager
+
+from users.core.exceptions import EventQueueFullError
+
+
+class ResolvedEvent(Event):
+    """An event whose properties were resolved once, when emitted.
+
+    The entities of the event may change after the handler returns, and some
+    properties, as the ccid of the saved events, change on every access.
+    """
+
+    def __init__(self, event: Event):
+        """Resolve the properties of the event."""
+        self.__ccid = event.ccid
+        self.__source = event.source
+        self.__name = event.name
+        self.__payload = event.payload
+
+    @property
+    def ccid(self) -> UUID:
+        """Retrieve the correlational id resolved."""
+        return self.__ccid
+
+    @property
+    def source(self) -> Text:
+        """Retrieve the exchange name resolved."""
+        return self.__source
+
+    @property
+    def name(self) -> Text:
+        """Retrieve the event name resolved."""
+        return self.__name
+
+    @property
+    def payload(self) -> Dict:
+        """Retrieve the payload resolved."""
+        return self.__payload
+
+
+@dataclass
+class PublisherStats:
+    """Events handled by a publisher since it started."""
+
+    published: int = 0
+    batches: int = 0
+    retries: int = 0
+    rejected: int = 0
+
+
+class EventPublisher:
+    """Queue the emitted events and publish them from a background thread.
+
+    Honors the ``emit`` contract of ``nwevents.EventManager`` so it can be
+    injected into the handlers in its place.
+    """
+
+    def __init__(
+        self,
+        event_manager: EventManager,
+        logger: Optional[Logger] = None,
+        queue_size: int = 10000,
+        batch_size: int = 100,
+        linger: float = 0.005,
+        full_timeout: float = 1.0,
+        retry_pause: float = 0.1,
+        max_retry_pause: float = 5.0,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """Initialize the queue limits, the thread starts on the first emit.
+
+        A batch is published once ``batch_size`` events are queued, or
+        ``linger`` seconds after its first event.
+        """
+        self.event_manager = event_manager
+        self.logger = logger
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.linger = linger
+        self.full_timeout = full_timeout
+        self.retry_pause = retry_pause
+        self.max_retry_pause = max_retry_pause
+        self.stats = PublisherStats()
+        self.__sleep = sleep
+        self.__lock = Lock()
+        self.__queue: Optional[Queue] = None
+        self.__thread: Optional[Thread] = None
+        self.__pid: Optional[int] = None
+
+    def emit(self, event: Event) -> None:
+        """Queue the event to be published, waiting while the queue is full.
+
+        Raise EventQueueFullError when it is still full after ``full_timeout``.
+        """
+        event = ResolvedEvent(event)
+        try:
+            self.__started().put(event, timeout=self.full_timeout)
+        except Full:
+            with self.__lock:
+                self.stats.rejected += 1
+            if self.logger is not None:
+                self.logger.error({
+                    'event_publisher': 'queue full, rejected',
+                    **self.__identify(event),
+                })
+            raise EventQueueFullError(f'{event.source}.{event.name}')
+
+    def flush(self) -> None:
+        """Wait until the events queued so far are published."""
+        if self.__pid == os.getpid():
+            self.__queue.join()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Publish the events queued, waiting up to ``timeout`` seconds."""
+        with self.__lock:
+            thread = self.__thread
+        if thread is None or self.__pid != os.getpid():
+            return
+
+        deadline = time.monotonic() + timeout
+        try:
+            self.__queue.put(None, timeout=timeout)
+        except Full:
+            # The thread is still retrying the queued events, logged below.
+            pass
+        thread.join(max(deadline - time.monotonic(), 0))
+        if not thread.is_alive():
+            # The events emitted afterwards start another thread.
+            self.__pid = None
+        elif self.logger is not None:
+            self.logger.error({
+                'event_publisher': 'closed with events unpublished',
+                'unpublished': self.__queue.qsize(),
+            })
+
+    def __started(self) -> Queue:
+        # Threads do not survive forks, the forked processes start their own.
+        if self.__pid == os.getpid():
+            return self.__queue
+
+        with self.__lock:
+            if self.__pid != os.getpid():
+                self.__queue = Queue(maxsize=self.queue_size)
+                self.__thread = Thread(
+                    target=self.__run,
+                    args=(self.__queue,),
+                    name='event-publisher',
+                    daemon=True
+                )
+                self.__thread.start()
+                self.__pid = os.getpid()
+                atexit.unregister(self.close)
+                atexit.register(self.close)
+        return self.__queue
+
+    def __run(self, queue: Queue) -> None:
+        while True:
+            batch = self.__next_batch(queue)
+            events = [event for event in batch if event is not None]
+            for event in events:
+                self.__publish(event)
+            if events:
+                self.stats.batches += 1
+            for _ in batch:
+                queue.task_done()
+            if len(events) < len(batch):
+                return
+
+    def __next_batch(self, queue: Queue) -> List[Optional[Event]]:
+        batch = [queue.get()]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_size and batch[-1] is not None:
+            try:
+                batch.append(queue.get(timeout=max(deadline - time.monotonic(), 0)))
+            except Empty:
+                break
+        return batch
+
+    def __publish(self, event: Event) -> None:
+        pause = self.retry_pause
+        while True:
+            try:
+                self.event_manager.emit(event)
+                self.stats.published += 1
+                return
+            except Exception as error:
+                self.stats.retries += 1
+                if self.logger is not None:
+                    self.logger.warning({
+                        'event_publisher': 'publish failed, retrying',
+                        **self.__identify(event),
+                        'error': repr(error),
+                        'retry_in_s': pause,
+                    })
+                self.__sleep(pause)
+                pause = min(pause * 2, self.max_retry_pause)
+
+    @staticmethod
+    def __identify(event: Event) -> Dict[str, str]:
+        return {'event': f'{event.source}.{event.name}', 'ccid': str(event.ccid)}
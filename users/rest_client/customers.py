@@ -9,6 +9,7 @@ from users.core.actions import UpdateLegalValidation
 from users.core.exceptions import DependencyError
 from users.core.models import Customer, Identity
 from users.core.repositories import CustomerRepository
+from users.odm.registry import get_schema
 from users.odm.schemas import (
     CreateCustomerRequestSchema,
     CreateCustomerResponseSchema,
@@ -34,7 +35,7 @@ class CustomerHttpRepository(CustomerRepository):
             .version('v1')\
             .root('customers')\
             .set_ccid_provider(ccid_provider)
-        self.schema = CustomerResource
+        self.schema = get_schema(CustomerResource)
 
     def __handle_http_error(self, response: Response):
         data = response.json()
@@ -47,7 +48,7 @@ class CustomerHttpRepository(CustomerRepository):
             response = request.get(f'{str(customer_id)}')
 
         json_data = response.json()['data']
-        deserialized_customer = self.schema().load(json_data).data
+        deserialized_customer = self.schema.load(json_data).data
 
         return deserialized_customer
 
@@ -57,7 +58,7 @@ class CustomerHttpRepository(CustomerRepository):
             response = request.get(params={'identity_dni': dni})
 
         json_data = response.json()['data']
-        deserialized_customer_list = self.schema()\
+        deserialized_customer_list = self.schema\
             .load(json_data, many=True)\
             .data
 
@@ -69,7 +70,7 @@ class CustomerHttpRepository(CustomerRepository):
             response = request.get(params={'identity_cuil': cuil})
 
         json_data = response.json()['data']
-        deserialized_customer_list = self.schema()\
+        deserialized_customer_list = self.schema\
             .load(json_data, many=True)\
             .data
 
@@ -79,7 +80,7 @@ class CustomerHttpRepository(CustomerRepository):
         """Update a legal validation."""
         try:
 
-            payload = UpdateLegalValidationRequest().dump(action).data
+            payload = get_schema(UpdateLegalValidationRequest).dump(action).data
             self.request_builder.patch(
                 f'{str(action.customer_id)}/legal_validation',
                 data=payload
@@ -89,10 +90,10 @@ class CustomerHttpRepository(CustomerRepository):
 
     def create(self, from_identity: Identity) -> UUID:
         """Create a new customer from the obtained identity."""
-        request_data = CreateCustomerRequestSchema().dump(from_identity).data
+        request_data = get_schema(CreateCustomerRequestSchema).dump(from_identity).data
         with self.request_builder as request:
             response = request.post(data=request_data)
 
         json_data = response.json()['data']
-        data = CreateCustomerResponseSchema().load(json_data).data
+        data = get_schema(CreateCustomerResponseSchema).load(json_data).data
         return data['id']
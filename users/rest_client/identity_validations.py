@@ -19,6 +19,7 @@ from users.core.models import (
     PerformIdentityValidationResponse
 )
 from users.core.repositories import IdentityValidationRepository
+from users.odm.registry import get_schema
 from users.odm.schemas import (
     ConfirmIdentityResponseSchema,
     IdentitySchema,
@@ -76,7 +77,7 @@ class IdentityValidationHttpRepository(IdentityValidationRepository):
             response = request.patch(f'{user_id}')
 
         json_data = response.json()['data']
-        data = ConfirmIdentityResponseSchema().load(json_data).data
+        data = get_schema(ConfirmIdentityResponseSchema).load(json_data).data
         return data['user_id']
 
     def validate_identity(
@@ -84,7 +85,9 @@ class IdentityValidationHttpRepository(IdentityValidationRepository):
         data: RequestUserIdentityValidation
     ) -> Optional[UUID]:
         """Perform identity validation request and return result data."""
-        serialized_data = RequestUserIdentityValidationSchema().dump(data).data
+        serialized_data = get_schema(RequestUserIdentityValidationSchema)\
+            .dump(data)\
+            .data
 
         with self.request_builder as request:
             response = request.post(data=serialized_data)
@@ -95,7 +98,7 @@ class IdentityValidationHttpRepository(IdentityValidationRepository):
 
         json_data = response.json()['data']
         perform_identity_validation: PerformIdentityValidationResponse = \
-            PostIdentityValidationResponseSchema()\
+            get_schema(PostIdentityValidationResponseSchema)\
             .load(json_data)\
             .data
 
@@ -114,6 +117,8 @@ class IdentityValidationHttpRepository(IdentityValidationRepository):
             response = request.get(f'{user_id}')
 
         json_data = response.json()['data']
-        deserialized_identity: Identity = IdentitySchema().load(json_data).data
+        deserialized_identity: Identity = get_schema(IdentitySchema)\
+            .load(json_data)\
+            .data
 
         return deserialized_identity
@@ -10,6 +10,7 @@ from users.api.providers import RestApiCCIDProvider
 from users.core.exceptions import MissingAddressError
 from users.core.models import Address
 from users.core.repositories import AddressRepository
+from users.odm.registry import get_schema
 from users.odm.schemas import AddressSchema
 
 
@@ -26,7 +27,7 @@ class MerlinHttpRepository(AddressRepository):
             .root('address')\
             .set_ccid_provider(ccid_provider)\
             .set_error_handler(self.__merlin_error_handler)
-        self.schema = AddressSchema()
+        self.schema = get_schema(AddressSchema)
 
     def __merlin_error_handler(
             self,
@@ -0,0 +1,13 @@
+from typing import Iterator
+
+import pytest
+
+from users.tests.database import create_test_schema, drop_test_schema
+
+
+@pytest.fixture(scope='session', autouse=True)
+def migrated_schema() -> Iterator[None]:
+    """Migrate the schema once, the test cases roll back their changes."""
+    create_test_schema()
+    yield
+    drop_test_schema()
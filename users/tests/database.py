@@ -0,0 +1,105 @@
+from contextlib import contextmanager
+from functools import lru_cache
+import os
+from typing import Iterator
+
+from alembic.command import downgrade, upgrade
+from alembic.config import Config
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, SessionTransaction
+
+from users.orm import Database
+from users.orm.instrumentation import instrument, QueryStats, track_queries
+
+# Every pytest-xdist worker migrates and uses its own schema.
+WORKER = os.environ.get('PYTEST_XDIST_WORKER')
+SCHEMA = f'test_{WORKER}' if WORKER else None
+
+
+@lru_cache(maxsize=None)
+def engine() -> Engine:
+    """Create the engine shared by every test of the session."""
+    connect_args = {}
+    if SCHEMA is not None:
+        connect_args['options'] = f'-csearch_path={SCHEMA}'
+
+    return instrument(create_engine(
+        os.environ.get('DB_URI'),
+        future=True,
+        connect_args=connect_args
+    ))
+
+
+def alembic_config(connection: Connection) -> Config:
+    """Configure alembic to migrate through the given connection."""
+    config = Config(os.environ.get('ALEMBIC_CONFIG'))
+    config.attributes['connection'] = connection
+    return config
+
+
+def create_test_schema() -> None:
+    """Migrate the test schema once for the whole test session."""
+    with engine().connect() as connection:
+        if SCHEMA is not None:
+            connection.execute(text(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE'))
+            connection.execute(text(f'CREATE SCHEMA {SCHEMA}'))
+            connection.commit()
+        upgrade(alembic_config(connection), 'head')
+        connection.commit()
+
+
+def drop_test_schema() -> None:
+    """Remove what create_test_schema built."""
+    with engine().connect() as connection:
+        if SCHEMA is not None:
+            connection.execute(text(f'DROP SCHEMA {SCHEMA} CASCADE'))
+        else:
+            downgrade(alembic_config(connection), 'base')
+        connection.commit()
+
+    engine().dispose()
+
+
+class RollbackTransaction:
+    """Run the sessions of a test inside a transaction rolled back at the end.
+
+    The sessions of the database work on a SAVEPOINT, restarted every time
+    they commit or roll back, so the code under test can commit freely.
+    """
+
+    def __init__(self, database: Database):
+        """Begin the transaction and bind the database sessions to it."""
+        self.database = database
+        self.connection = engine().connect()
+        self.transaction = self.connection.begin()
+        self.savepoint = self.connection.begin_nested()
+        event.listen(Session, 'after_transaction_end', self.restart_savepoint)
+        database.bind(self.connection)
+
+    def restart_savepoint(
+        self,
+        session: Session,
+        transaction: SessionTransaction
+    ) -> None:
+        """Open a new SAVEPOINT once a session ended the current one."""
+        if not self.savepoint.is_active:
+            self.savepoint = self.connection.begin_nested()
+
+    def rollback(self) -> None:
+        """Discard everything the test wrote and release the connection."""
+        event.remove(Session, 'after_transaction_end', self.restart_savepoint)
+        self.database.bind(self.database.engine)
+        self.transaction.rollback()
+        self.connection.close()
+
+
+@contextmanager
+def max_statements(limit: int) -> Iterator[QueryStats]:
+    """Fail when the block issues more SQL statements than the budget."""
+    with track_queries() as stats:
+        yield stats
+
+    assert stats.count <= limit, \
+        f'{stats.count} statements executed, at most {limit} expected:\n' \
+        + '\n'.join(stats.statements)
@@ -1,4 +1,5 @@
 from contextlib import contextmanager
+from datetime import datetime
 from unittest.mock import MagicMock
 from uuid import uuid4
 
@@ -15,6 +16,7 @@ from users.core.models import (
     SignUp
 )
 from users.core.models.states import (
+    ConfirmationOutcome,
     ContactConfirmationType,
     SignUpStage
 )
@@ -23,6 +25,7 @@ from users.tests.mock_factory import (
     contact_method_factory_mock,
     user_factory_mock,
 )
+from users.tests.database import max_statements
 from users.tests.test_core import CoreTestCase
 
 
@@ -75,6 +78,19 @@ class TestConfirmPhoneNumber(CoreTestCase):
         with self.assertNotRaises(ValidationError):
             self.command_bus.handle(action)
 
+    def test_confirm_phone_number_statement_budget(self):
+        """Given user and signup
+        When otp equals that used at the time of user creation
+        Then ConfirmPhoneNumber issues at most 3 statements: the user lookup
+        and the conditional updates of the phone and the sign up stage"""
+        self.user_repo.save(self.returned_user)
+        self.sign_up_repo.save(self.expected_sign_up)
+
+        action = ConfirmPhoneNumber(user_id=self.returned_user.id, otp='1234')
+
+        with max_statements(3):
+            self.command_bus.handle(action)
+
     def test_confirm_phone_number_given_user_and_signup_with_different_otp_fails(self):
         """Given user and signup 
         When otp differs from that used at the time of user creation
@@ -110,4 +126,61 @@ class TestConfirmPhoneNumber(CoreTestCase):
         action = ConfirmPhoneNumber(user_id=uuid4(), otp='1234')
 
         with self.assertRaises(EntityNotFound):
-            self.command_bus.handle(action)
\ No newline at end of file
+            self.command_bus.handle(action)
+
+    def test_confirm_phone_number_twice_fails(self):
+        """Given user and signup
+        When the phone is confirmed and the otp is sent again
+        Then the second ConfirmPhoneNumber action fails"""
+        self.user_repo.save(self.returned_user)
+        self.sign_up_repo.save(self.expected_sign_up)
+
+        action = ConfirmPhoneNumber(user_id=self.returned_user.id, otp='1234')
+        self.command_bus.handle(action)
+
+        with self.assertRaises(ValidationError):
+            self.command_bus.handle(action)
+        assert self.user_repo.get_by_id(self.returned_user.id)\
+            .contact_methods[0].is_confirmed
+
+    def test_confirm_phone_number_keeps_blocked_sign_up_stage(self):
+        """Given user and a blocked signup
+        When ConfirmPhoneNumberHandler is called with the right otp
+        Then the action fails, the sign up stays blocked and the phone
+        stays unconfirmed"""
+        self.expected_sign_up.stage = SignUpStage.SIGN_UP_BLOCKED
+        self.user_repo.save(self.returned_user)
+        self.sign_up_repo.save(self.expected_sign_up)
+
+        action = ConfirmPhoneNumber(user_id=self.returned_user.id, otp='1234')
+
+        with self.assertRaises(ValidationError):
+            self.command_bus.handle(action)
+        assert self.sign_up_repo.get_by_user_id(self.returned_user.id).stage \
+            == SignUpStage.SIGN_UP_BLOCKED
+        assert not self.user_repo.get_by_id(self.returned_user.id)\
+            .contact_methods[0].is_confirmed
+
+    def test_confirm_contact_method_keeps_it_pending_when_stage_changed(self):
+        """Given user and a signup blocked after the handler checked it
+        When the phone is confirmed from the stage the handler saw
+        Then nothing changes, so the otp can still be used"""
+        self.expected_sign_up.stage = SignUpStage.SIGN_UP_BLOCKED
+        self.user_repo.save(self.returned_user)
+        self.sign_up_repo.save(self.expected_sign_up)
+        phone = self.returned_user.contact_methods[0]
+
+        outcome = self.sign_up_repo.confirm_contact_method(
+            self.returned_user.id,
+            phone.id,
+            '1234',
+            datetime.now(),
+            SignUpStage.EMAIL_CONFIRMATION,
+            SignUpStage.PHONE_CONFIRMATION
+        )
+
+        assert outcome is ConfirmationOutcome.STAGE_CHANGED
+        assert self.sign_up_repo.get_by_user_id(self.returned_user.id).stage \
+            == SignUpStage.SIGN_UP_BLOCKED
+        assert not self.user_repo.get_by_id(self.returned_user.id)\
+            .contact_methods[0].is_confirmed
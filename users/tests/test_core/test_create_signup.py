@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock
 
 from users.core.actions import CreateSignUp
@@ -14,6 +15,7 @@ from users.tests.mock_factory import (
     contact_method_factory_mock,
     user_factory_mock,
 )
+from users.tests.database import max_statements
 from users.tests.test_core import CoreTestCase
 
 
@@ -41,6 +43,18 @@ class TestCreateSignUp(CoreTestCase):
         assert created_sign_up is not None
         assert created_sign_up.stage == SignUpStage.EMAIL_CONFIRMATION
 
+    def test_create_sign_up_statement_budget(self):
+        """
+        GIVEN no user registered
+        WHEN CreateSignUpHandler is called with new svcagr_id and email
+        THEN at most 5 statements are issued: the contact method type lookup,
+            the email claim and the user, contact method and sign up inserts
+        """
+        action = CreateSignUp(service_agr_id=0, email='some@email.com')
+
+        with max_statements(5):
+            self.command_bus.handle(action)
+
     def test_create_sign_up_fail_by_existing_active_user(self):
         """
         GIVEN a confirmed user in user repo
@@ -67,3 +81,47 @@ class TestCreateSignUp(CoreTestCase):
         create_sign_up = self.command_bus.handle
 
         self.assertRaises(ValidationError, create_sign_up, action)
+
+    def test_create_sign_up_renews_expired_confirmation(self):
+        """
+        GIVEN a user whose email confirmation expired
+        WHEN CreateSignUp action is called with the user's email and svcagr_id
+        THEN its confirmation is renewed and no other user is created
+        """
+        registered_user = user_factory_mock(
+            contact_methods=[
+                contact_method_factory_mock(
+                    'EMAIL', confirmed=False, value='expired@email.com'
+                )
+            ]
+        )
+        registered_user.contact_methods[0]\
+            .contact_confirmation = contact_confirmation_factory_mock(
+            user_id=str(registered_user.id),
+            contact_method_id=str(registered_user.contact_methods[0].id),
+            confirmed=False,
+            expire_at=datetime.now() - timedelta(hours=1))
+        self.user_repo.save(registered_user)
+        self.sign_up_repo.save(
+            SignUp(SignUpStage.EMAIL_CONFIRMATION, registered_user.id)
+        )
+
+        sign_up = self.command_bus.handle(
+            CreateSignUp(service_agr_id=0, email='expired@email.com')
+        )
+
+        user = self.user_repo.get_by_id(registered_user.id)
+        assert sign_up.user_id == registered_user.id
+        assert user.contact_methods[0].contact_confirmation.is_still_pending
+
+    def test_create_sign_up_fail_by_pending_confirmation(self):
+        """
+        GIVEN a sign up created for an email
+        WHEN CreateSignUp action is called again with the same email
+        THEN CreateSignUp action fails and the first sign up is kept
+        """
+        action = CreateSignUp(service_agr_id=0, email='some@email.com')
+        first_sign_up = self.command_bus.handle(action)
+
+        self.assertRaises(ValidationError, self.command_bus.handle, action)
+        assert self.sign_up_repo.get_by_user_id(first_sign_up.user_id) is not None
@@ -0,0 +1,166 @@
+import json
+from threading import Event as Gate
+from unittest.mock import MagicMock
+
+from users.core.exceptions import EventQueueFullError
+from users.events import SavedContactMethod
+from users.memory import MemoryBroker, MemoryEventManager
+from users.publisher import EventPublisher
+from users.tests.base import BaseTestCase
+
+
+class GatedEventManager(MemoryEventManager):
+    """Record the events once the gate opens, failing the first ``failures``."""
+
+    def __init__(self, failures: int = 0):
+        super().__init__()
+        self.gate = Gate()
+        self.gate.set()
+        self.entered = Gate()
+        self.failures = failures
+
+    def emit(self, event):
+        self.entered.set()
+        self.gate.wait(5)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('broker unavailable')
+        super().emit(event)
+
+
+def contact_method_saved(number: int) -> SavedContactMethod:
+    return SavedContactMethod(phone_number=f'54110000000{number}', confirmation_otp='1234')
+
+
+class TestEventPublisher(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.pauses = []
+        self.event_manager = GatedEventManager()
+        self.publisher = EventPublisher(
+            self.event_manager,
+            batch_size=2,
+            sleep=self.pauses.append
+        )
+
+    def tearDown(self):
+        self.event_manager.gate.set()
+        self.publisher.close()
+        super().tearDown()
+
+    def test_publish_in_order(self):
+        """
+        GIVEN a publisher
+        WHEN events are emitted and the publisher is closed
+        THEN they are all published in order, each with a single ccid
+        """
+        events = [contact_method_saved(number) for number in range(5)]
+        for event in events:
+            self.publisher.emit(event)
+
+        self.publisher.close()
+
+        published = self.event_manager.events
+        assert [event.payload for event in published] == [
+            event.payload for event in events
+        ]
+        assert self.publisher.stats.published == 5
+        assert self.publisher.stats.batches >= 3
+
+    def test_emit_does_not_wait_for_the_broker(self):
+        """
+        GIVEN a broker not answering
+        WHEN an event is emitted
+        THEN emit returns before it is published
+        """
+        self.event_manager.gate.clear()
+
+        self.publisher.emit(contact_method_saved(0))
+
+        assert self.event_manager.events == []
+
+    def test_reject_when_queue_full(self):
+        """
+        GIVEN a broker not answering and a full queue
+        WHEN an event is emitted
+        THEN emit waits full_timeout and raises EventQueueFullError, logging
+        the event without its payload
+        """
+        logger = MagicMock()
+        self.publisher = EventPublisher(
+            self.event_manager, logger=logger, queue_size=1, batch_size=1, full_timeout=0.01
+        )
+        self.event_manager.gate.clear()
+        self.publisher.emit(contact_method_saved(0))
+        self.event_manager.entered.wait(5)
+        self.publisher.emit(contact_method_saved(1))
+
+        with self.assertRaises(EventQueueFullError):
+            self.publisher.emit(contact_method_saved(2))
+
+        assert self.publisher.stats.rejected == 1
+        logged = logger.error.call_args[0][0]
+        assert logged['event'] == 'users.contact_method_saved' and 'ccid' in logged
+        assert 'payload' not in logged
+        self.event_manager.gate.set()
+        self.publisher.close()
+        assert [event.payload for event in self.event_manager.events] == [
+            contact_method_saved(number).payload for number in range(2)
+        ]
+
+    def test_retry_failed_publish(self):
+        """
+        GIVEN a broker failing twice
+        WHEN an event is emitted
+        THEN it is published on the third attempt, pausing longer each time
+        """
+        self.event_manager.failures = 2
+
+        self.publisher.emit(contact_method_saved(0))
+
+        self.publisher.close()
+        assert len(self.event_manager.events) == 1
+        assert self.publisher.stats.retries == 2
+        assert self.pauses == [0.1, 0.2]
+
+    def test_retry_until_published(self):
+        """
+        GIVEN a broker failing while the retry pause reaches its maximum
+        WHEN events are emitted
+        THEN every event is published in order once the broker takes them
+        """
+        self.event_manager.failures = 4
+        self.publisher = EventPublisher(
+            self.event_manager, max_retry_pause=0.3, sleep=self.pauses.append
+        )
+
+        self.publisher.emit(contact_method_saved(0))
+        self.publisher.emit(contact_method_saved(1))
+
+        self.publisher.close()
+        assert [event.payload for event in self.event_manager.events] == [
+            contact_method_saved(number).payload for number in range(2)
+        ]
+        assert self.publisher.stats.retries == 4
+        assert self.pauses == [0.1, 0.2, 0.3, 0.3]
+
+    def test_flush_to_failing_memory_broker(self):
+        """
+        GIVEN a broker failing half of its publishes
+        WHEN events are emitted and the publisher is flushed
+        THEN every message is published once and in order, after its retries
+        """
+        broker = MemoryBroker(failure_rate=0.5, seed=0)
+        self.publisher = EventPublisher(broker, batch_size=2, sleep=self.pauses.append)
+
+        for number in range(5):
+            self.publisher.emit(contact_method_saved(number))
+        self.publisher.flush()
+
+        assert [json.loads(message.body)['payload'] for message in broker.messages] == [
+            contact_method_saved(number).payload for number in range(5)
+        ]
+        assert {message.exchange for message in broker.messages} == {'users'}
+        assert broker.failures > 0
+        assert self.publisher.stats.retries == broker.failures
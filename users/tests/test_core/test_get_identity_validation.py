@@ -5,10 +5,11 @@ import responses
 from nwrest.exceptions import PropagableHttpError
 
 from users.core.actions import GetIdentityValidation
-from users.core.exceptions import IdentityValidationError
+from users.core.exceptions import EntityNotFound, IdentityValidationError
 from users.core.models import SignUp
 from users.core.models.states import SignUpStage
 from users.odm.schemas import AddressSchema
+from users.tests.database import max_statements
 from users.tests.mock_factory import user_factory_mock, identity_factory_mock
 from users.tests.test_core import CoreTestCase
 
@@ -68,9 +69,10 @@ class TestGetIdentityValidationActions(CoreTestCase):
             f'{self.merlin_api_url}/{self.user.id}',
             json=merlin_mock.SUCCESSFUL_GET_RESPONSE
         )
-        result = self.command_bus.handle(
-            GetIdentityValidation(self.user.id)
-        )
+        with max_statements(1):
+            result = self.command_bus.handle(
+                GetIdentityValidation(self.user.id)
+            )
 
         assert result == expected_identity
 
@@ -126,3 +128,17 @@ class TestGetIdentityValidationActions(CoreTestCase):
         action = GetIdentityValidation(self.user.id)
 
         self.assertRaises(expected_exception, self.command_bus.handle, action)
+
+    def test_get_identity_validation_without_sign_up(self):
+        """
+        Ensure that EntityNotFound is raised for users without a sign up.
+
+        - Given an existent user with no sign up.
+        - When the identity validation is requested.
+        - Then EntityNotFound is raised.
+        """
+        user = user_factory_mock(contact_methods=[])
+        self.container.user_repo().save(user)
+        action = GetIdentityValidation(user.id)
+
+        self.assertRaises(EntityNotFound, self.command_bus.handle, action)
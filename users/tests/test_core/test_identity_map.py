@@ -0,0 +1,71 @@
+from users.core.models import SignUp
+from users.core.models.states import SignUpStage, UserStatus
+from users.orm.identity_map import identity_map
+from users.tests.database import max_statements
+from users.tests.mock_factory import user_factory_mock
+from users.tests.test_core import CoreTestCase
+
+
+class TestIdentityMap(CoreTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user_repo = self.container.user_repo()
+        self.sign_up_repo = self.container.sign_up_repo()
+        self.user = user_factory_mock(
+            status=UserStatus.PENDING_VALIDATION,
+            contact_methods=[]
+        )
+        self.user_repo.save(self.user)
+        self.sign_up_repo.save(
+            SignUp(stage=SignUpStage.IDENTITY_VALIDATION, user_id=self.user.id)
+        )
+
+    def test_entities_are_loaded_once(self):
+        """
+        GIVEN a user with a sign up
+        WHEN they are read several times through different repositories
+        within an identity map
+        THEN they are queried once
+        """
+        with identity_map(), max_statements(1):
+            user, sign_up = self.user_repo.get_with_sign_up(self.user.id)
+
+            assert self.user_repo.get_by_id(self.user.id) is user
+            assert self.container.sign_up_repo().get_by_user_id(self.user.id) is sign_up
+
+    def test_writes_invalidate_entities(self):
+        """
+        GIVEN a user and its sign up loaded within an identity map
+        WHEN their status and stage are updated
+        THEN they are queried again with the new values
+        """
+        with identity_map():
+            self.user_repo.get_with_sign_up(self.user.id)
+            self.user_repo.set_status(
+                self.user.id, UserStatus.PENDING_VALIDATION, UserStatus.ACTIVE
+            )
+            self.sign_up_repo.transition_stage(
+                self.user.id,
+                SignUpStage.IDENTITY_VALIDATION,
+                SignUpStage.LEGAL_VALIDATION
+            )
+
+            with max_statements(1) as stats:
+                user, sign_up = self.user_repo.get_with_sign_up(self.user.id)
+
+        assert stats.count == 1
+        assert user.status is UserStatus.ACTIVE
+        assert sign_up.stage is SignUpStage.LEGAL_VALIDATION
+
+    def test_entities_are_not_shared_without_identity_map(self):
+        """
+        GIVEN a user
+        WHEN it is read twice outside of an identity map
+        THEN it is queried each time
+        """
+        with max_statements(2) as stats:
+            self.user_repo.get_by_id(self.user.id)
+            self.user_repo.get_by_id(self.user.id)
+
+        assert stats.count == 2
@@ -0,0 +1,103 @@
+from io import StringIO
+
+from dependency_injector.providers import Object
+
+from users.core.actions import CreateSignUp, ImportSignUps
+from users.core.models import SignUpImport
+from users.memory import MemoryEventManager
+from users.onboarding import read_sign_ups
+from users.tests.database import max_statements
+from users.tests.mock_factory import contact_method_factory_mock, user_factory_mock
+from users.tests.test_core import CoreTestCase
+
+
+class TestImportSignUps(CoreTestCase):
+    """Unit tests cases for ImportSignUpsHandler business logic."""
+
+    def setUp(self):
+        super().setUp()
+        self.event_manager = MemoryEventManager()
+        self.container.event_manager.override(Object(self.event_manager))
+        self.user_repo = self.container.user_repo()
+        self.command_bus = self.container.command_bus()
+
+    def tearDown(self):
+        self.container.event_manager.reset_override()
+        super().tearDown()
+
+    def test_import_sign_ups(self):
+        """
+        GIVEN a registered email
+        WHEN ImportSignUpsHandler is called with it, two new emails and one
+        of them repeated
+        THEN only the new emails are signed up, once each, and their
+        SavedSignUp events are emitted
+        """
+        self.user_repo.save(user_factory_mock(
+            service_agr_id=0,
+            contact_methods=[
+                contact_method_factory_mock(
+                    'EMAIL', confirmed=True, value='registered@email.com'
+                )
+            ]
+        ))
+        emails = [
+            'registered@email.com', 'first@email.com', 'second@email.com',
+            'first@email.com'
+        ]
+
+        imported = self.command_bus.handle(ImportSignUps(sign_ups=[
+            CreateSignUp(service_agr_id=0, email=email) for email in emails
+        ]))
+
+        assert imported == SignUpImport(created=2, skipped=2)
+        assert [event.payload['email'] for event in self.event_manager.events] == [
+            'first@email.com', 'second@email.com'
+        ]
+        user = self.user_repo.get_by_service_agr_id_and_email(0, 'second@email.com')
+        assert user.contact_methods[0].contact_confirmation.is_still_pending
+
+    def test_import_sign_ups_statement_budget(self):
+        """
+        GIVEN no user registered
+        WHEN ImportSignUpsHandler is called with a hundred emails
+        THEN at most 6 statements are issued: the contact method type lookup,
+            the registered emails lookup, the emails claim and the user,
+            contact method and sign up inserts
+        """
+        action = ImportSignUps(sign_ups=[
+            CreateSignUp(service_agr_id=0, email=f'{number}@email.com')
+            for number in range(100)
+        ])
+
+        with max_statements(6):
+            imported = self.command_bus.handle(action)
+
+        assert imported == SignUpImport(created=100)
+
+    def test_read_sign_ups_skips_invalid_rows(self):
+        """
+        GIVEN a CSV with a row without a numeric service_agr_id and one
+        without an email
+        WHEN its sign ups are read
+        THEN the invalid rows are reported by line and the rest are read
+        """
+        lines = StringIO(
+            'service_agr_id,email\n'
+            '0,first@email.com\n'
+            'zero,second@email.com\n'
+            '0,\n'
+            '0, third@email.com\n'
+        )
+        invalid = []
+
+        sign_ups = list(read_sign_ups(lines, lambda *args: invalid.append(args)))
+
+        assert sign_ups == [
+            CreateSignUp(service_agr_id=0, email='first@email.com'),
+            CreateSignUp(service_agr_id=0, email='third@email.com'),
+        ]
+        assert invalid == [
+            (3, "invalid service_agr_id 'zero'"),
+            (4, 'missing email'),
+        ]
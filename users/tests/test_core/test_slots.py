@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+import pickle
+
+from parameterized import parameterized
+import pytest
+
+from users.core.actions import GetUserById, RequestUserIdentityValidation
+from users.core.models import Address, Customer, Identification, Identity
+from users.core.slots import slotted
+from users.tests.mock_factory import customer_factory_mock
+from users.tests.test_core import CoreTestCase
+
+
+class TestSlotted(CoreTestCase):
+
+    @parameterized.expand([
+        (Address,),
+        (Customer,),
+        (Identification,),
+        (Identity,),
+        (GetUserById,),
+        (RequestUserIdentityValidation,),
+    ])
+    def test_instances_have_no_dict(self, cls):
+        """
+        GIVEN a slotted model or action
+        WHEN its layout is inspected
+        THEN its instances have no __dict__
+        """
+        assert '__dict__' not in dir(cls)
+
+    def test_keep_defaults_and_behavior(self):
+        """
+        GIVEN slotted dataclasses with defaults, properties and a subclass
+        WHEN they are instantiated, compared and pickled
+        THEN they behave as the plain dataclasses
+        """
+        action = GetUserById(user_id='id')
+        customer = customer_factory_mock()
+
+        assert action.fetch_customer is True
+        assert pickle.loads(pickle.dumps(action)) == action
+        assert customer.document_type == 'CUIL'
+        with pytest.raises(AttributeError):
+            action.undeclared = 'value'
+
+    def test_reject_classes_other_than_dataclasses(self):
+        """
+        GIVEN a class that is not a dataclass
+        WHEN it is slotted
+        THEN a TypeError is raised
+        """
+        with pytest.raises(TypeError):
+            slotted(type('Plain', (), {}))
+
+        assert slotted(dataclass(type('Plain', (), {}))).__slots__ == ()
@@ -4,7 +4,8 @@ from uuid import UUID
 import responses
 from users.core.exceptions import (
     DependencyError,
-    EntityNotFound
+    EntityNotFound,
+    ValidationError
 )
 
 from users.core.actions import UpdateLegalValidation
@@ -108,3 +109,27 @@ class TestUpdateLegalValidation(CoreTestCase):
             self.command_bus.handle(action)
         sign_up: SignUp = self.sign_up_repo.get_by_user_id(self.user_id)
         assert sign_up.stage == SignUpStage.IDENTITY_VALIDATION
+
+    @responses.activate
+    def test_update_legal_validation_action_fail_blocked_sign_up(self):
+        """
+        GIVEN a user with a blocked sign up
+        WHEN its legal validation is updated
+        THEN a ValidationError is raised before the customer is updated
+        """
+        self.expected_sign_up.stage = SignUpStage.SIGN_UP_BLOCKED
+        self.sign_up_repo.save(self.expected_sign_up)
+        action = UpdateLegalValidation(
+            user_id=self.user_id,
+            pep=False,
+            so=False,
+            facta=False,
+            occupation_id=UUID('14e56e54-3e0e-4b7c-87f7-38bb219772d0'),
+            relationship='MARRIED',
+            customer_id=self.customer_id
+        )
+        with self.assertRaises(ValidationError):
+            self.command_bus.handle(action)
+        assert len(responses.calls) == 0
+        sign_up: SignUp = self.sign_up_repo.get_by_user_id(self.user_id)
+        assert sign_up.stage == SignUpStage.SIGN_UP_BLOCKED
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import pytest
+
+from users.core.exceptions import EntityNotFound, ResolutionError
+from users.tests.mock_factory import contact_method_factory_mock, user_factory_mock
+from users.tests.test_core import CoreTestCase
+
+
+class TestUserContactMethods(CoreTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = user_factory_mock()
+
+    def test_group_contact_methods_by_type(self):
+        """
+        GIVEN a user with email and phone contact methods
+        WHEN its contact methods of each type are requested
+        THEN they are returned in the order of the user's list
+        """
+        for type_ in ('EMAIL', 'PHONE'):
+            assert list(self.user.contact_methods_of(type_)) == [
+                cm for cm in self.user.contact_methods if cm.type.description == type_
+            ]
+        assert self.user.contact_methods_of('ADDRESS') == ()
+
+    def test_reindex_after_the_list_changes(self):
+        """
+        GIVEN a user whose contact methods were already looked up
+        WHEN its list of contact methods is mutated or replaced
+        THEN lookups reflect the new contact methods
+        """
+        assert self.user.email == 'mock@email.com'
+
+        self.user.contact_methods.append(
+            contact_method_factory_mock(type_='EMAIL', value='other@email.com', confirmed=True)
+        )
+        with pytest.raises(ResolutionError):
+            self.user.email
+
+        self.user.contact_methods.pop()
+        assert self.user.email == 'mock@email.com'
+
+        self.user.contact_methods = [
+            contact_method_factory_mock(type_='PHONE', confirmed=True)
+        ]
+        with pytest.raises(EntityNotFound):
+            self.user.email
+        assert len(self.user.contact_methods_of('PHONE')) == 1
+
+    def test_group_contact_methods_by_confirmation(self):
+        """
+        GIVEN a user with a confirmed and an unconfirmed email
+        WHEN its emails are requested by confirmation
+        THEN each lookup returns its emails, until a confirmation changes
+        """
+        confirmed, = self.user.contact_methods_of('EMAIL', confirmed=True)
+        unconfirmed, = self.user.contact_methods_of('EMAIL', confirmed=False)
+        assert confirmed.value == 'mock@email.com'
+        assert unconfirmed.value == 'mock2@email.com'
+
+        unconfirmed.contact_confirmation = unconfirmed.contact_confirmation.recreate(
+            confirmed_at=datetime.now()
+        )
+
+        assert self.user.contact_methods_of('EMAIL', confirmed=False) == ()
+        with pytest.raises(ResolutionError):
+            self.user.email
+
+    def test_keep_the_index_of_other_users(self):
+        """
+        GIVEN two users whose contact methods were already looked up
+        WHEN the confirmation of a contact method of one of them changes
+        THEN only the index of that user is rebuilt
+        """
+        other = user_factory_mock()
+        self.user.contact_methods_of('EMAIL')
+        other.contact_methods_of('EMAIL')
+        index = other._contact_method_index
+
+        unconfirmed, = self.user.contact_methods_of('EMAIL', confirmed=False)
+        unconfirmed.contact_confirmation = unconfirmed.contact_confirmation.recreate(
+            confirmed_at=datetime.now()
+        )
+
+        assert self.user.contact_methods_of('EMAIL', confirmed=False) == ()
+        other.contact_methods_of('EMAIL')
+        assert other._contact_method_index is index
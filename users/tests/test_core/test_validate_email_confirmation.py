@@ -97,3 +97,37 @@ class TestValidateEmailConfirmation(CoreTestCase):
             self.confirmed_email.contact_confirmation.value
         )
         self.assertRaises(ValidationError, self.command_bus.handle, action)
+
+    def test_validate_email_fail_by_token_used_twice(self):
+        """
+        GIVEN a user, signup and contact method unconfirmed in database
+        WHEN ValidateEmailConfirmationHandler is called twice with the token
+        THEN the second ValidateEmailConfirmationToken fails
+        """
+        self.contact_method_repo.save(self.unconfirmed_email)
+        action = ValidateEmailConfirmationToken(
+            self.unconfirmed_email.contact_confirmation.value
+        )
+
+        self.command_bus.handle(action)
+
+        self.assertRaises(ValidationError, self.command_bus.handle, action)
+        assert self.sign_up_repo.get_by_user_id(self.user.id).stage == \
+            SignUpStage.IDENTITY_VALIDATION
+
+    def test_validate_email_fail_by_blocked_sign_up(self):
+        """
+        GIVEN a user, blocked signup and contact method unconfirmed in database
+        WHEN ValidateEmailConfirmationHandler is called with contact_method.token
+        THEN ValidateEmailConfirmationToken fails and the email stays unconfirmed
+        """
+        self.expected_sign_up.stage = SignUpStage.SIGN_UP_BLOCKED
+        self.sign_up_repo.save(self.expected_sign_up)
+        self.contact_method_repo.save(self.unconfirmed_email)
+        action = ValidateEmailConfirmationToken(
+            self.unconfirmed_email.contact_confirmation.value
+        )
+
+        self.assertRaises(ValidationError, self.command_bus.handle, action)
+        assert self.contact_method_repo.get_by_token(action.token)\
+            .contact_confirmation.is_still_pending
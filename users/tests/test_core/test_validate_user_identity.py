@@ -12,6 +12,7 @@ from users.core.exceptions import (
 from users.core.models import SignUp
 from users.core.models.states import SignUpStage, UserStatus
 from users.tests.mock_factory import user_factory_mock, identity_factory_mock
+from users.tests.database import max_statements
 from users.tests.test_core import CoreTestCase
 
 
@@ -77,6 +78,36 @@ class TestValidateUserIdentity(CoreTestCase):
             'user_status': updated_user.status,
         } == expected_result
 
+    @responses.activate
+    def test_perform_identity_validation_statement_budget(self):
+        """
+        Given a valid identity validation request.
+        When the identity validation service response is satisfactory.
+        Then at most 2 statements are issued: one to load the user along
+        with its sign up and one to update its status.
+        """
+        action = ValidateUserIdentity(
+            user_id=self.user.id,
+            ocr='some tokenized ocr',
+            selfie='some selfie data',
+            face_id='some face data',
+            base64_front='some picture data',
+            base64_selfie='some other picture data',
+            base64_back='some other and another picture data',
+        )
+        mock = self.IdentityValidationMock(
+            self.user.id,
+            identity_factory_mock()
+        )
+        responses.add(
+            responses.POST,
+            self.identity_validation_url,
+            json=mock.SUCCESSFUL_POST_RESPONSE
+        )
+
+        with max_statements(2):
+            self.command_bus.handle(action)
+
     @responses.activate
     def test_perform_identity_validation_wrong_sign_up_stage(self):
         """
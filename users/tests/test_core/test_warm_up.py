@@ -0,0 +1,41 @@
+from unittest.mock import Mock, patch
+
+from users.api.warmup import prime_query_cache, warm_up
+from users.tests.test_core import CoreTestCase
+
+
+class TestWarmUp(CoreTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.logger = Mock()
+
+    def test_prime_query_cache_skips_missing_service_agreements(self):
+        """
+        GIVEN WARM_UP_SERVICE_AGR_IDS with an existing and a missing agreement
+        WHEN the query cache is primed
+        THEN the missing agreement is logged instead of failing the worker
+        """
+        self.container.config.warm_up_service_agr_ids.from_value('0, 654')
+
+        prime_query_cache(self.container, self.logger)
+
+        self.logger.warning.assert_called_once_with(
+            'Warm-up could not find the service agreement 654'
+        )
+
+    def test_warm_up_continues_after_failed_step(self):
+        """
+        GIVEN a warm-up step failing
+        WHEN the worker warms up
+        THEN the failure is logged and the following steps still run
+        """
+        with patch('users.api.warmup.fill_connection_pool', side_effect=OSError('down')), \
+                patch('users.api.warmup.connect_downstream') as connect_downstream:
+            timings = warm_up(self.container, logger=self.logger)
+
+        assert set(timings) == {'connection_pool', 'query_cache', 'downstream'}
+        connect_downstream.assert_called_once()
+        self.logger.warning.assert_called_once_with(
+            "Warm-up step connection_pool failed: OSError('down')"
+        )
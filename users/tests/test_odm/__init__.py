@@ -0,0 +1,15 @@
+from copy import deepcopy
+
+from users.core.models import User
+from users.odm.schemas import CustomerResource
+from users.tests.mock_factory import user_factory_mock
+from users.tests.test_core import CoreTestCase
+
+
+class ODMTestCase(CoreTestCase):
+
+    def api_user_mock(self, **kwargs) -> User:
+        """Return a user mock with its customer as the customer api returns it."""
+        raw_customer = deepcopy(self.CustomerMock().SUCCESSFUL_FILTER_RESPONSE['data'][0])
+        kwargs.setdefault('customer', CustomerResource().load(raw_customer).data)
+        return user_factory_mock(**kwargs)
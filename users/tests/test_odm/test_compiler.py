@@ -0,0 +1,170 @@
+from marshmallow import Schema
+from parameterized import parameterized
+
+from users.odm.compiler import CompiledSchema
+from users.odm.schemas import (
+    ConfirmIdentityResponseSchema,
+    CreateCustomerRequestSchema,
+    CustomerResource,
+    GetServiceAgreementResponse,
+    GetUserContactMethodsResponse,
+    IdentitySchema,
+    ResponseErrorSchema,
+    SavePhoneConfirmationResponse,
+    SignUpResourceSchema,
+    UpdateLegalValidationResponse,
+    UserByDocumentResource,
+    UserByIdResource,
+    UserResourceSchema,
+)
+from users.tests.mock_factory import (
+    customer_factory_mock,
+    identity_factory_mock,
+    service_agreement_factory_mock,
+    USER_ID,
+)
+from users.tests.test_odm import ODMTestCase
+
+
+class TestCompiledSchema(ODMTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.api_user_mock()
+        self.cases = {
+            'user_by_id': (UserByIdResource(), self.user, False),
+            'user_by_id_list': (UserByIdResource(), [self.user, self.user], True),
+            'user_by_document': (UserByDocumentResource(), self.user, False),
+            'user_resource': (UserResourceSchema(), self.user, False),
+            'contact_methods': (
+                GetUserContactMethodsResponse(),
+                self.user.contact_methods,
+                True
+            ),
+            'identity': (IdentitySchema(), identity_factory_mock(), False),
+            'customer': (CustomerResource(), customer_factory_mock(), False),
+            'sign_up_only': (
+                SignUpResourceSchema(only=('user_id',)),
+                {'user_id': USER_ID},
+                False
+            ),
+            'service_agreement_only': (
+                GetServiceAgreementResponse(only=('id', 'legal_validation_config')),
+                service_agreement_factory_mock(),
+                False
+            ),
+            'phone_confirmation': (
+                SavePhoneConfirmationResponse(),
+                {'id': str(USER_ID)},
+                False
+            ),
+            'legal_validation': (
+                UpdateLegalValidationResponse(),
+                {'user_id': USER_ID},
+                False
+            ),
+            'create_customer': (
+                CreateCustomerRequestSchema(),
+                identity_factory_mock(),
+                False
+            ),
+            'confirm_identity': (
+                ConfirmIdentityResponseSchema(),
+                {'user_id': USER_ID},
+                False
+            ),
+            'error': (
+                ResponseErrorSchema(),
+                {'error': {'code': 'NB-ERROR-00400', 'message': 'unknown error'}},
+                False
+            ),
+        }
+
+    def assert_same_dump(self, schema: Schema, obj: object, many: bool):
+        expected = schema.dump(obj, many=many)
+        compiled = CompiledSchema(schema)
+
+        for _ in range(2):
+            result = compiled.dump(obj, many=many)
+            assert result.data == expected.data
+            assert result.errors == expected.errors
+            assert list(result.data) == list(expected.data)
+
+    @parameterized.expand([
+        ('user_by_id',),
+        ('user_by_id_list',),
+        ('user_by_document',),
+        ('user_resource',),
+        ('contact_methods',),
+        ('identity',),
+        ('customer',),
+        ('sign_up_only',),
+        ('service_agreement_only',),
+        ('phone_confirmation',),
+        ('legal_validation',),
+        ('create_customer',),
+        ('confirm_identity',),
+        ('error',),
+    ])
+    def test_dump_as_marshmallow(self, case):
+        """
+        GIVEN a schema and an object it dumps
+        WHEN the compiled schema dumps the object
+        THEN the data and errors are the ones of the schema
+        """
+        self.assert_same_dump(*self.cases[case])
+
+    def test_report_errors_as_marshmallow(self):
+        """
+        GIVEN an object with a value its schema can not dump
+        WHEN the compiled schema dumps the object
+        THEN the data and errors are the ones of the schema
+        """
+        self.assert_same_dump(
+            GetServiceAgreementResponse(only=('id', 'legal_validation_config')),
+            {'id': 'not a number', 'legal_validation_config': []},
+            False
+        )
+
+    def test_fall_back_for_unsupported_schemas(self):
+        """
+        GIVEN a schema restricted to fields it does not declare
+        WHEN it is compiled
+        THEN it is not supported and dumps as marshmallow
+        """
+        schema = SignUpResourceSchema(only=('undeclared',))
+        compiled = CompiledSchema(schema)
+
+        assert not compiled.supported
+        self.assert_same_dump(schema, {'undeclared': 'value'}, False)
+
+    def test_report_errors_of_each_item_as_marshmallow(self):
+        """
+        GIVEN a list with an item its schema can not dump
+        WHEN the compiled schema dumps the list
+        THEN the data and the errors by index are the ones of the schema
+        """
+        self.assert_same_dump(
+            GetServiceAgreementResponse(only=('id', 'legal_validation_config')),
+            [
+                {'id': 1, 'legal_validation_config': []},
+                {'id': 'not a number', 'legal_validation_config': []},
+            ],
+            True
+        )
+
+    def test_raise_unexpected_errors(self):
+        """
+        GIVEN an object whose attribute fails to be read
+        WHEN the compiled schema dumps the object
+        THEN the error is raised instead of dumping again with the schema
+        """
+        class BrokenIdentity:
+            @property
+            def addresses(self):
+                raise RuntimeError('broken')
+
+        compiled = CompiledSchema(IdentitySchema())
+
+        with self.assertRaises(RuntimeError), self.assertLogs('users.odm.compiler'):
+            compiled.dump(BrokenIdentity())
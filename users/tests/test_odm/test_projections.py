@@ -0,0 +1,85 @@
+import json
+
+import pytest
+from parameterized import parameterized
+
+from users.core.exceptions import EntityNotFound
+from users.odm.projections import UserProjection
+from users.odm.registry import SchemaRegistry
+from users.odm.schemas import UserByDocumentResource, UserByIdResource
+from users.tests.mock_factory import contact_method_factory_mock
+from users.tests.test_odm import ODMTestCase
+
+
+class TestUserProjection(ODMTestCase):
+
+    def assert_same_bytes(self, schema_class: type, obj: object, many: bool):
+        schema = schema_class()
+        projection = UserProjection(schema)
+        expected = schema.dump(obj, many=many)
+
+        assert projection.layout is not None
+        for _ in range(2):
+            result = projection.dump(obj, many=many)
+            assert json.dumps(result.data, default=str) == \
+                json.dumps(expected.data, default=str)
+            assert result.errors == expected.errors
+
+    @parameterized.expand([
+        (UserByIdResource,),
+        (UserByDocumentResource,),
+    ])
+    def test_dump_the_bytes_of_the_schema(self, schema_class):
+        """
+        GIVEN a user resource schema and users with their customers
+        WHEN the projection dumps a user and a list of users
+        THEN the serialized output is byte for byte the one of the schema
+        """
+        self.assert_same_bytes(schema_class, self.api_user_mock(), False)
+        self.assert_same_bytes(
+            schema_class,
+            [self.api_user_mock(), self.api_user_mock(customer_id=None)],
+            True
+        )
+
+    @parameterized.expand([
+        (UserByIdResource,),
+        (UserByDocumentResource,),
+    ])
+    def test_raise_as_the_schema_without_confirmed_email(self, schema_class):
+        """
+        GIVEN a user without a confirmed email
+        WHEN the projection dumps it
+        THEN the schema's error is raised
+        """
+        user = self.api_user_mock(contact_methods=[
+            contact_method_factory_mock(type_='EMAIL', confirmed=False),
+            contact_method_factory_mock(type_='PHONE', confirmed=True),
+        ])
+
+        with pytest.raises(EntityNotFound):
+            UserProjection(schema_class()).dump(user)
+
+    def test_raise_as_the_schema_without_customer(self):
+        """
+        GIVEN a user without its customer
+        WHEN the projection dumps it
+        THEN the schema's error is raised
+        """
+        user = self.api_user_mock(customer=None)
+
+        with pytest.raises(AttributeError):
+            UserByIdResource().dump(user)
+        with pytest.raises(AttributeError):
+            UserProjection(UserByIdResource()).dump(user)
+
+    def test_registry_compiles_user_resources_as_projections(self):
+        """
+        GIVEN a registry
+        WHEN the user resources are compiled
+        THEN their projections are returned
+        """
+        registry = SchemaRegistry()
+
+        assert isinstance(registry.get_compiled(UserByIdResource), UserProjection)
+        assert isinstance(registry.get_compiled(UserByDocumentResource), UserProjection)
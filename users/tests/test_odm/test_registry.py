@@ -0,0 +1,116 @@
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+import pytest
+
+from users.api.views import routes
+from users.odm.registry import SchemaRegistry
+from users.odm.schemas import (
+    GetServiceAgreementResponse,
+    IdentitySchema,
+    SavePhoneConfirmationResponse,
+    SignUpResourceSchema,
+)
+from users.tests.base import BaseTestCase
+from users.tests.mock_factory import (
+    identity_factory_mock,
+    service_agreement_factory_mock,
+)
+
+
+class TestSchemaRegistry(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.registry = SchemaRegistry()
+
+    def test_build_each_configuration_once(self):
+        """
+        GIVEN a registry
+        WHEN a schema is requested twice with the same options
+        THEN the same instance is returned, and another one for other options
+        """
+        schema = self.registry.get(SignUpResourceSchema, only=('user_id',))
+
+        assert self.registry.get(SignUpResourceSchema, only=('user_id',)) is schema
+        assert self.registry.get(SignUpResourceSchema, only=('stage',)) is not schema
+        assert len(self.registry) == 2
+
+    def test_build_each_configuration_per_thread(self):
+        """
+        GIVEN a schema built by a thread
+        WHEN another thread requests the same configuration
+        THEN it gets its own instance, until the registry is cleared
+        """
+        schema = self.registry.get(SignUpResourceSchema, only=('user_id',))
+
+        with ThreadPoolExecutor(1) as executor:
+            other_schema = executor.submit(
+                self.registry.get, SignUpResourceSchema, only=('user_id',)
+            ).result()
+            assert other_schema is not schema
+            assert executor.submit(
+                self.registry.get, SignUpResourceSchema, only=('user_id',)
+            ).result() is other_schema
+
+            self.registry.clear()
+
+            assert executor.submit(
+                self.registry.get, SignUpResourceSchema, only=('user_id',)
+            ).result() is not other_schema
+
+    def test_reject_request_options(self):
+        """
+        GIVEN a registry
+        WHEN a schema is requested with per request view arguments
+        THEN a TypeError is raised
+        """
+        with pytest.raises(TypeError):
+            self.registry.get(SignUpResourceSchema, view_kwargs={'user_id': 'id'})
+
+    def test_dump_with_hypermedia_as_data_with_hypermedia(self):
+        """
+        GIVEN shared schemas and schemas built with the view arguments
+        WHEN both dump the same objects
+        THEN the dump with hypermedia matches the data with hypermedia
+        """
+        user_id = str(uuid4())
+        cases = [
+            (
+                IdentitySchema,
+                identity_factory_mock(),
+                {
+                    'url_resolver': routes.url_path_for,
+                    'view_to_resolve': 'get_user_identity_validation',
+                    'api_version': 2,
+                    'http_methods': ['GET'],
+                },
+                {'user_id': user_id},
+            ),
+            (
+                SavePhoneConfirmationResponse,
+                {'id': user_id},
+                {
+                    'url_resolver': routes.url_path_for,
+                    'view_to_resolve': 'create_phone_confirmation',
+                    'http_methods': ['GET', 'PATCH'],
+                },
+                {'user_id': user_id},
+            ),
+            (
+                GetServiceAgreementResponse,
+                service_agreement_factory_mock(),
+                {'only': ('id', 'legal_validation_config')},
+                None,
+            ),
+        ]
+
+        for schema_class, obj, options, view_kwargs in cases:
+            built_schema = schema_class(**options, view_kwargs=view_kwargs)
+            built_schema.dump(obj)
+            shared_schema = self.registry.get(schema_class, **options)
+
+            assert shared_schema.dump_with_hypermedia(
+                obj,
+                view_kwargs=view_kwargs
+            ) == built_schema.data_with_hypermedia
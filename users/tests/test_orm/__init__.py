@@ -0,0 +1,34 @@
+from typing import List, Optional
+from uuid import uuid4
+
+from users.core.models import ContactMethod, SignUp, User
+from users.core.models.states import SignUpStage, UserStatus
+from users.tests.mock_factory import contact_method_factory_mock, user_factory_mock
+from users.tests.test_core import CoreTestCase
+
+
+class ORMTestCase(CoreTestCase):
+
+    def save_user(
+        self,
+        stage: Optional[SignUpStage] = SignUpStage.EMAIL_CONFIRMATION,
+        status: UserStatus = UserStatus.PENDING_VALIDATION,
+        contact_methods: Optional[List[ContactMethod]] = None,
+        **kwargs
+    ) -> User:
+        """Save a user with the contact methods and the sign up in the stage."""
+        user_id = kwargs.pop('id', uuid4())
+        if contact_methods is None:
+            contact_methods = [
+                contact_method_factory_mock('EMAIL', confirmed=False, user_id=user_id)
+            ]
+        user = user_factory_mock(
+            id=user_id,
+            status=status,
+            contact_methods=contact_methods,
+            **kwargs
+        )
+        self.container.user_repo().save(user)
+        if stage is not None:
+            self.container.sign_up_repo().save(SignUp(stage=stage, user_id=user_id))
+        return user
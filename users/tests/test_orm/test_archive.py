@@ -0,0 +1,116 @@
+import pytest
+
+from users.core.exceptions import EntityGoneError
+from users.core.models import User
+from users.core.models.states import SignUpStage, UserStatus
+from users.orm.archive import Archiver, hot_set_size
+from users.tests.test_orm import ORMTestCase
+
+
+class TestArchiver(ORMTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.pauses = []
+        self.archiver = Archiver(
+            self.container.database().session,
+            batch_size=1,
+            sleep=self.pauses.append
+        )
+
+    def hot(self, user_id) -> bool:
+        with self.container.database().session() as session:
+            return session.get(User, user_id) is not None
+
+    def hot_set(self) -> dict:
+        with self.container.database().session() as session:
+            return hot_set_size(session)
+
+    def test_archive_terminal_users(self):
+        """
+        GIVEN a banned user, a user whose sign up is blocked and an active one
+        WHEN the archiver runs
+        THEN the banned and the blocked users are archived, each in its batch
+        """
+        banned = self.save_user(status=UserStatus.BANNED)
+        blocked = self.save_user(stage=SignUpStage.SIGN_UP_BLOCKED)
+        active = self.save_user(
+            stage=SignUpStage.GENERATE_CREDENTIALS,
+            status=UserStatus.ACTIVE
+        )
+
+        assert self.archiver.archive() == 2
+        assert not self.hot(banned.id)
+        assert not self.hot(blocked.id)
+        assert self.hot(active.id)
+        assert self.pauses == [self.archiver.pause] * 2
+
+    def test_read_archived_users(self):
+        """
+        GIVEN an archived banned user
+        WHEN it is read by id, with its sign up, and by its email, including
+        the archive
+        THEN it is read from the archive with its contact methods
+        """
+        banned = self.save_user(status=UserStatus.BANNED)
+        self.archiver.archive()
+        user_repo = self.container.user_repo()
+
+        user, sign_up = user_repo.get_with_sign_up(banned.id, include_archived=True)
+        by_email = user_repo.get_by_service_agr_id_and_email(
+            banned.service_agr_id, 'mock@email.com', include_archived=True
+        )
+
+        assert user_repo.get_by_id(banned.id, include_archived=True).status \
+            is UserStatus.BANNED
+        assert user.id == by_email.id == banned.id
+        assert sign_up.stage is SignUpStage.EMAIL_CONFIRMATION
+        assert [cm.value for cm in user.contact_methods_of('EMAIL')] == ['mock@email.com']
+
+    def test_archived_users_gone_for_writes(self):
+        """
+        GIVEN an archived banned user
+        WHEN it is looked up without including the archive, as the writes do
+        THEN the lookups raise EntityGoneError instead of loading it
+        """
+        banned = self.save_user(status=UserStatus.BANNED)
+        self.archiver.archive()
+        user_repo = self.container.user_repo()
+        sign_up_repo = self.container.sign_up_repo()
+
+        with pytest.raises(EntityGoneError):
+            user_repo.get_by_id(banned.id)
+        with pytest.raises(EntityGoneError):
+            user_repo.get_with_sign_up(banned.id)
+        with pytest.raises(EntityGoneError):
+            sign_up_repo.get_by_user_id(banned.id)
+
+    def test_hot_set_size(self):
+        """
+        GIVEN a banned user and an active one
+        WHEN the banned user is archived
+        THEN it leaves the hot set for the archive
+        """
+        self.save_user(status=UserStatus.BANNED)
+        self.save_user(stage=SignUpStage.GENERATE_CREDENTIALS, status=UserStatus.ACTIVE)
+        before = self.hot_set()
+
+        self.archiver.archive()
+
+        after = self.hot_set()
+        assert before['terminal_users'] == 1
+        assert after['terminal_users'] == 0
+        assert after['users'] == before['users'] - 1
+        assert after['archived_users'] == before['archived_users'] + 1
+
+    def test_dry_run(self):
+        """
+        GIVEN a banned user
+        WHEN the archiver dry runs
+        THEN it is counted but not archived
+        """
+        banned = self.save_user(status=UserStatus.BANNED)
+        self.archiver.dry_run = True
+
+        assert self.archiver.archive() == 1
+        assert self.hot(banned.id)
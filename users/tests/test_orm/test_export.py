@@ -0,0 +1,91 @@
+import csv
+from io import StringIO
+import json
+from uuid import UUID
+
+from users.core.models.states import SignUpStage, UserStatus
+from users.orm.export import export, UserExport, write_csv
+from users.tests.test_orm import ORMTestCase
+
+
+class TestUserExport(ORMTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.users = sorted(
+            [
+                self.save_user(),
+                self.save_user(status=UserStatus.BANNED),
+                self.save_user(
+                    stage=SignUpStage.GENERATE_CREDENTIALS,
+                    status=UserStatus.ACTIVE
+                ),
+            ],
+            key=lambda user: user.id
+        )
+        self.checkpoints = []
+        self.user_export = UserExport(self.container.database().session, batch_size=2)
+
+    def export(self, **kwargs) -> list:
+        output = StringIO()
+        export(
+            self.user_export, output, checkpoint=self.checkpoints.append, **kwargs
+        )
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_export_users(self):
+        """
+        GIVEN three users
+        WHEN they are exported in pages of two
+        THEN each is written with its contact methods, sign up and service
+        agreement, and the last id of each page is checkpointed
+        """
+        records = self.export()
+
+        assert [record['id'] for record in records] == [str(u.id) for u in self.users]
+        assert records[0]['business_model'] is not None
+        assert records[0]['stage'] is not None
+        assert records[0]['contact_methods'] == [
+            {'type': 'EMAIL', 'value': 'mock@email.com', 'confirmed': False}
+        ]
+        assert self.checkpoints == [self.users[1].id, self.users[2].id]
+
+    def test_resume_after_checkpoint(self):
+        """
+        GIVEN the id of the first user exported
+        WHEN the export resumes after it
+        THEN only the users after it are written
+        """
+        records = self.export(after=self.users[0].id)
+
+        assert [UUID(record['id']) for record in records] == [
+            user.id for user in self.users[1:]
+        ]
+
+    def test_filter_by_status(self):
+        """
+        GIVEN users in different statuses
+        WHEN the banned users are exported
+        THEN only they are written
+        """
+        self.user_export = UserExport(
+            self.container.database().session, status=UserStatus.BANNED
+        )
+
+        records = self.export()
+
+        assert [record['status'] for record in records] == ['BANNED']
+
+    def test_export_csv(self):
+        """
+        GIVEN three users
+        WHEN they are exported as CSV
+        THEN a header and a row per user are written
+        """
+        output = StringIO()
+
+        export(self.user_export, output, write_csv)
+
+        rows = list(csv.DictReader(StringIO(output.getvalue())))
+        assert [row['id'] for row in rows] == [str(user.id) for user in self.users]
+        assert rows[0]['contact_methods'] == 'EMAIL:mock@email.com'
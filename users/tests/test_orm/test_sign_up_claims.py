@@ -0,0 +1,73 @@
+from typing import Tuple
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import insert, select
+
+from users.core.exceptions import EmailClaimError
+from users.core.models import ContactMethod, SignUp, User
+from users.core.models.states import SignUpOutcome, SignUpStage, UserStatus
+from users.orm.mappings import sign_up_email_table
+from users.tests.mock_factory import contact_method_factory_mock, user_factory_mock
+from users.tests.test_orm import ORMTestCase
+
+
+class TestSignUpClaims(ORMTestCase):
+
+    def new_sign_up(self, email: str) -> Tuple[SignUp, User, ContactMethod]:
+        user_id = uuid4()
+        contact_method = contact_method_factory_mock(
+            'EMAIL', confirmed=False, value=email, user_id=user_id
+        )
+        user = user_factory_mock(
+            id=user_id,
+            status=UserStatus.PENDING_VALIDATION,
+            contact_methods=[contact_method]
+        )
+        return SignUp(stage=SignUpStage.EMAIL_CONFIRMATION, user_id=user_id), user, contact_method
+
+    def claim(self, email: str, user_id: UUID) -> None:
+        with self.container.database().session() as session:
+            session.execute(insert(sign_up_email_table).values(
+                service_agr_id=0, email=email, user_id=user_id
+            ))
+            session.commit()
+
+    def claimed_by(self, email: str) -> UUID:
+        with self.container.database().session() as session:
+            return session.execute(
+                select(sign_up_email_table.c.user_id)
+                .where(sign_up_email_table.c.email == email)
+            ).scalar_one()
+
+    def test_take_over_the_claim_of_a_deleted_user(self):
+        """
+        GIVEN an email claimed by a user that was deleted
+        WHEN the email signs up again
+        THEN the new user is created and takes the claim over
+        """
+        self.claim('claimed@email.com', uuid4())
+        sign_up, user, contact_method = self.new_sign_up('claimed@email.com')
+
+        attempt = self.container.sign_up_repo().create_or_renew(
+            sign_up, user, contact_method
+        )
+
+        assert attempt.outcome == SignUpOutcome.CREATED
+        assert self.claimed_by('claimed@email.com') == user.id
+
+    def test_reject_the_claim_of_a_user_without_the_email(self):
+        """
+        GIVEN an email claimed by a user that no longer holds it
+        WHEN the email signs up again
+        THEN an EmailClaimError is raised and the claim is kept
+        """
+        holder = self.save_user()
+        self.claim('changed@email.com', holder.id)
+
+        with pytest.raises(EmailClaimError):
+            self.container.sign_up_repo().create_or_renew(
+                *self.new_sign_up('changed@email.com')
+            )
+
+        assert self.claimed_by('changed@email.com') == holder.id
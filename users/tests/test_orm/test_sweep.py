@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from users.core.models import User
+from users.core.models.states import SignUpStage
+from users.orm.sweep import Sweep, Sweeper
+from users.tests.mock_factory import contact_method_factory_mock
+from users.tests.test_orm import ORMTestCase
+
+
+class TestSweeper(ORMTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.pauses = []
+        self.sweeper = Sweeper(
+            self.container.database().session,
+            retention=timedelta(days=30),
+            batch_size=1,
+            sleep=self.pauses.append
+        )
+        # The confirmations of the factories expire within a day.
+        self.after_retention = datetime.now() + timedelta(days=32)
+
+    def exists(self, user_id) -> bool:
+        with self.container.database().session() as session:
+            return session.get(User, user_id) is not None
+
+    def test_sweep_abandoned_sign_ups(self):
+        """
+        GIVEN a sign up pending since longer than the retention and another
+        one past the email confirmation
+        WHEN the sweeper runs
+        THEN the user of the abandoned sign up is deleted in its own batch
+        """
+        abandoned = self.save_user()
+        user_id = uuid4()
+        confirmed = self.save_user(
+            id=user_id,
+            stage=SignUpStage.IDENTITY_VALIDATION,
+            contact_methods=[
+                contact_method_factory_mock('EMAIL', confirmed=True, user_id=user_id)
+            ]
+        )
+
+        sweep = self.sweeper.sweep(now=self.after_retention)
+
+        assert sweep == Sweep(sign_ups=1, contact_methods=0)
+        assert not self.exists(abandoned.id)
+        assert self.exists(confirmed.id)
+        assert self.pauses == [self.sweeper.pause]
+
+    def test_keep_sign_ups_within_the_retention(self):
+        """
+        GIVEN a sign up pending since less than the retention
+        WHEN the sweeper runs
+        THEN nothing is deleted
+        """
+        abandoned = self.save_user()
+
+        assert self.sweeper.sweep() == Sweep()
+        assert self.exists(abandoned.id)
+
+    def test_sweep_expired_phone_confirmations(self):
+        """
+        GIVEN an active user with a confirmed phone and another never confirmed
+        WHEN the sweeper runs after the retention
+        THEN only the phone never confirmed is deleted
+        """
+        user_id = uuid4()
+        phones = [
+            contact_method_factory_mock('PHONE', confirmed=True, user_id=user_id),
+            contact_method_factory_mock(
+                'PHONE', confirmed=False, user_id=user_id, value='5412345670'
+            ),
+        ]
+        # Saved together, the phones must share their type instance.
+        phones[1].type = phones[0].type
+        self.save_user(
+            id=user_id,
+            stage=SignUpStage.PHONE_CONFIRMATION,
+            contact_methods=phones
+        )
+
+        sweep = self.sweeper.sweep(now=self.after_retention)
+
+        assert sweep == Sweep(sign_ups=0, contact_methods=1)
+        user = self.container.user_repo().get_by_id(user_id)
+        assert [cm.value for cm in user.contact_methods_of('PHONE')] == ['5412345678']
+
+    def test_dry_run(self):
+        """
+        GIVEN an abandoned sign up
+        WHEN the sweeper dry runs
+        THEN it is counted but not deleted
+        """
+        abandoned = self.save_user()
+        self.sweeper.dry_run = True
+
+        assert self.sweeper.sweep(now=self.after_retention) == Sweep(sign_ups=1)
+        assert self.exists(abandoned.id)
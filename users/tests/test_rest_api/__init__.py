@@ -1,12 +1,9 @@
-import os
-
-from alembic.command import downgrade, upgrade
-from alembic.config import Config
 from starlette.testclient import TestClient
 
 from users.api.run import app
 from users.containers import UserContainer
 from users.tests.base import BaseTestCase
+from users.tests.database import RollbackTransaction
 from users.tests.mock_factory import TEST_ENV_VARS
 
 
@@ -17,12 +14,17 @@ class ApiLayerTestCase(BaseTestCase):
         self.root_endpoint = '/v2/users'
         self.container = UserContainer()
         self.container.config.from_dict(TEST_ENV_VARS)
+        self.container.wire()
         self.container.wire(modules=['users.tests.mock_factory'])
+        self.transaction = RollbackTransaction(self.container.database())
         self.jwt_secret = 'ADIVINAME'
         self.client = TestClient(app)
-        self.alembic_cfg = Config(os.environ.get('ALEMBIC_CONFIG'))
-        upgrade(self.alembic_cfg, 'head')
+
+    def internal_headers(self) -> dict:
+        """Authorize the requests to the internal views."""
+        self.container.request_profiler().token = 'internal-token'
+        return {'X-Internal-Token': 'internal-token'}
 
     def tearDown(self):
         super().tearDown()
-        downgrade(self.alembic_cfg, 'base')
+        self.transaction.rollback()
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+from users.core.models import User
+from users.onboarding import MAX_BULK_SIGN_UPS
+from users.tests.test_rest_api import ApiLayerTestCase
+
+
+class TestBulkEmailConfirmation(ApiLayerTestCase):
+
+    def test_bulk_email_confirmation(self):
+        """
+        GIVEN an email signed up
+        WHEN it is imported along with a new email
+        THEN only the new email is signed up
+        """
+        self.client.post(
+            f'{self.root_endpoint}/signup/email_confirmation',
+            json={'service_agr_id': 0, 'email': 'first@email.com'}
+        )
+
+        response = self.client.post(
+            f'{self.root_endpoint}/signup/bulk',
+            json={'sign_ups': [
+                {'service_agr_id': 0, 'email': 'first@email.com'},
+                {'service_agr_id': 0, 'email': 'second@email.com'},
+            ]}
+        )
+
+        user: User = self.container.user_repo().get_by_service_agr_id_and_email(
+            0, 'second@email.com'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['data'] == {'created': 1, 'skipped': 1}
+        assert user.contact_methods[0].type.description == 'EMAIL'
+
+    def test_bulk_email_confirmation_invalid(self):
+        """
+        GIVEN a payload without sign ups
+        WHEN it is imported
+        THEN it is rejected
+        """
+        response = self.client.post(f'{self.root_endpoint}/signup/bulk', json={})
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_bulk_email_confirmation_too_large(self):
+        """
+        GIVEN a payload with more sign ups than a request can hold
+        WHEN it is imported
+        THEN it is rejected with 422 and no email is signed up
+        """
+        response = self.client.post(
+            f'{self.root_endpoint}/signup/bulk',
+            json={'sign_ups': [
+                {'service_agr_id': 0, 'email': f'{number}@email.com'}
+                for number in range(MAX_BULK_SIGN_UPS + 1)
+            ]}
+        )
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+        assert response.json()['error']['code'] == 'NB-ERROR-00415'
+        assert self.container.user_repo().get_by_service_agr_id_and_email(
+            0, '0@email.com'
+        ) is None
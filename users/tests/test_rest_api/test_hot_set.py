@@ -0,0 +1,36 @@
+from http import HTTPStatus
+
+from users.tests.test_rest_api import ApiLayerTestCase
+
+
+class TestHotSet(ApiLayerTestCase):
+
+    def test_hot_set_size(self):
+        """
+        GIVEN the tables the onboarding works on and the archive
+        WHEN the size of the hot set is requested
+        THEN the rows of each are counted
+        """
+        response = self.client.get(
+            f'{self.root_endpoint}/internal/hot-set', headers=self.internal_headers()
+        )
+
+        size = response.json()['data']
+        assert response.status_code == HTTPStatus.OK
+        assert set(size) == {
+            'users', 'contact_methods', 'sign_ups', 'terminal_users', 'archived_users'
+        }
+        assert all(isinstance(rows, int) for rows in size.values())
+
+    def test_hot_set_requires_internal_token(self):
+        """
+        GIVEN a request without the internal token
+        WHEN the size of the hot set is requested
+        THEN it is forbidden
+        """
+        self.internal_headers()
+
+        response = self.client.get(f'{self.root_endpoint}/internal/hot-set')
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert response.json()['error']['code'] == 'NB-ERROR-00416'
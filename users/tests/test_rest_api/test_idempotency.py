@@ -0,0 +1,115 @@
+from http import HTTPStatus
+
+from users.api.idempotency import IDEMPOTENCY_HEADER, REPLAYED_HEADER
+from users.core.models import SignUp, User
+from users.core.models.states import SignUpStage
+from users.tests.mock_factory import contact_method_factory_mock, user_factory_mock
+from users.tests.test_rest_api import ApiLayerTestCase
+
+
+class TestIdempotencyKey(ApiLayerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.sign_up_payload = {
+            'service_agr_id': 0,
+            'email': 'test6@email.com'
+        }
+
+    def post_sign_up(self, payload: dict, key: str = 'sign-up-key'):
+        return self.client.post(
+            f'{self.root_endpoint}/signup/email_confirmation',
+            json=payload,
+            headers={IDEMPOTENCY_HEADER: key}
+        )
+
+    def test_replay_the_sign_up_response(self):
+        """
+        GIVEN a sign up posted with an idempotency key
+        WHEN it is posted again with the same key
+        THEN the first response is replayed without creating the user again
+        """
+        first = self.post_sign_up(self.sign_up_payload)
+        retry = self.post_sign_up(self.sign_up_payload)
+
+        assert first.status_code == HTTPStatus.OK
+        assert REPLAYED_HEADER not in first.headers
+        assert retry.status_code == HTTPStatus.OK
+        assert retry.headers[REPLAYED_HEADER] == 'true'
+        assert retry.json() == first.json()
+
+        user: User = self.container.user_repo().get_by_id(first.json()['user_id'])
+        assert len(user.contact_methods) == 1
+
+    def test_reject_a_key_reused_with_another_payload(self):
+        """
+        GIVEN a sign up posted with an idempotency key
+        WHEN another sign up is posted with the same key
+        THEN it is rejected as unprocessable
+        """
+        self.post_sign_up(self.sign_up_payload)
+
+        response = self.post_sign_up({**self.sign_up_payload, 'email': 'other@email.com'})
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+        assert response.json()['error']['code'] == 'NB-ERROR-00413'
+
+    def test_do_not_store_failed_responses(self):
+        """
+        GIVEN a sign up whose email confirmation is still pending
+        WHEN it is posted twice with the same idempotency key
+        THEN both requests run the view and fail, nothing is replayed
+        """
+        self.client.post(
+            f'{self.root_endpoint}/signup/email_confirmation',
+            json=self.sign_up_payload
+        )
+
+        responses = [self.post_sign_up(self.sign_up_payload) for _ in range(2)]
+
+        for response in responses:
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            assert REPLAYED_HEADER not in response.headers
+
+    def test_reject_a_key_too_long(self):
+        """
+        GIVEN an idempotency key longer than 255 characters
+        WHEN a sign up is posted with it
+        THEN it is rejected as a bad request
+        """
+        response = self.post_sign_up(self.sign_up_payload, key='k' * 256)
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_replay_the_phone_confirmation_response(self):
+        """
+        GIVEN a phone confirmation posted with an idempotency key
+        WHEN it is posted again with the same key
+        THEN the first response is replayed without adding the phone again
+        """
+        existing_user = user_factory_mock(
+            service_agr_id=0,
+            contact_methods=[
+                contact_method_factory_mock(type_='EMAIL', confirmed=True)
+            ]
+        )
+        self.container.user_repo().save(existing_user)
+        self.container.sign_up_repo().save(
+            SignUp(SignUpStage.EMAIL_CONFIRMATION, existing_user.id)
+        )
+
+        responses = [
+            self.client.post(
+                f'{self.root_endpoint}/signup/{existing_user.id}/phone_confirmation',
+                json={'phone_number': '+5401164372323'},
+                headers={IDEMPOTENCY_HEADER: 'phone-key'}
+            )
+            for _ in range(2)
+        ]
+
+        user: User = self.container.user_repo().get_by_id(existing_user.id)
+        assert [response.status_code for response in responses] == \
+            [HTTPStatus.CREATED, HTTPStatus.CREATED]
+        assert responses[1].headers[REPLAYED_HEADER] == 'true'
+        assert responses[1].json() == responses[0].json()
+        assert len(user.contact_methods) == 2
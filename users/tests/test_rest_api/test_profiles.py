@@ -0,0 +1,69 @@
+from http import HTTPStatus
+import os
+from tempfile import TemporaryDirectory
+
+from users.tests.mock_factory import ccid_provider_mock
+from users.tests.test_rest_api import ApiLayerTestCase
+
+
+class TestProfiles(ApiLayerTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.profiles_dir = TemporaryDirectory()
+        self.request_profiler = self.container.request_profiler()
+        self.request_profiler.token = 'profiling-token'
+        self.request_profiler.directory = self.profiles_dir.name
+        self.ccid = ccid_provider_mock()
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.profiles_dir.cleanup()
+
+    def test_profile_authorized_request(self):
+        """
+        GIVEN a request carrying the profiling token
+        WHEN the recent profiles are listed
+        THEN its profile is listed and saved under its ccid
+        """
+        self.client.get(
+            f'{self.root_endpoint}/service-agreements/1',
+            headers={
+                'X-Debug-Profile': 'profiling-token',
+                'X-Correlation-ID': str(self.ccid),
+            }
+        )
+
+        response = self.client.get(
+            f'{self.root_endpoint}/internal/profiles',
+            headers={'X-Internal-Token': 'profiling-token'}
+        )
+
+        profiles = response.json()['data']
+        assert response.status_code == HTTPStatus.OK
+        assert len(profiles) == 1
+        assert profiles[0]['ccid'] == str(self.ccid)
+        assert profiles[0]['path'] == f'{self.root_endpoint}/service-agreements/1'
+        assert profiles[0]['status_code'] == HTTPStatus.OK
+        assert os.path.exists(
+            os.path.join(self.profiles_dir.name, f'{self.ccid}.pstats')
+        )
+
+    def test_do_not_profile_unauthorized_request(self):
+        """
+        GIVEN a request carrying a wrong profiling token
+        WHEN the recent profiles are listed
+        THEN no profile is listed
+        """
+        self.client.get(
+            f'{self.root_endpoint}/service-agreements/1',
+            headers={'X-Debug-Profile': 'guess'}
+        )
+
+        response = self.client.get(
+            f'{self.root_endpoint}/internal/profiles',
+            headers={'X-Internal-Token': 'profiling-token'}
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'data': []}
@@ -24,6 +24,14 @@ class TestGetUser(ApiLayerTestCase):
         assert response.status_code == HTTPStatus.OK
         assert response.json() == expected_response
 
+    def test_get_service_agreement_reports_statements(self):
+        response = self.client.get(
+            f'{self.root_endpoint}/service-agreements/1'
+        )
+        assert response.headers['Server-Timing'].startswith(
+            'db;desc="1 statements";dur='
+        )
+
     def test_get_service_agreement_by_id_error_invalid_type(self):
         response = self.client.get(
             f'{self.root_endpoint}/service-agreements/nubi'
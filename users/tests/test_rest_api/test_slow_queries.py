@@ -0,0 +1,48 @@
+from http import HTTPStatus
+
+from users.tests.test_rest_api import ApiLayerTestCase
+
+
+class TestSlowQueries(ApiLayerTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.slow_query_log = self.container.slow_query_log()
+
+    def test_list_slow_queries_disabled(self):
+        """
+        GIVEN no slow query threshold configured
+        WHEN the slow queries are listed
+        THEN the log is reported disabled and empty
+        """
+        response = self.client.get(
+            f'{self.root_endpoint}/internal/slow-queries', headers=self.internal_headers()
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'data': [],
+            'meta': {'enabled': False, 'threshold_ms': None}
+        }
+
+    def test_list_slow_queries_aggregates_by_fingerprint(self):
+        """
+        GIVEN a threshold every statement exceeds
+        WHEN the same service agreement query runs with different ids
+        THEN it is listed once, with both executions and its action
+        """
+        self.slow_query_log.threshold = 0
+
+        self.client.get(f'{self.root_endpoint}/service-agreements/0')
+        self.client.get(f'{self.root_endpoint}/service-agreements/1')
+        response = self.client.get(
+            f'{self.root_endpoint}/internal/slow-queries?limit=1',
+            headers=self.internal_headers()
+        )
+
+        slow_queries = response.json()['data']
+        assert response.status_code == HTTPStatus.OK
+        assert len(slow_queries) == 1
+        assert slow_queries[0]['count'] == 2
+        assert slow_queries[0]['actions'] == ['GetServiceAgreement']
+        assert 'service_agreements.id = ?' in slow_queries[0]['fingerprint']
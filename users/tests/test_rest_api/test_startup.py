@@ -0,0 +1,23 @@
+from http import HTTPStatus
+
+from users.tests.test_rest_api import ApiLayerTestCase
+
+
+class TestStartup(ApiLayerTestCase):
+
+    def test_report_first_request(self):
+        """
+        GIVEN a process that served its first request
+        WHEN the startup report is requested
+        THEN the first request is reported
+        """
+        self.client.get(f'{self.root_endpoint}/service-agreements/1')
+
+        response = self.client.get(
+            f'{self.root_endpoint}/internal/startup', headers=self.internal_headers()
+        )
+
+        report = response.json()['data']
+        assert response.status_code == HTTPStatus.OK
+        assert 'first_request' in report['phases_ms']
+        assert report['first_request_after_ms'] is not None
@@ -141,6 +141,7 @@ class UpdateLegalValidationIdentity(ApiLayerTestCase):
             },
             status=HTTPStatus.NOT_FOUND
         )
+        self.sign_up_repo.save(self.expected_sign_up)
         response = self.client.patch(
             f'{self.root_endpoint}/signup/{self.user_id}/legal_validation',
             json=request_payload